@@ -75,13 +75,21 @@ class WorkerAutoscaler:
             # Docker compose builds images with specific names
             project_name = os.environ.get("COMPOSE_PROJECT_NAME", "swarm")
             worker_metrics_port = int(os.environ.get("WORKER_METRICS_PORT", "9100"))
+            from swarm.celery_app import app as celery_app
+
             backend = DockerApiBackend(
                 image="swarm:latest",  # The actual built image name
                 network=None,  # Auto-detect the network
                 project_name=project_name,
                 app_mount_path=None,  # Auto-detect the app path
                 worker_metrics_port=worker_metrics_port,
+                celery_app=celery_app,
+                redis_client=self.redis,
+                drain_timeout=float(os.environ.get("WORKER_DRAIN_TIMEOUT", "45")),
+                standby_count=int(os.environ.get("WORKER_STANDBY", "0")),
+                watch_events=os.environ.get("DOCKER_EVENTS", "0") == "1",
             )
+            await backend.start()
         elif self.orchestrator == "kubernetes":
             namespace = os.environ.get("K8S_NAMESPACE", "default")
             backend = KubernetesBackend(namespace=namespace)
@@ -152,6 +160,7 @@ class WorkerAutoscaler:
         if self.scaling_service and isinstance(self.scaling_service.backend, DockerApiBackend):
             logger.info("Cleaning up all worker containers...")
             try:
+                await self.scaling_service.backend.stop()
                 await self.scaling_service.backend.cleanup_all_workers()
                 logger.info("Worker cleanup complete")
             except Exception as e:
@@ -34,6 +34,11 @@ CELERY_ARGS="--queues=${CELERY_QUEUES:-browser} \
   --without-gossip \
   --without-mingle"
 
+# Nodename the autoscaler drains and activates (e.g. browser-2@%h, %h = container hostname)
+if [[ -n "${CELERY_HOSTNAME:-}" ]]; then
+  CELERY_ARGS="$CELERY_ARGS --hostname=${CELERY_HOSTNAME}"
+fi
+
 # Add autoscale if configured
 if [[ -n "${CELERY_AUTOSCALE:-}" ]]; then
   CELERY_ARGS="$CELERY_ARGS --autoscale=${CELERY_AUTOSCALE}"
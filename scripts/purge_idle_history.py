@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Purge conversation history of channels idle longer than a TTL.
+
+Usage:
+    python -m scripts.purge_idle_history --max-idle-days 30
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from swarm.core.settings import settings
+from swarm.history.redis_backend import RedisBackend
+
+
+async def purge(max_idle_seconds: int, batch: int) -> None:
+    url = settings.redis.url or "redis://localhost:6379/0"
+    backend = RedisBackend(url, max_turns=settings.conversation_max_turns)
+    try:
+        # One-off: index channels recorded before the index existed (no-op afterwards)
+        await backend.backfill_index()
+        purged = await backend.purge_idle(max_idle_seconds, batch=batch)
+        print(f"Purged history of {purged} idle channel(s)")
+    finally:
+        await backend.client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Purge idle conversation history")
+    parser.add_argument(
+        "--max-idle-days",
+        type=float,
+        default=30.0,
+        help="Purge channels with no new turns for this many days",
+    )
+    parser.add_argument(
+        "--batch", type=int, default=100, help="Channels removed per Redis call"
+    )
+    args = parser.parse_args()
+    asyncio.run(purge(int(args.max_idle_days * 86400), args.batch))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Replay recorded job arrivals against the scaling policy offline.
+
+The policy is ``ScalingService`` with the worker type's ``ScalingConfig`` from
+the environment (``BROWSER_COOLDOWN=120`` etc.); ``--set`` overrides single
+fields.  Arrivals come from a JSON-lines dump of Celery events (``--trace``) or
+from the entry IDs of the worker type's job stream in Redis.
+
+Usage:
+    python -m scripts.simulate_autoscaling --worker-type browser --trace events.jsonl \\
+        --service-time lognormal:8 --cold-start uniform:30:60 --set max_scale_up_step=3
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import os
+import sys
+from typing import cast
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import redis.asyncio as redis_asyncio
+
+from swarm.distributed.core.config import DistributedConfig
+from swarm.distributed.services.scaling_service import ScalingService
+from swarm.distributed.services.simulator import (
+    AutoscalingSimulator,
+    VirtualClock,
+    arrivals_from_events,
+    arrivals_from_stream,
+    parse_distribution,
+)
+from swarm.types import RedisBytes
+
+
+def _apply_overrides(config: DistributedConfig, worker_type: str, overrides: list[str]) -> None:
+    worker = config.get_worker_type(worker_type)
+    if worker is None:
+        raise SystemExit(f"Unknown worker type '{worker_type}'")
+    fields = {f.name: f.type for f in dataclasses.fields(worker.scaling)}
+    changes = {}
+    for override in overrides:
+        name, _, value = override.partition("=")
+        if name not in fields:
+            raise SystemExit(f"Unknown ScalingConfig field '{name}'")
+        changes[name] = float(value) if fields[name] in (float, "float") else int(value)
+    worker.scaling = dataclasses.replace(worker.scaling, **changes)
+
+
+async def simulate(args: argparse.Namespace) -> None:
+    config = DistributedConfig.load()
+    _apply_overrides(config, args.worker_type, args.set)
+    redis = cast(RedisBytes, redis_asyncio.from_url(args.redis_url or config.redis_url))
+    try:
+        if args.trace:
+            with open(args.trace, encoding="utf-8") as f:
+                arrivals = arrivals_from_events(f, args.event_type, args.queue)
+        else:
+            worker = config.get_worker_type(args.worker_type)
+            assert worker is not None
+            arrivals = await arrivals_from_stream(redis, worker.job_queue)
+        if not arrivals:
+            raise SystemExit("No arrivals in the trace")
+
+        clock = VirtualClock()
+        service = ScalingService(redis, config, clock=clock)
+        simulator = AutoscalingSimulator(
+            service,
+            args.worker_type,
+            arrivals,
+            service_time=parse_distribution(args.service_time),
+            cold_start=parse_distribution(args.cold_start),
+            check_interval=args.interval,
+            initial_workers=args.initial_workers,
+            seed=args.seed,
+            clock=clock,
+        )
+        report = await simulator.run()
+        print(report.summary())
+    finally:
+        await redis.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline autoscaling policy simulator")
+    parser.add_argument("--worker-type", default="browser")
+    parser.add_argument("--trace", help="JSON-lines Celery events (default: job stream)")
+    parser.add_argument("--event-type", default="task-received")
+    parser.add_argument("--queue", help="Only replay events of this queue")
+    parser.add_argument("--redis-url", help="Redis holding the job stream")
+    parser.add_argument("--service-time", default="exp:10", help="e.g. const:5, lognormal:8")
+    parser.add_argument("--cold-start", default="uniform:30:60", help="Container start time")
+    parser.add_argument("--interval", type=float, default=30.0, help="Autoscaler interval")
+    parser.add_argument("--initial-workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="FIELD=VALUE",
+        help="Override a ScalingConfig field (repeatable)",
+    )
+    asyncio.run(simulate(parser.parse_args()))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -16,6 +16,7 @@ from __future__ import annotations
 
 import logging
 import os
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any, Dict, List, Optional, TypedDict
 
@@ -28,6 +29,7 @@ __all__ = [
     "PERSONALITIES",
     "prompt",
     "visible",
+    "on_refresh",
     "Persona",
     # internal helpers exposed for tests / admin cog
     "_CUSTOM_DIR",
@@ -153,10 +155,24 @@ _populate(PERSONALITIES)
 # ---------------------------------------------------------------------------
 
 
+_refresh_listeners: list[Callable[[], None]] = []
+
+
+def on_refresh(callback: Callable[[], None]) -> None:
+    """Call *callback* after every :func:`refresh` (e.g. to drop prompt caches)."""
+
+    _refresh_listeners.append(callback)
+
+
 def refresh() -> None:  # pragma: no cover – exercised via admin cog at runtime
     """Reload all YAML sources into the existing *PERSONALITIES* dict."""
 
     _populate(PERSONALITIES)
+    for callback in list(_refresh_listeners):
+        try:
+            callback()
+        except Exception as exc:
+            logger.warning(f"Persona refresh listener failed: {exc}")
 
 
 # ---------------------------------------------------------------------------
@@ -212,4 +228,4 @@ async def visible(name: str, user_id: int, bot: commands.Bot) -> bool:
     return str(user_id) in allowed_ids
 
 
-__all__ = ["PERSONALITIES", "prompt", "visible", "Persona"]
+__all__ = ["PERSONALITIES", "prompt", "visible", "on_refresh", "refresh", "Persona"]
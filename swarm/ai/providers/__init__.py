@@ -19,17 +19,19 @@ This avoids monkey-patching import paths.
 
 from __future__ import annotations
 
+import asyncio
 import functools
 import importlib
 import logging
 import time
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
 from pathlib import Path
 from types import ModuleType
 from typing import Any, Dict, cast
 
 from swarm.ai.contracts import LLMProvider
-from swarm.core.telemetry import record_llm_call
+from swarm.ai.providers import _cache, _limiter, _singleflight
+from swarm.core.telemetry import record_llm_call, record_llm_first_token
 
 _log = logging.getLogger(__name__)
 
@@ -37,6 +39,33 @@ _REGISTRY: dict[str, LLMProvider] = {}
 
 _pkg_path = Path(__file__).resolve().parent
 
+
+async def _timed_stream(
+    stream: AsyncIterator[str], provider_name: str, start: float
+) -> AsyncGenerator[str, None]:
+    """Relay *stream*, recording time-to-first-token and total latency."""
+    status = "ok"
+    first = True
+    try:
+        async for fragment in stream:
+            if first:
+                record_llm_first_token(provider_name, time.perf_counter() - start)
+                first = False
+            yield fragment
+    except (GeneratorExit, asyncio.CancelledError):
+        status = "cancelled"
+        raise
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        # Propagate early close so the provider can release its upstream stream.
+        aclose = getattr(stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+        record_llm_call(provider_name, status, time.perf_counter() - start)
+
+
 for _file in _pkg_path.iterdir():
     if _file.name.startswith("_") or _file.suffix != ".py" or _file.stem == "__init__":
         continue
@@ -46,7 +75,7 @@ for _file in _pkg_path.iterdir():
         _REGISTRY[prov.name] = prov
 
         # ------------------------------------------------------------+
-        #  ✨  Middleware – wrap .generate for metrics + trace logs    |
+        #  ✨  Middleware – cache, coalescing, limits, metrics + logs  |
         # ------------------------------------------------------------+
 
         async def _timed_generate(
@@ -56,21 +85,28 @@ for _file in _pkg_path.iterdir():
             **kw: Any,
         ) -> Any:
             start = time.perf_counter()
-            status = "ok"
             try:
                 result = await _call(*args, **kw)
-                return result
             except Exception:
-                status = "error"
+                record_llm_call(_provider_name, "error", time.perf_counter() - start)
                 raise
-            finally:
-                record_llm_call(_provider_name, status, time.perf_counter() - start)
+            if isinstance(result, str) or not hasattr(result, "__aiter__"):
+                record_llm_call(_provider_name, "ok", time.perf_counter() - start)
+                return result
+            # Streams are timed when they finish, not when they are created.
+            return _timed_stream(result, _provider_name, start)
 
         # Only patch once
         if not hasattr(prov.generate, "__wrapped__"):
             _orig_generate: Callable[..., Awaitable[Any]] = prov.generate
-            prov.generate = functools.wraps(_orig_generate)(_timed_generate)  # type: ignore[method-assign]
-            _log.debug("LLM provider '%s' wrapped with telemetry", prov.name)
+            # Outermost first: cache → in-flight coalescing → concurrency limit
+            # → timing → provider.  Cache hits and queue waits stay out of LLM_LATENCY.
+            _wrapped = _cache.cached(
+                _singleflight.coalesced(_limiter.limited(_timed_generate, prov.name), prov.name),
+                prov.name,
+            )
+            prov.generate = functools.wraps(_orig_generate)(_wrapped)  # type: ignore[method-assign]
+            _log.debug("LLM provider '%s' wrapped with middleware", prov.name)
 
 
 def get(name: str) -> LLMProvider:
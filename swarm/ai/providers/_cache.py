@@ -0,0 +1,214 @@
+"""Response cache for LLM completions.
+
+Sits in the registry middleware in front of the timed provider call.  Replies
+are keyed on a hash of provider, model, system prompt, remaining options and
+the full message list, once verbatim and once *normalised* (case-folded,
+whitespace collapsed, trailing punctuation dropped) so ``"What is X?"`` and
+``"what is x"`` share an answer.  Entries live in a small in-process LRU backed
+by Redis (when configured) with a TTL, so replicas share the same answers.
+
+The module name starts with an underscore so the registry's auto-discovery
+does not treat it as a provider adapter.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
+from typing import Any, cast
+
+import redis.asyncio as redis_asyncio
+
+from swarm.ai.contracts import Message
+from swarm.core.settings import settings
+from swarm.core.telemetry import record_llm_cache
+
+_log = logging.getLogger(__name__)
+
+KEY_PREFIX = "llm:cache:"
+
+# Options that are folded into the key explicitly or do not affect the reply.
+_KEYED_OPTIONS = frozenset(
+    {"model", "system_prompt", "system_instruction", "stream", "priority", "persona"}
+)
+
+# (reply text, seconds the original generation took)
+CachedReply = tuple[str, float]
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.casefold().split()).rstrip("?!. ")
+
+
+def cache_keys(provider: str, messages: list[Message], options: dict[str, Any]) -> tuple[str, str]:
+    """Return the ``(exact, normalized)`` cache keys for one ``generate`` call."""
+    model = options.get("model") or getattr(settings, f"{provider}_model", None)
+    system = options.get("system_prompt") or options.get("system_instruction")
+    extra = {k: v for k, v in options.items() if k not in _KEYED_OPTIONS}
+
+    def _digest(msgs: list[list[str]]) -> str:
+        payload = json.dumps([provider, model, system, msgs, extra], sort_keys=True, default=str)
+        return KEY_PREFIX + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    exact = [[m.get("role", ""), m.get("content", "")] for m in messages]
+    normalized = [[role, _normalize(content)] for role, content in exact]
+    return _digest(exact), _digest(normalized)
+
+
+class ResponseCache:
+    """In-process LRU of LLM replies, optionally backed by Redis."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int, redis: Any | None = None) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._redis = redis
+        # key -> (text, generation seconds, monotonic expiry)
+        self._local: OrderedDict[str, tuple[str, float, float]] = OrderedDict()
+
+    def _get_local(self, key: str) -> CachedReply | None:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        text, duration, expires = entry
+        if expires < time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return text, duration
+
+    def _put_local(self, key: str, reply: CachedReply) -> None:
+        if self._max_entries <= 0:
+            return
+        self._local[key] = (reply[0], reply[1], time.monotonic() + self._ttl)
+        self._local.move_to_end(key)
+        while len(self._local) > self._max_entries:
+            self._local.popitem(last=False)
+
+    async def get(self, keys: tuple[str, ...]) -> CachedReply | None:
+        for key in keys:
+            hit = self._get_local(key)
+            if hit is not None:
+                return hit
+        if self._redis is None:
+            return None
+        try:
+            raw = await cast(Any, self._redis).mget(list(keys))
+        except Exception as exc:
+            _log.warning(f"LLM cache lookup failed, treating as miss: {exc}")
+            return None
+        for key, value in zip(keys, raw):
+            if value:
+                text, duration = json.loads(value)
+                reply = (str(text), float(duration))
+                for k in keys:
+                    self._put_local(k, reply)
+                return reply
+        return None
+
+    async def put(self, keys: tuple[str, ...], reply: CachedReply) -> None:
+        for key in keys:
+            self._put_local(key, reply)
+        if self._redis is None:
+            return
+        value = json.dumps(list(reply))
+        try:
+            pipe = cast(Any, self._redis).pipeline(transaction=False)
+            for key in keys:
+                pipe.set(key, value, ex=self._ttl)
+            await pipe.execute()
+        except Exception as exc:
+            _log.warning(f"Failed to store LLM reply in Redis cache: {exc}")
+
+    def clear(self) -> None:
+        """Drop the local tier (Redis entries expire on their own)."""
+        self._local.clear()
+
+
+_cache: ResponseCache | None = None
+_configured = False
+
+
+def default_cache() -> ResponseCache | None:
+    """Build the process-wide cache from settings on first use (``None`` = disabled)."""
+    global _cache, _configured
+    if _configured:
+        return _cache
+    _configured = True
+    ttl = getattr(settings, "llm_cache_ttl_seconds", 0)
+    if ttl <= 0:
+        return None
+    redis_client = None
+    url = getattr(settings.redis, "url", None)
+    if getattr(settings.redis, "enabled", False) and isinstance(url, str) and url:
+        redis_client = redis_asyncio.from_url(url, encoding="utf-8", decode_responses=True)
+    _cache = ResponseCache(
+        max_entries=getattr(settings, "llm_cache_max_entries", 512),
+        ttl_seconds=ttl,
+        redis=redis_client,
+    )
+    return _cache
+
+
+def reset() -> None:
+    """Forget the process-wide cache so the next call re-reads settings (tests)."""
+    global _cache, _configured
+    _cache = None
+    _configured = False
+
+
+async def _replay(text: str) -> AsyncGenerator[str, None]:
+    yield text
+
+
+async def _store_on_completion(
+    stream: AsyncIterator[str], store: Callable[[str], Awaitable[None]]
+) -> AsyncGenerator[str, None]:
+    """Relay *stream* and cache the joined reply once it finished cleanly."""
+    parts: list[str] = []
+    try:
+        async for fragment in stream:
+            parts.append(fragment)
+            yield fragment
+    finally:
+        aclose = getattr(stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    if parts:
+        await store("".join(parts))
+
+
+def cached(call: Callable[..., Awaitable[Any]], provider_name: str) -> Callable[..., Awaitable[Any]]:
+    """Wrap a provider ``generate`` *call* with the response cache."""
+
+    async def _cached_generate(
+        *args: Any, messages: list[Message], stream: bool = False, **options: Any
+    ) -> Any:
+        cache = default_cache()
+        if cache is None:
+            return await call(*args, messages=messages, stream=stream, **options)
+
+        keys = cache_keys(provider_name, messages, options)
+        hit = await cache.get(keys)
+        if hit is not None:
+            text, duration = hit
+            record_llm_cache(provider_name, hit=True, saved_s=duration)
+            return _replay(text) if stream else text
+        record_llm_cache(provider_name, hit=False)
+
+        start = time.perf_counter()
+
+        async def _store(text: str) -> None:
+            await cache.put(keys, (text, time.perf_counter() - start))
+
+        result = await call(*args, messages=messages, stream=stream, **options)
+        if isinstance(result, str):
+            if result:
+                await _store(result)
+            return result
+        return _store_on_completion(result, _store)
+
+    return _cached_generate
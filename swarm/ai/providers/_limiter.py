@@ -0,0 +1,200 @@
+"""Adaptive concurrency limiting for LLM providers.
+
+Each provider gets an AIMD controller: the number of concurrent upstream calls
+grows by roughly one per window of successful, saturated calls and is halved
+when the provider reports :class:`ModelOverloaded`.  Callers beyond the limit
+wait in a bounded priority queue (interactive before background) for at most
+``llm_queue_timeout_seconds``; anything that cannot be admitted is rejected
+with :class:`ModelOverloaded` instead of piling onto a struggling provider.
+
+Callers choose a class with the ``priority`` option (``"interactive"`` – the
+default – or ``"background"``); the option is consumed here and never reaches
+the provider.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
+from typing import Any
+
+from swarm.core.exceptions import ModelOverloaded
+from swarm.core.settings import settings
+from swarm.core.telemetry import record_llm_rejection, update_llm_limiter
+
+PRIORITIES: dict[str, int] = {"interactive": 0, "background": 1}
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit with a bounded, prioritised wait queue."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 32,
+        max_queue: int = 64,
+        queue_timeout: float = 30.0,
+        backoff: float = 0.5,
+    ) -> None:
+        self.name = name
+        self._limit = float(initial)
+        self._min = minimum
+        self._max = maximum
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._backoff = backoff
+        self._inflight = 0
+        # (priority, seq, future) – seq keeps FIFO order within a priority.
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._seq = itertools.count()
+        # Calls admitted before the last decrease must not shrink the limit again.
+        self._last_decrease = 0.0
+        self._publish()
+
+    @property
+    def limit(self) -> int:
+        return max(self._min, int(self._limit))
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    def _publish(self) -> None:
+        update_llm_limiter(self.name, self.limit, self._inflight, self.queued)
+
+    def _wake(self) -> None:
+        while self._waiters and self._inflight < self.limit:
+            _, _, fut = heapq.heappop(self._waiters)
+            if fut.done():  # timed out or cancelled while queued
+                continue
+            self._inflight += 1
+            fut.set_result(None)
+        self._publish()
+
+    async def acquire(self, priority: str = "interactive") -> float:
+        """Wait for a slot and return the admission time (``time.monotonic()``)."""
+        if self._inflight < self.limit and not self.queued:
+            self._inflight += 1
+            self._publish()
+            return time.monotonic()
+        if self.queued >= self._max_queue:
+            record_llm_rejection(self.name, "queue_full")
+            raise ModelOverloaded(f"{self.name} request queue is full. Please retry later.")
+
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (PRIORITIES.get(priority, 0), next(self._seq), fut))
+        self._publish()
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), self._queue_timeout)
+        except TimeoutError:
+            if fut.done() and not fut.cancelled():
+                # Admitted in the same tick the deadline fired – give the slot back.
+                self.release(admitted=time.monotonic(), outcome="cancelled")
+            fut.cancel()
+            self._publish()
+            record_llm_rejection(self.name, "timeout")
+            raise ModelOverloaded(
+                f"{self.name} is saturated; request waited too long. Please retry later."
+            ) from None
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release(admitted=time.monotonic(), outcome="cancelled")
+            fut.cancel()
+            self._publish()
+            raise
+        return time.monotonic()
+
+    def release(self, *, admitted: float, outcome: str) -> None:
+        """Return a slot and adapt the limit to *outcome* (``ok``/``overloaded``/other)."""
+        saturated = self._inflight >= self.limit
+        self._inflight -= 1
+        if outcome == "ok" and saturated:
+            self._limit = min(float(self._max), self._limit + 1.0 / self._limit)
+        elif outcome == "overloaded" and admitted >= self._last_decrease:
+            self._limit = max(float(self._min), self._limit * self._backoff)
+            self._last_decrease = time.monotonic()
+        self._wake()
+
+
+_limiters: dict[str, AdaptiveLimiter] = {}
+
+
+def limiter_for(provider_name: str) -> AdaptiveLimiter:
+    """Return the process-wide limiter for *provider_name*, created from settings."""
+    limiter = _limiters.get(provider_name)
+    if limiter is None:
+        limiter = AdaptiveLimiter(
+            provider_name,
+            initial=getattr(settings, "llm_concurrency_initial", 4),
+            maximum=getattr(settings, "llm_concurrency_max", 32),
+            max_queue=getattr(settings, "llm_queue_max", 64),
+            queue_timeout=getattr(settings, "llm_queue_timeout_seconds", 30.0),
+        )
+        _limiters[provider_name] = limiter
+    return limiter
+
+
+def reset() -> None:
+    """Forget all limiters so the next call re-reads settings (tests)."""
+    _limiters.clear()
+
+
+def _outcome(exc: BaseException | None) -> str:
+    if exc is None:
+        return "ok"
+    if isinstance(exc, ModelOverloaded):
+        return "overloaded"
+    if isinstance(exc, (GeneratorExit, asyncio.CancelledError)):
+        return "cancelled"
+    return "error"
+
+
+async def _release_on_completion(
+    stream: AsyncIterator[str], limiter: AdaptiveLimiter, admitted: float
+) -> AsyncGenerator[str, None]:
+    error: BaseException | None = None
+    try:
+        async for fragment in stream:
+            yield fragment
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        try:
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        finally:
+            limiter.release(admitted=admitted, outcome=_outcome(error))
+
+
+def limited(
+    call: Callable[..., Awaitable[Any]], provider_name: str
+) -> Callable[..., Awaitable[Any]]:
+    """Wrap a provider ``generate`` *call* with the provider's adaptive limiter."""
+
+    async def _limited_generate(*args: Any, priority: str = "interactive", **kw: Any) -> Any:
+        limiter = limiter_for(provider_name)
+        admitted = await limiter.acquire(priority)
+        try:
+            result = await call(*args, **kw)
+        except BaseException as exc:
+            limiter.release(admitted=admitted, outcome=_outcome(exc))
+            raise
+        if isinstance(result, str) or not hasattr(result, "__aiter__"):
+            limiter.release(admitted=admitted, outcome="ok")
+            return result
+        # Streams hold their slot until the last fragment (or an early close).
+        return _release_on_completion(result, limiter, admitted)
+
+    return _limited_generate
@@ -0,0 +1,184 @@
+"""Provider-side context caching of persona system prompts.
+
+Every chat turn resends ``DEFAULT_SYSTEM_PROMPT + persona prompt``.  Providers
+that can cache a prompt prefix server-side (Gemini's *cached content*) are
+billed far fewer input tokens when the request references the cache instead.
+:class:`PromptContextCache` does the bookkeeping for such a provider:
+
+* entries are keyed by persona name and a hash of model + prompt, so an edited
+  persona gets a fresh cache and the stale one is deleted;
+* an entry is extended shortly before its TTL runs out;
+* prompts too short to be cached, or a failing cache API, fall back to sending
+  the prompt inline – a failed create is retried after ``retry_seconds`` rather
+  than on every turn;
+* :meth:`invalidate` drops everything (wired to ``personas.refresh()``).
+
+The adapter supplies blocking ``create``/``extend``/``delete`` callables.
+:meth:`resolve` blocks and is meant to run in the adapter's worker thread;
+the lock only guards the bookkeeping, never a provider call, and concurrent
+requests for a prompt whose context is still being created send it inline.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+
+from swarm.core.telemetry import record_llm_prompt_cache
+from swarm.history.backends import estimate_tokens
+from swarm.utils.async_helpers import get_executor
+
+_log = logging.getLogger(__name__)
+
+# Extend an entry once less than this share of its TTL is left.
+_REFRESH_MARGIN = 0.1
+
+# (persona, sha256 of model + prompt)
+_EntryKey = tuple[str, str]
+
+
+class PromptContextCache:
+    """Map stable persona prompts onto provider-side cached contexts."""
+
+    def __init__(
+        self,
+        provider: str,
+        *,
+        create: Callable[[str, str, str], str],
+        extend: Callable[[str], None],
+        delete: Callable[[str], None],
+        ttl_seconds: int,
+        min_tokens: int = 1024,
+        retry_seconds: float = 60.0,
+    ) -> None:
+        self._provider = provider
+        self._create = create  # (persona, model, prompt) -> cache name
+        self._extend = extend  # (cache name) -> None, resets the TTL
+        self._delete = delete  # (cache name) -> None
+        self._ttl = ttl_seconds
+        self._min_tokens = min_tokens
+        self._retry = min(retry_seconds, ttl_seconds)
+        # key -> (cache name, monotonic expiry)
+        self._entries: dict[_EntryKey, tuple[str, float]] = {}
+        # key -> monotonic time until which we do not retry creating it
+        self._failed: dict[_EntryKey, float] = {}
+        # keys whose create/extend call is in flight
+        self._pending: set[_EntryKey] = set()
+        # bumped by invalidate() so an in-flight create is not stored afterwards
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(persona: str, model: str, prompt: str) -> _EntryKey:
+        digest = hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+        return persona, digest
+
+    def resolve(self, persona: str | None, model: str, prompt: str | None) -> str | None:
+        """Return the cached-context name for this prompt, or ``None`` to send it inline."""
+        if not persona or not prompt or estimate_tokens(prompt) < self._min_tokens:
+            return None
+        key = self._key(persona, model, prompt)
+        now = time.monotonic()
+        # Decide under the lock, call the provider outside it: a slow create for
+        # one persona must not stall every other Gemini request.
+        with self._lock:
+            stale = self._pop_stale(persona, key)
+            entry = self._entries.get(key)
+            busy = key in self._pending
+            if entry is not None and (busy or entry[1] - now > self._ttl * _REFRESH_MARGIN):
+                action, cached = "hit", entry[0]
+            elif busy or self._failed.get(key, 0.0) > now:
+                # Being created by another request, or failed recently
+                action, cached = "fallback", None
+            else:
+                action, cached = "call", None
+                self._pending.add(key)
+                generation = self._generation
+        for stale_name in stale:
+            self._safe_delete(stale_name)
+        if action != "call":
+            record_llm_prompt_cache(self._provider, action)
+            return cached
+
+        try:
+            if entry is not None:
+                name = self._refresh(persona, key, entry[0], now, generation)
+                if name is not None:
+                    return name
+            return self._create_entry(persona, model, prompt, key, now, generation)
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def _refresh(
+        self, persona: str, key: _EntryKey, name: str, now: float, generation: int
+    ) -> str | None:
+        try:
+            self._extend(name)
+        except Exception as exc:
+            _log.info(f"Could not extend prompt cache for persona '{persona}': {exc}")
+            with self._lock:
+                if self._entries.get(key, (None,))[0] == name:
+                    del self._entries[key]
+            return None
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (name, now + self._ttl)
+        record_llm_prompt_cache(self._provider, "refreshed")
+        return name
+
+    def _create_entry(
+        self, persona: str, model: str, prompt: str, key: _EntryKey, now: float, generation: int
+    ) -> str | None:
+        try:
+            name = self._create(persona, model, prompt)
+        except Exception as exc:
+            _log.warning(f"Prompt caching unavailable for persona '{persona}': {exc}")
+            with self._lock:
+                self._failed[key] = now + self._retry
+            record_llm_prompt_cache(self._provider, "fallback")
+            return None
+        with self._lock:
+            # Personas reloaded meanwhile: use the context once, then let it expire
+            if generation == self._generation:
+                self._entries[key] = (name, now + self._ttl)
+        record_llm_prompt_cache(self._provider, "created")
+        return name
+
+    def _pop_stale(self, persona: str, current: _EntryKey) -> list[str]:
+        # The persona's prompt changed: its old context can never be hit again.
+        stale = [k for k in self._entries if k[0] == persona and k != current]
+        return [self._entries.pop(key)[0] for key in stale]
+
+    def _safe_delete(self, name: str) -> None:
+        try:
+            self._delete(name)
+        except Exception as exc:
+            # It expires on its own; a failed delete only costs storage until then.
+            _log.debug(f"Failed to delete cached context {name}: {exc}")
+
+    def _delete_all(self, names: list[str]) -> None:
+        for name in names:
+            self._safe_delete(name)
+
+    def invalidate(self) -> Future[None] | None:
+        """
+        Forget every cached context, e.g. after personas were reloaded.
+
+        Runs inside ``personas.refresh()`` on the event loop, so it only drops
+        the entries; the provider-side deletes run in the ``llm`` pool.
+        """
+        with self._lock:
+            entries, self._entries = self._entries, {}
+            self._failed.clear()
+            self._generation += 1
+        if not entries:
+            return None
+        return get_executor("llm").submit(self._delete_all, [n for n, _ in entries.values()])
+
+
+__all__ = ["PromptContextCache"]
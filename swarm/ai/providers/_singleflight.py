@@ -0,0 +1,138 @@
+"""In-flight coalescing ("singleflight") for identical LLM calls.
+
+Concurrent ``generate`` calls with the same cache key share one upstream
+request.  The first caller starts a *flight*; later callers attach to it and
+receive the same reply – as a string, or as a stream that replays what has
+arrived so far and then follows along.  Errors reach every waiter, and the
+upstream call is cancelled once the last waiter goes away.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from typing import Any
+
+from swarm.ai.contracts import Message
+from swarm.ai.providers._cache import cache_keys
+from swarm.core.telemetry import record_llm_coalesced
+
+_log = logging.getLogger(__name__)
+
+
+class _Flight:
+    """One shared upstream call and the fragments it produced so far."""
+
+    def __init__(self) -> None:
+        self.fragments: list[str] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self.waiters = 0
+        self.task: asyncio.Task[None] | None = None
+        self._changed = asyncio.Event()
+
+    def notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def follow(self) -> AsyncGenerator[str, None]:
+        """Yield every fragment from the start, then new ones as they arrive."""
+        index = 0
+        while True:
+            changed = self._changed
+            while index < len(self.fragments):
+                yield self.fragments[index]
+                index += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await changed.wait()
+
+    async def result(self) -> str:
+        while not self.done:
+            await self._changed.wait()
+        if self.error is not None:
+            raise self.error
+        return "".join(self.fragments)
+
+
+def coalesced(
+    call: Callable[..., Awaitable[Any]], provider_name: str
+) -> Callable[..., Awaitable[Any]]:
+    """Wrap a provider ``generate`` *call* so identical concurrent calls share one request."""
+
+    flights: dict[str, _Flight] = {}
+
+    async def _pump(
+        flight: _Flight,
+        key: str,
+        args: tuple[Any, ...],
+        messages: list[Message],
+        stream: bool,
+        options: dict[str, Any],
+    ) -> None:
+        try:
+            result = await call(*args, messages=messages, stream=stream, **options)
+            if isinstance(result, str):
+                flight.fragments.append(result)
+            else:
+                try:
+                    async for fragment in result:
+                        flight.fragments.append(fragment)
+                        flight.notify()
+                finally:
+                    aclose = getattr(result, "aclose", None)
+                    if aclose is not None:
+                        await aclose()
+        except asyncio.CancelledError:
+            flight.error = asyncio.CancelledError()
+            raise
+        except Exception as exc:
+            flight.error = exc
+        finally:
+            flight.done = True
+            flight.notify()
+            if flights.get(key) is flight:
+                del flights[key]
+
+    def _release(flight: _Flight, key: str) -> None:
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.done and flight.task is not None:
+            # Nobody is listening any more – stop paying for the upstream call.
+            if flights.get(key) is flight:
+                del flights[key]
+            flight.task.cancel()
+
+    async def _follow(flight: _Flight, key: str) -> AsyncGenerator[str, None]:
+        try:
+            async for fragment in flight.follow():
+                yield fragment
+        finally:
+            _release(flight, key)
+
+    async def _coalesced_generate(
+        *args: Any, messages: list[Message], stream: bool = False, **options: Any
+    ) -> Any:
+        key = cache_keys(provider_name, messages, options)[0]
+        flight = flights.get(key)
+        if flight is None:
+            flight = _Flight()
+            flights[key] = flight
+            flight.task = asyncio.create_task(
+                _pump(flight, key, args, messages, stream, options),
+                name=f"llm:{provider_name}:flight",
+            )
+        else:
+            record_llm_coalesced(provider_name)
+            _log.debug("Joined in-flight %s request (%d waiting)", provider_name, flight.waiters)
+        flight.waiters += 1
+        if stream:
+            return _follow(flight, key)
+        try:
+            return await flight.result()
+        finally:
+            _release(flight, key)
+
+    return _coalesced_generate
@@ -11,13 +11,20 @@ from __future__ import annotations
 
 import asyncio
 import json
+import threading
+import time
 from collections.abc import AsyncGenerator, AsyncIterator
 from typing import Any
 
 from swarm.ai.contracts import LLMProvider, Message
+from swarm.ai.providers._prompt_cache import PromptContextCache
+from swarm.ai.usage import Usage, report_usage
 from swarm.core import alerts
 from swarm.core.exceptions import ModelOverloaded
 from swarm.core.settings import settings
+from swarm.core.telemetry import record_llm_prompt_cache_saved
+from swarm.history.backends import estimate_tokens
+from swarm.utils.async_helpers import run_in_threadpool
 
 # NOTE: We intentionally **do not** import the google-genai SDK at module load
 # time. Tests often monkey-patch `sys.modules` with stub packages before the
@@ -39,6 +46,7 @@ class _GeminiProvider(LLMProvider):
         # is not actually used.
         self._client: Any | None = None
         self._genai: Any = None
+        self._prompt_cache: PromptContextCache | None = None
 
     # ------------------------------------------------------------------
     # internal helpers
@@ -63,6 +71,169 @@ class _GeminiProvider(LLMProvider):
         self._genai = genai  # stash for debugging hooks if needed
         self._client = genai.Client(api_key=api_key)
 
+        ttl = getattr(settings, "llm_prompt_cache_ttl_seconds", 0)
+        if ttl > 0:
+            self._prompt_cache = PromptContextCache(
+                self.name,
+                create=self._create_cached_prompt,
+                extend=self._extend_cached_prompt,
+                delete=self._delete_cached_prompt,
+                ttl_seconds=ttl,
+                min_tokens=getattr(settings, "llm_prompt_cache_min_tokens", 1024),
+            )
+            from swarm.ai import personas
+
+            personas.on_refresh(self._prompt_cache.invalidate)
+
+    # -- cached persona prompts (blocking; called from the worker thread) --
+
+    def _create_cached_prompt(self, persona: str, model: str, prompt: str) -> str:
+        assert self._client is not None
+        from google.genai import types
+
+        cached = self._client.caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                display_name=f"persona:{persona}",
+                system_instruction=prompt,
+                ttl=f"{settings.llm_prompt_cache_ttl_seconds}s",
+            ),
+        )
+        return str(cached.name)
+
+    def _extend_cached_prompt(self, name: str) -> None:
+        assert self._client is not None
+        from google.genai import types
+
+        self._client.caches.update(
+            name=name,
+            config=types.UpdateCachedContentConfig(ttl=f"{settings.llm_prompt_cache_ttl_seconds}s"),
+        )
+
+    def _delete_cached_prompt(self, name: str) -> None:
+        assert self._client is not None
+        self._client.caches.delete(name=name)
+
+    def _config(self, system_prompt: str | None, persona: str | None) -> tuple[Any, str | None]:
+        """Build the request config, referencing a cached persona prompt when possible."""
+        from google.genai import types
+
+        cached = None
+        if self._prompt_cache is not None:
+            cached = self._prompt_cache.resolve(persona, settings.gemini_model, system_prompt)
+        if cached is not None:
+            config = types.GenerateContentConfig(
+                cached_content=cached, response_mime_type="text/plain"
+            )
+        else:
+            config = types.GenerateContentConfig(
+                system_instruction=system_prompt,
+                response_mime_type="text/plain",
+            )
+        return config, cached
+
+    def _record_cached_tokens(self, usage: Any, system_prompt: str | None) -> None:
+        # Prefer the provider's own count; estimate when the response has none.
+        tokens = getattr(usage, "cached_content_token_count", None)
+        if not tokens and system_prompt:
+            tokens = estimate_tokens(system_prompt)
+        if tokens:
+            record_llm_prompt_cache_saved(self.name, int(tokens))
+
+    def _report_usage(self, usage: Any, persona: str | None, generation_s: float) -> None:
+        if usage is None:
+            return
+        report_usage(
+            self.name,
+            settings.gemini_model,
+            Usage(
+                input_tokens=getattr(usage, "prompt_token_count", None) or 0,
+                output_tokens=getattr(usage, "candidates_token_count", None) or 0,
+                cached_tokens=getattr(usage, "cached_content_token_count", None) or 0,
+            ),
+            persona=persona,
+            generation_s=generation_s,
+        )
+
+    def _translate_error(self, err: BaseException) -> BaseException:
+        """Map SDK overload errors onto :class:`ModelOverloaded`."""
+        assert self._genai is not None
+        errors = getattr(self._genai, "errors", None)
+        server_error = getattr(errors, "ServerError", ())
+        if isinstance(err, (json.JSONDecodeError, server_error)) and (
+            "overloaded" in str(err).lower() or "503" in str(err)
+        ):
+            overloaded = ModelOverloaded("Gemini model is currently overloaded. Please retry later.")
+            overloaded.__cause__ = err
+            return overloaded
+        return err
+
+    async def _stream(
+        self, contents: list[Any], system_prompt: str | None, persona: str | None
+    ) -> AsyncGenerator[str, None]:
+        """Yield fragments as the blocking SDK stream produces them.
+
+        The SDK iterator runs in a worker thread that hands each fragment to the
+        event loop as soon as it arrives.  Closing this generator (or cancelling
+        the consumer) stops the worker at the next chunk and closes the upstream
+        HTTP stream.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[tuple[str | None, BaseException | None]] = asyncio.Queue()
+        stop = threading.Event()
+
+        def _post(item: tuple[str | None, BaseException | None]) -> None:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:  # loop already closed – nobody is listening
+                stop.set()
+
+        def _pump() -> None:
+            assert self._client is not None
+            try:
+                gen_config, cached = self._config(system_prompt, persona)
+                upstream = self._client.models.generate_content_stream(
+                    model=settings.gemini_model,
+                    contents=contents,
+                    config=gen_config,
+                )
+                usage = None
+                first_at: float | None = None
+                try:
+                    for chunk in upstream:
+                        if stop.is_set():
+                            break
+                        usage = getattr(chunk, "usage_metadata", None) or usage
+                        text_fragment = getattr(chunk, "text", None)
+                        if text_fragment:
+                            if first_at is None:
+                                first_at = time.perf_counter()
+                            _post((text_fragment, None))
+                    if cached is not None:
+                        self._record_cached_tokens(usage, system_prompt)
+                    if first_at is not None:
+                        self._report_usage(usage, persona, time.perf_counter() - first_at)
+                finally:
+                    close = getattr(upstream, "close", None)
+                    if close is not None:
+                        close()
+            except BaseException as err:  # noqa: BLE001 – re-raised on the loop side
+                _post((None, self._translate_error(err)))
+                return
+            _post((None, None))
+
+        run_in_threadpool(_pump, pool="llm")
+        try:
+            while True:
+                fragment, error = await queue.get()
+                if error is not None:
+                    raise error
+                if fragment is None:
+                    break
+                yield fragment
+        finally:
+            stop.set()
+
     # ---------------------------------------------------------------------
     # LLMProvider API
     # ---------------------------------------------------------------------
@@ -85,6 +256,7 @@ class _GeminiProvider(LLMProvider):
         system_prompt: str | None = options.get("system_prompt") or options.get(
             "system_instruction"
         )
+        persona: str | None = options.get("persona")
 
         # Convert generic role/content history into google-genai `Content` list.
         contents: list[types.Content] = []
@@ -99,46 +271,15 @@ class _GeminiProvider(LLMProvider):
                 role = "model"
             contents.append(types.Content(role=role, parts=[types.Part.from_text(text=text)]))
 
-        gen_config = types.GenerateContentConfig(
-            system_instruction=system_prompt,
-            response_mime_type="text/plain",
-        )
-
         if stream:
-
-            def _sync_stream() -> list[str]:
-                """Blocking call to Gemini streaming API – executed in worker thread."""
-                out: list[str] = []
-                assert self._client is not None
-                try:
-                    for chunk in self._client.models.generate_content_stream(
-                        model=settings.gemini_model,
-                        contents=contents,
-                        config=gen_config,
-                    ):
-                        text_fragment = getattr(chunk, "text", None)
-                        if text_fragment:
-                            out.append(text_fragment)
-                except (self._genai.errors.ServerError, json.JSONDecodeError) as err:
-                    if "overloaded" in str(err).lower() or "503" in str(err):
-                        raise ModelOverloaded(
-                            "Gemini model is currently overloaded. Please retry later."
-                        ) from err
-                    raise
-                return out
-
-            # Directly use `asyncio.to_thread` in the public method to avoid the
-            # redundant nested async wrapper previously used.
-            async def _stream_generator() -> AsyncGenerator[str, None]:
-                for fragment in await asyncio.to_thread(_sync_stream):
-                    yield fragment
-
-            return _stream_generator()
+            return self._stream(contents, system_prompt, persona)
 
         # Non-streaming path – much simpler
         def _sync_call() -> str:
             assert self._client is not None
+            start = time.perf_counter()
             try:
+                gen_config, cached = self._config(system_prompt, persona)
                 res = self._client.models.generate_content(
                     model=settings.gemini_model,
                     contents=contents,
@@ -146,15 +287,21 @@ class _GeminiProvider(LLMProvider):
                 )
             except (self._genai.errors.ServerError, json.JSONDecodeError) as err:
                 if "overloaded" in str(err).lower() or "503" in str(err):
-                    alerts.alert("Gemini model overloaded – some requests dropped")
+                    alerts.alert(
+                        "Gemini model overloaded – some requests dropped", cooldown_s=60.0
+                    )
                     raise ModelOverloaded(
                         "Gemini model is currently overloaded. Please retry later."
                     ) from err
-                alerts.alert("Gemini error – some requests dropped")
+                alerts.alert("Gemini error – some requests dropped", cooldown_s=60.0)
                 raise
+            usage = getattr(res, "usage_metadata", None)
+            if cached is not None:
+                self._record_cached_tokens(usage, system_prompt)
+            self._report_usage(usage, persona, time.perf_counter() - start)
             return getattr(res, "text", str(res))
 
-        return await asyncio.to_thread(_sync_call)
+        return await run_in_threadpool(_sync_call, pool="llm")
 
 
 # Singleton instance expected by the dynamic registry
@@ -0,0 +1,279 @@
+"""Routing across registered LLM providers: ordered fallback and hedging.
+
+:class:`RoutingProvider` satisfies :class:`~swarm.ai.contracts.LLMProvider` by
+delegating to the providers in :mod:`swarm.ai.providers`, in the configured
+order:
+
+* a provider whose circuit breaker is open is skipped until its cool-down
+  expires, after which a single trial request is let through;
+* if a provider fails (``ModelOverloaded`` or any other error) before producing
+  its first fragment, the next one is tried;
+* with hedging enabled, if the current provider has not produced a first
+  fragment within its observed p95 time-to-first-token, the next provider is
+  started as well and whichever answers first wins – the loser is cancelled.
+
+Streams are primed – the first fragment is awaited before ``generate``
+returns – so fallback happens before the caller sees any output.  Failures
+after that point are reported to the caller as usual.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator
+from typing import Any
+
+from swarm.ai import providers as _providers
+from swarm.ai.contracts import LLMProvider, Message
+from swarm.core.exceptions import ModelOverloaded
+from swarm.core.settings import settings
+from swarm.core.telemetry import record_llm_fallback, record_llm_hedge, update_llm_health
+
+_log = logging.getLogger(__name__)
+
+# (first fragment or None, stream or full reply)
+_Attempt = tuple[str | None, Any]
+
+
+class ProviderHealth:
+    """Health score, circuit breaker and TTFT window for one provider."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int = 5,
+        reset_after: float = 30.0,
+        alpha: float = 0.2,
+    ) -> None:
+        self.name = name
+        self.score = 1.0  # EWMA of successes (1) and failures (0)
+        self._alpha = alpha
+        self._failure_threshold = failure_threshold
+        self._reset_after = reset_after
+        self._consecutive_failures = 0
+        self._opened_at: float | None = None
+        self._trial_inflight = False
+        self._ttft: deque[float] = deque(maxlen=200)
+        self._publish()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def _publish(self) -> None:
+        update_llm_health(self.name, self.score, self.is_open)
+
+    def available(self) -> bool:
+        """Whether a request may go to this provider now (claims the half-open trial)."""
+        if self._opened_at is None:
+            return True
+        if self._trial_inflight or time.monotonic() - self._opened_at < self._reset_after:
+            return False
+        self._trial_inflight = True
+        return True
+
+    def success(self, ttft: float | None = None) -> None:
+        self.score += self._alpha * (1.0 - self.score)
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._trial_inflight = False
+        if ttft is not None:
+            self._ttft.append(ttft)
+        self._publish()
+
+    def failure(self) -> None:
+        self.score -= self._alpha * self.score
+        self._consecutive_failures += 1
+        if self._trial_inflight or self._consecutive_failures >= self._failure_threshold:
+            if self._opened_at is None:
+                _log.warning("LLM provider '%s' circuit opened", self.name)
+            self._opened_at = time.monotonic()
+        self._trial_inflight = False
+        self._publish()
+
+    def abandon(self) -> None:
+        """A request was cancelled without an outcome – free the half-open trial."""
+        self._trial_inflight = False
+
+    def hedge_delay(self, default: float) -> float:
+        """p95 time-to-first-token once enough samples exist, else *default*."""
+        if len(self._ttft) < 20:
+            return default
+        ordered = sorted(self._ttft)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+
+_health: dict[str, ProviderHealth] = {}
+
+
+def health(name: str) -> ProviderHealth:
+    """Return the shared health tracker for provider *name*."""
+    tracker = _health.get(name)
+    if tracker is None:
+        tracker = ProviderHealth(
+            name,
+            failure_threshold=getattr(settings, "llm_circuit_failures", 5),
+            reset_after=getattr(settings, "llm_circuit_reset_seconds", 30.0),
+        )
+        _health[name] = tracker
+    return tracker
+
+
+class RoutingProvider:
+    """LLM provider that routes each call across an ordered list of providers."""
+
+    name: str = "router"
+
+    def __init__(
+        self,
+        names: list[str],
+        *,
+        hedge: bool = False,
+        hedge_default_delay: float = 2.0,
+    ) -> None:
+        self._names = list(dict.fromkeys(names))
+        self._hedge = hedge
+        self._hedge_default_delay = hedge_default_delay
+
+    @staticmethod
+    def _options_for(name: str, options: dict[str, Any]) -> dict[str, Any]:
+        # A model name only makes sense for the provider it was configured for.
+        if "model" in options:
+            return {**options, "model": getattr(settings, f"{name}_model", None)}
+        return options
+
+    async def _attempt(
+        self, name: str, messages: list[Message], stream: bool, options: dict[str, Any]
+    ) -> _Attempt:
+        tracker = health(name)
+        start = time.perf_counter()
+        try:
+            result = await _providers.get(name).generate(
+                messages=messages, stream=stream, **self._options_for(name, options)
+            )
+            if isinstance(result, str):
+                tracker.success()
+                return None, result
+            iterator: AsyncIterator[str] = result.__aiter__()
+            try:
+                first: str | None = await iterator.__anext__()
+            except StopAsyncIteration:
+                first = None
+            tracker.success(time.perf_counter() - start)
+            return first, iterator
+        except asyncio.CancelledError:
+            tracker.abandon()
+            raise
+        except Exception:
+            tracker.failure()
+            raise
+
+    async def _race(
+        self, candidates: list[str], messages: list[Message], stream: bool, options: dict[str, Any]
+    ) -> tuple[str, _Attempt]:
+        waiting = list(candidates)
+        running: dict[asyncio.Task[_Attempt], str] = {}
+        errors: list[BaseException] = []
+
+        def _launch() -> bool:
+            # Breakers are consulted only when a provider is actually needed, so
+            # an untried fallback never holds on to its half-open trial slot.
+            while waiting:
+                name = waiting.pop(0)
+                if health(name).available():
+                    task = asyncio.create_task(self._attempt(name, messages, stream, options))
+                    running[task] = name
+                    return True
+            return False
+
+        if not _launch():
+            raise ModelOverloaded("No LLM provider is currently available. Please retry later.")
+        try:
+            while running:
+                timeout = None
+                if self._hedge and waiting and len(running) == 1:
+                    (current,) = running.values()
+                    timeout = health(current).hedge_delay(self._hedge_default_delay)
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    (current,) = running.values()
+                    if _launch():
+                        record_llm_hedge(current)
+                    continue
+                for task in done:
+                    name = running.pop(task)
+                    exc = task.exception()
+                    if exc is None:
+                        return name, task.result()
+                    errors.append(exc)
+                    _log.warning("LLM provider '%s' failed, trying next: %s", name, exc)
+                    if waiting:
+                        record_llm_fallback(name)
+                        if not running:
+                            _launch()
+        finally:
+            for task in running:
+                task.cancel()
+            for task in running:
+                # A loser that already produced a stream must release it.
+                try:
+                    _, reply = await task
+                except BaseException:
+                    continue
+                aclose = getattr(reply, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+        overloaded = [e for e in errors if isinstance(e, ModelOverloaded)]
+        raise (overloaded[-1] if overloaded else errors[-1])
+
+    async def generate(
+        self,
+        *,
+        messages: list[Message],
+        stream: bool = False,
+        **options: Any,
+    ) -> str | AsyncIterator[str]:
+        registered = _providers.all()
+        candidates = [n for n in self._names if n in registered]
+        name, (first, reply) = await self._race(candidates, messages, stream, options)
+        if isinstance(reply, str):
+            return reply
+        return self._relay(name, first, reply)
+
+    @staticmethod
+    async def _relay(
+        name: str, first: str | None, iterator: AsyncIterator[str]
+    ) -> AsyncGenerator[str, None]:
+        try:
+            if first is not None:
+                yield first
+            async for fragment in iterator:
+                yield fragment
+        except Exception:
+            health(name).failure()
+            raise
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+
+def with_fallbacks(primary: str, provider: LLMProvider) -> LLMProvider:
+    """Return *provider* (registered as *primary*), or a router if fallbacks are configured."""
+    fallbacks = [n for n in getattr(settings, "llm_fallback_providers", []) if n != primary]
+    if not fallbacks:
+        return provider
+    return RoutingProvider(
+        [primary, *fallbacks],
+        hedge=getattr(settings, "llm_hedge_enabled", False),
+        hedge_default_delay=getattr(settings, "llm_hedge_default_delay_seconds", 2.0),
+    )
+
+
+__all__ = ["ProviderHealth", "RoutingProvider", "health", "with_fallbacks"]
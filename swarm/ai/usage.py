@@ -0,0 +1,82 @@
+"""Token and cost accounting for LLM calls.
+
+Provider adapters call :func:`report_usage` once per completion with the token
+counts the vendor returned.  Each report is
+
+* exported to Prometheus (tokens by kind, estimated cost, output tokens/sec –
+  labelled by provider, model and persona), and
+* added to the per-day ledger in :mod:`swarm.core.metrics` that ``/status``
+  compares against ``llm_daily_request_quota``.
+
+Cost is estimated from ``llm_prices`` (USD per million input/output tokens,
+keyed by model); models without a price are counted at zero.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from swarm.core import metrics
+from swarm.core.settings import settings
+from swarm.core.telemetry import record_llm_usage
+
+# Cached input tokens are billed at a fraction of the normal input price.
+CACHED_INPUT_RATE = 0.25
+
+
+@dataclass(frozen=True)
+class Usage:
+    """Token counts of one completion as reported by the provider."""
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0  # part of input_tokens served from a prompt cache
+
+
+def estimate_cost(model: str, usage: Usage) -> float:
+    """Return the estimated USD cost of *usage* on *model* (0.0 if unpriced)."""
+    prices = getattr(settings, "llm_prices", {}).get(model)
+    if not prices:
+        return 0.0
+    input_price, output_price = prices
+    cached = min(usage.cached_tokens, usage.input_tokens)
+    billed_input = usage.input_tokens - cached + cached * CACHED_INPUT_RATE
+    return (billed_input * input_price + usage.output_tokens * output_price) / 1_000_000
+
+
+def report_usage(
+    provider: str,
+    model: str,
+    usage: Usage,
+    *,
+    persona: str | None = None,
+    generation_s: float | None = None,
+) -> None:
+    """Record the tokens and estimated cost of one completion.
+
+    *generation_s* is the time spent producing output (after the first token
+    for streams) and yields the tokens/sec figure.
+    """
+    cost = estimate_cost(model, usage)
+    tokens_per_s = None
+    if generation_s and generation_s > 0 and usage.output_tokens:
+        tokens_per_s = usage.output_tokens / generation_s
+    record_llm_usage(
+        provider,
+        model,
+        persona or "",
+        input_tokens=usage.input_tokens,
+        output_tokens=usage.output_tokens,
+        cached_tokens=usage.cached_tokens,
+        cost_usd=cost,
+        tokens_per_s=tokens_per_s,
+    )
+    metrics.add_llm_usage(
+        provider,
+        input_tokens=usage.input_tokens,
+        output_tokens=usage.output_tokens,
+        cost_usd=cost,
+    )
+
+
+__all__ = ["Usage", "estimate_cost", "report_usage"]
@@ -9,8 +9,8 @@ Usage:
     # Browser worker (async tasks with prefork pool - Playwright compatible)
     poetry run celery -A swarm.celery_app worker --loglevel=info --queue=browser --concurrency=4
 
-    # LLM worker (CPU/GPU bound tasks)
-    poetry run celery -A swarm.celery_app worker --loglevel=info --queue=llm --concurrency=1
+    # LLM worker (I/O bound; threads share one event loop and concurrency limiter)
+    poetry run celery -A swarm.celery_app worker --loglevel=info --queue=llm --pool=threads --concurrency=16
 
     # Multi-queue worker
     poetry run celery -A swarm.celery_app worker --loglevel=info --queue=browser,analysis,llm
@@ -19,8 +19,8 @@ Or with this script:
     # Browser worker - each process handles one task at a time, but each task can drive many tabs
     poetry run python -m swarm.celery_worker --queues=browser --pool=prefork --concurrency=4
 
-    # LLM worker with single process for dedicated GPU/CPU
-    poetry run python -m swarm.celery_worker --queues=llm --pool=prefork --concurrency=1
+    # LLM worker - many waiting tasks per process share the provider's concurrency limit
+    poetry run python -m swarm.celery_worker --queues=llm --pool=threads --concurrency=16
 
 WARNING: Do not use eventlet/gevent pools with Playwright - they monkey-patch socket/threading
 and are incompatible with Chromium. Use prefork (default) for browser automation.
@@ -33,6 +33,7 @@ import sys
 from typing import List, Literal
 
 from celery import Celery
+from celery.utils.nodenames import default_nodename, host_format
 
 from swarm.celery_app import app
 from swarm.core.logger_setup import setup_logging
@@ -62,8 +63,11 @@ def parse_args() -> argparse.Namespace:
         "--pool",
         type=str,
         default="prefork",
-        choices=["prefork", "eventlet", "gevent", "solo"],
-        help="Pool implementation: prefork (default), eventlet/gevent (for async), solo (single thread)",
+        choices=["prefork", "eventlet", "gevent", "solo", "threads"],
+        help=(
+            "Pool implementation: prefork (default), eventlet/gevent (for async), "
+            "solo (single thread), threads (LLM workers)"
+        ),
     )
 
     parser.add_argument(
@@ -108,11 +112,21 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def worker_nodename(hostname: str | None, host: str | None = None) -> str:
+    """
+    Nodename a worker started with ``--hostname=hostname`` registers under.
+
+    Expands ``%h``/``%n``/``%d`` like ``celery worker`` does (``Worker`` itself
+    does not); without a hostname this is Celery's ``celery@<host>`` default.
+    """
+    return host_format(default_nodename(hostname or "celery@%h"), host=host)
+
+
 def start_worker(
     queues: list[str],
     concurrency: int,
     loglevel: str,
-    pool: Literal["prefork", "eventlet", "gevent", "solo"] = "prefork",
+    pool: Literal["prefork", "eventlet", "gevent", "solo", "threads"] = "prefork",
     hostname: str | None = None,
     autoscale: str | None = None,
     max_tasks_per_child: int = 100,
@@ -127,7 +141,7 @@ def start_worker(
         queues: List of queue names to consume from
         concurrency: Number of concurrent worker processes/threads
         loglevel: Logging level
-        pool: Pool implementation (prefork, eventlet, gevent, solo)
+        pool: Pool implementation (prefork, eventlet, gevent, solo, threads)
         hostname: Custom worker hostname
         autoscale: Autoscaling configuration as "max,min"
         max_tasks_per_child: Max tasks before worker restart
@@ -148,7 +162,7 @@ def start_worker(
 
     worker = Worker(
         app=app,
-        hostname=hostname,
+        hostname=worker_nodename(hostname),
         pool_cls=pool,
         loglevel=loglevel,
         concurrency=concurrency,
@@ -48,8 +48,20 @@ async def send_alert(message: str) -> None:
                 pass
 
 
-def alert(message: str) -> None:  # convenience wrapper, non-awaitable
-    """Fire-and-forget alert; schedules the send on the current loop."""
+_last_sent: dict[str, float] = {}
+
+
+def alert(message: str, *, cooldown_s: float = 0.0) -> None:  # non-awaitable wrapper
+    """Fire-and-forget alert; schedules the send on the current loop.
+
+    With *cooldown_s*, repeats of the same *message* within that window are
+    dropped so a burst of identical failures produces a single alert.
+    """
+    if cooldown_s > 0:
+        now = time.monotonic()
+        if now - _last_sent.get(message, float("-inf")) < cooldown_s:
+            return
+        _last_sent[message] = now
     try:
         loop = asyncio.get_running_loop()
     except RuntimeError:
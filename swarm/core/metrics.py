@@ -6,6 +6,7 @@ This file now carries full type hints so it passes `mypy --strict`.
 
 from __future__ import annotations
 
+import datetime
 import os
 import time
 from types import ModuleType  # Added ModuleType
@@ -31,6 +32,9 @@ process_start_time: float = time.time()
 messages_sent: int = 0
 # incremented by the MetricsTracker cog (on_message listener)
 discord_messages_processed: int = 0
+# LLM consumption of the current UTC day, per provider (see swarm.ai.usage)
+llm_usage_day: str = ""
+llm_usage: dict[str, dict[str, float]] = {}
 
 
 def increment_discord_message_count() -> None:
@@ -89,6 +93,37 @@ def get_stats() -> dict[str, float | int]:
     }
 
 
+def _utc_day() -> str:
+    return datetime.datetime.now(datetime.UTC).date().isoformat()
+
+
+def add_llm_usage(
+    provider: str, *, input_tokens: int, output_tokens: int, cost_usd: float
+) -> None:
+    """
+    Add one completion to today's per-provider LLM consumption.
+    """
+    global llm_usage_day
+    today = _utc_day()
+    if today != llm_usage_day:
+        llm_usage_day = today
+        llm_usage.clear()
+    row = llm_usage.setdefault(
+        provider, {"requests": 0, "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0}
+    )
+    row["requests"] += 1
+    row["input_tokens"] += input_tokens
+    row["output_tokens"] += output_tokens
+    row["cost_usd"] += cost_usd
+
+
+def get_llm_usage() -> dict[str, dict[str, float]]:
+    """Return today's (UTC) LLM consumption keyed by provider."""
+    if llm_usage_day != _utc_day():
+        return {}
+    return {provider: dict(row) for provider, row in llm_usage.items()}
+
+
 # ------------------------------------------------------------+
 #  New public helpers                                         |
 # ------------------------------------------------------------+
@@ -44,6 +44,18 @@ class QueueConfig(BaseModel):
     model_config = {"extra": "ignore"}
 
 
+class ExecutorConfig(BaseModel):
+    """Thread counts of the named pools used by ``run_in_threadpool(..., pool=...)``."""
+
+    llm: int = 32  # streaming LLM calls hold a thread each; keep >= llm_concurrency_max
+    image: int = 2
+    docker: int = 4
+    celery_wait: int = 16  # "celery-wait": blocking AsyncResult.get()
+    default: int = 4  # any other pool name
+
+    model_config = {"extra": "ignore"}
+
+
 class Settings(BaseSettings):
     if TYPE_CHECKING:  # pragma: no cover
 
@@ -73,7 +85,44 @@ class Settings(BaseSettings):
     redis: RedisConfig = RedisConfig()
 
     conversation_max_turns: int = 8  # Rolling chat history length per channel + persona
+    conversation_max_tokens: int = 4000  # Prompt budget for replayed history (estimated tokens)
+    conversation_ttl_seconds: int = 7 * 24 * 3600  # Idle history expiry in Redis (0 = never)
+    history_cache_channels: int = 1024  # Channels kept in the local history LRU (0 = disabled)
+    # Write history turns as JSON, which releases before the length-prefixed format
+    # can read.  Enable while upgrading replicas one by one, then turn it off.
+    history_legacy_encoding: bool = False
+    # Background summarization: once a buffer holds this many turns, all but the newest
+    # `history_compact_keep` are folded into one summary turn.  Use a value close to
+    # conversation_max_turns (e.g. max_turns - 1) so most turns stay verbatim.
+    # 0 disables compaction.
+    history_compact_threshold: int = 0
+    history_compact_keep: int = 2
+    # Reuse identical LLM replies this long, e.g. 86400 (0 = off; opt-in because repeated
+    # prompts then get the same reply instead of a fresh one).
+    llm_cache_ttl_seconds: int = 0
+    llm_cache_max_entries: int = 512  # Replies kept in the in-process cache tier
+    # Adaptive per-provider concurrency (AIMD) and the queue in front of it.
+    llm_concurrency_initial: int = 4
+    llm_concurrency_max: int = 32
+    llm_queue_max: int = 64  # Waiting requests beyond this are rejected as overloaded
+    llm_queue_timeout_seconds: float = 30.0  # Max time a request waits for a slot
+    # Chat routing: providers tried in order after `llm_provider` fails or is
+    # circuit-broken (CSV in .env), and optional hedging on slow first tokens.
+    llm_fallback_providers: list[str] = []
+    llm_hedge_enabled: bool = False
+    llm_hedge_default_delay_seconds: float = 2.0  # Used until enough TTFT samples exist
+    llm_circuit_failures: int = 5  # Consecutive failures that open a provider's breaker
+    llm_circuit_reset_seconds: float = 30.0
+    # Provider-side caching of persona system prompts, e.g. 3600 (0 = off).  Prompts
+    # shorter than the minimum are sent inline – the provider would reject the cache.
+    llm_prompt_cache_ttl_seconds: int = 0
+    llm_prompt_cache_min_tokens: int = 1024
+    # Cost accounting: USD per million (input, output) tokens keyed by model, and
+    # requests per UTC day each provider allows (JSON in .env; shown by /status).
+    llm_prices: dict[str, tuple[float, float]] = {}
+    llm_daily_request_quota: dict[str, int] = {}
     discord_chunk_size: int = 1900  # Characters per Discord message chunk
+    discord_stream_edit_interval: float = 1.0  # Min seconds between edits of a streamed reply
     # gemini_model: str = "gemini-2.5-flash"  # Backup Gemini model name, quota is shared 500 per day.
     gemini_model: str = "gemini-2.5-flash-preview-04-17"  # Default Gemini model name
 
@@ -95,6 +144,7 @@ class Settings(BaseSettings):
 
     browser: BrowserConfig = BrowserConfig()
     queues: QueueConfig = QueueConfig()
+    executors: ExecutorConfig = ExecutorConfig()
 
     # --- URL guard-rails ---
     allowed_hosts: list[str] = []  # e.g. ["github.com", "docs.python.org"]
@@ -102,7 +152,7 @@ class Settings(BaseSettings):
     # --- observability ---
     metrics_port: int = 9200  # Prometheus exporter port (0 = disabled)
 
-    @field_validator("allowed_hosts", mode="before")
+    @field_validator("allowed_hosts", "llm_fallback_providers", mode="before")
     @classmethod
     def _split_csv(cls, v: Any) -> list[str]:  # noqa: D401
         """
@@ -153,6 +203,7 @@ __all__ = [
     "Settings",
     "BrowserConfig",
     "QueueConfig",
+    "ExecutorConfig",
     "RedisConfig",
     "DISCORD_LIMIT",
 ]
@@ -33,8 +33,25 @@ from prometheus_client import (
 
 __all__ = [
     "record_llm_call",
+    "record_llm_first_token",
+    "record_llm_cache",
+    "record_llm_coalesced",
+    "record_llm_rejection",
+    "update_llm_limiter",
+    "update_llm_health",
+    "record_llm_fallback",
+    "record_llm_hedge",
+    "record_llm_prompt_cache",
+    "record_llm_prompt_cache_saved",
+    "record_llm_usage",
     "record_frame",
     "update_queue_gauge",
+    "update_celery_queue_depth",
+    "update_autoscaler_estimate",
+    "record_worker_ready",
+    "update_worker_containers",
+    "record_executor_wait",
+    "update_executor_threads",
     "start_exporter",
 ]
 
@@ -63,6 +80,138 @@ LLM_LATENCY = Histogram(
     ["provider"],
     registry=REGISTRY,
 )
+LLM_CACHE_TOTAL = Counter(
+    "llm_cache_requests_total",
+    "LLM response cache lookups by provider and result (hit/miss)",
+    ["provider", "result"],
+    registry=REGISTRY,
+)
+LLM_CACHE_SAVED = Counter(
+    "llm_cache_saved_seconds_total",
+    "Generation time avoided by serving LLM replies from cache",
+    ["provider"],
+    registry=REGISTRY,
+)
+LLM_COALESCED_TOTAL = Counter(
+    "llm_coalesced_requests_total",
+    "LLM calls served by joining an identical in-flight request",
+    ["provider"],
+    registry=REGISTRY,
+)
+LLM_CONCURRENCY_LIMIT = Gauge(
+    "llm_concurrency_limit",
+    "Current adaptive concurrency limit per LLM provider",
+    ["provider"],
+    registry=REGISTRY,
+)
+LLM_INFLIGHT = Gauge(
+    "llm_inflight_requests",
+    "LLM requests currently admitted upstream",
+    ["provider"],
+    registry=REGISTRY,
+)
+LLM_QUEUE_DEPTH = Gauge(
+    "llm_queue_depth",
+    "LLM requests waiting for a concurrency slot",
+    ["provider"],
+    registry=REGISTRY,
+)
+LLM_REJECTED_TOTAL = Counter(
+    "llm_rejected_total",
+    "LLM requests rejected by the concurrency limiter",
+    ["provider", "reason"],
+    registry=REGISTRY,
+)
+LLM_PROVIDER_HEALTH = Gauge(
+    "llm_provider_health",
+    "Routing health score per LLM provider (EWMA of successes, 0-1)",
+    ["provider"],
+    registry=REGISTRY,
+)
+LLM_CIRCUIT_OPEN = Gauge(
+    "llm_circuit_open",
+    "1 while the provider's circuit breaker is open",
+    ["provider"],
+    registry=REGISTRY,
+)
+LLM_FALLBACK_TOTAL = Counter(
+    "llm_fallback_total",
+    "Requests routed to the next provider after this one failed",
+    ["provider"],
+    registry=REGISTRY,
+)
+LLM_HEDGE_TOTAL = Counter(
+    "llm_hedged_total",
+    "Hedge requests started because this provider was slow to first token",
+    ["provider"],
+    registry=REGISTRY,
+)
+LLM_PROMPT_CACHE_TOTAL = Counter(
+    "llm_prompt_cache_total",
+    "Provider-side system prompt cache lookups by outcome",
+    ["provider", "result"],
+    registry=REGISTRY,
+)
+LLM_PROMPT_CACHE_SAVED_TOKENS = Counter(
+    "llm_prompt_cache_saved_tokens_total",
+    "Input tokens served from a provider-side prompt cache",
+    ["provider"],
+    registry=REGISTRY,
+)
+LLM_TOKENS_TOTAL = Counter(
+    "llm_tokens_total",
+    "LLM tokens by kind (input, output, cached input)",
+    ["provider", "model", "persona", "kind"],
+    registry=REGISTRY,
+)
+LLM_COST_TOTAL = Counter(
+    "llm_cost_usd_total",
+    "Estimated LLM spend in USD",
+    ["provider", "model", "persona"],
+    registry=REGISTRY,
+)
+LLM_TOKENS_PER_SECOND = Histogram(
+    "llm_output_tokens_per_second",
+    "Output generation speed of LLM completions",
+    ["provider", "model"],
+    buckets=(5, 10, 20, 40, 80, 160, 320, 640),
+    registry=REGISTRY,
+)
+LLM_TTFT = Histogram(
+    "llm_time_to_first_token_seconds",
+    "Delay until a streamed LLM completion yields its first fragment",
+    ["provider"],
+    registry=REGISTRY,
+)
+
+# ——— Celery broker metrics ———————————————————————————————————————
+CELERY_QUEUE_DEPTH = Gauge(
+    "celery_queue_depth",
+    "Messages in a Celery queue on the Redis broker (ready or unacknowledged)",
+    ["queue", "state"],
+    registry=REGISTRY,
+)
+AUTOSCALER_ESTIMATE = Gauge(
+    "autoscaler_estimate",
+    "Autoscaler load estimates per worker type "
+    "(arrival_rate, service_seconds, queue_wait_seconds, desired_workers, forecast_workers)",
+    ["worker_type", "kind"],
+    registry=REGISTRY,
+)
+WORKER_TIME_TO_READY = Histogram(
+    "worker_time_to_ready_seconds",
+    "Time from creating (cold) or activating (standby) a worker container until it consumes",
+    ["worker_type", "start"],
+    buckets=(0.5, 1, 2, 5, 10, 20, 30, 45, 60, 90, 120, 180),
+    registry=REGISTRY,
+)
+WORKER_CONTAINERS = Gauge(
+    "worker_containers",
+    "Worker containers per worker type from the Docker inventory "
+    "(running, unhealthy, crash_looping)",
+    ["worker_type", "state"],
+    registry=REGISTRY,
+)
 
 # ——— TankPit frame metrics ————————————————————————————————————————
 FRAME_TOTAL = Counter(
@@ -78,6 +227,25 @@ FRAME_LATENCY = Histogram(
 )
 
 # ——— Dynamic gauges ————————————————————————————————————————————————
+EXECUTOR_QUEUE_WAIT = Histogram(
+    "executor_queue_wait_seconds",
+    "Time a blocking call waited for a thread in a named pool",
+    ["pool"],
+    registry=REGISTRY,
+)
+EXECUTOR_ACTIVE = Gauge(
+    "executor_active_threads",
+    "Threads of a named pool currently running a call",
+    ["pool"],
+    registry=REGISTRY,
+)
+EXECUTOR_QUEUED = Gauge(
+    "executor_queued_calls",
+    "Calls waiting for a thread in a named pool",
+    ["pool"],
+    registry=REGISTRY,
+)
+
 QUEUE_SIZE = Gauge(
     "swarm_queue_fill",
     "Current fill level of named asyncio.Queue",
@@ -126,6 +294,118 @@ def record_llm_call(provider: str, status: str, duration_s: float) -> None:
     LLM_LATENCY.labels(provider).observe(duration_s)
 
 
+def record_llm_first_token(provider: str, duration_s: float) -> None:
+    """Record time-to-first-token for a streamed LLM completion."""
+    LLM_TTFT.labels(provider).observe(duration_s)
+
+
+def record_llm_cache(provider: str, *, hit: bool, saved_s: float = 0.0) -> None:
+    """Record one response-cache lookup and, on a hit, the latency it saved."""
+    LLM_CACHE_TOTAL.labels(provider, "hit" if hit else "miss").inc()
+    if hit:
+        LLM_CACHE_SAVED.labels(provider).inc(saved_s)
+
+
+def record_llm_coalesced(provider: str) -> None:
+    """Count an LLM call that shared an identical in-flight upstream request."""
+    LLM_COALESCED_TOTAL.labels(provider).inc()
+
+
+def update_llm_limiter(provider: str, limit: int, inflight: int, queued: int) -> None:
+    """Publish the adaptive limiter state for *provider*."""
+    LLM_CONCURRENCY_LIMIT.labels(provider).set(limit)
+    LLM_INFLIGHT.labels(provider).set(inflight)
+    LLM_QUEUE_DEPTH.labels(provider).set(queued)
+
+
+def record_llm_rejection(provider: str, reason: str) -> None:
+    """Count an LLM request the limiter turned away (``queue_full``/``timeout``)."""
+    LLM_REJECTED_TOTAL.labels(provider, reason).inc()
+
+
+def update_llm_health(provider: str, score: float, circuit_open: bool) -> None:
+    """Publish the routing health score and breaker state for *provider*."""
+    LLM_PROVIDER_HEALTH.labels(provider).set(score)
+    LLM_CIRCUIT_OPEN.labels(provider).set(1 if circuit_open else 0)
+
+
+def record_llm_fallback(provider: str) -> None:
+    """Count a request that moved on from *provider* after it failed."""
+    LLM_FALLBACK_TOTAL.labels(provider).inc()
+
+
+def record_llm_hedge(provider: str) -> None:
+    """Count a hedge request started because *provider* was slow."""
+    LLM_HEDGE_TOTAL.labels(provider).inc()
+
+
+def record_llm_prompt_cache(provider: str, result: str) -> None:
+    """Count one prompt cache lookup (``hit``/``created``/``refreshed``/``fallback``)."""
+    LLM_PROMPT_CACHE_TOTAL.labels(provider, result).inc()
+
+
+def record_llm_prompt_cache_saved(provider: str, tokens: int) -> None:
+    """Add input tokens that *provider* served from its prompt cache."""
+    LLM_PROMPT_CACHE_SAVED_TOKENS.labels(provider).inc(tokens)
+
+
+def record_llm_usage(
+    provider: str,
+    model: str,
+    persona: str,
+    *,
+    input_tokens: int,
+    output_tokens: int,
+    cached_tokens: int = 0,
+    cost_usd: float = 0.0,
+    tokens_per_s: float | None = None,
+) -> None:
+    """Record token counts, estimated cost and output speed of one completion."""
+    LLM_TOKENS_TOTAL.labels(provider, model, persona, "input").inc(input_tokens)
+    LLM_TOKENS_TOTAL.labels(provider, model, persona, "output").inc(output_tokens)
+    if cached_tokens:
+        LLM_TOKENS_TOTAL.labels(provider, model, persona, "cached").inc(cached_tokens)
+    if cost_usd:
+        LLM_COST_TOTAL.labels(provider, model, persona).inc(cost_usd)
+    if tokens_per_s is not None:
+        LLM_TOKENS_PER_SECOND.labels(provider, model).observe(tokens_per_s)
+
+
+def record_executor_wait(pool: str, wait_s: float) -> None:
+    """Record how long a call queued before a thread of *pool* picked it up."""
+    EXECUTOR_QUEUE_WAIT.labels(pool).observe(wait_s)
+
+
+def update_executor_threads(pool: str, active: int, queued: int) -> None:
+    """Publish busy-thread and backlog counts for *pool*."""
+    EXECUTOR_ACTIVE.labels(pool).set(active)
+    EXECUTOR_QUEUED.labels(pool).set(queued)
+
+
+def update_celery_queue_depth(queue: str, ready: int, unacked: int) -> None:
+    """Publish ready and unacknowledged message counts of a Celery *queue*."""
+    CELERY_QUEUE_DEPTH.labels(queue, "ready").set(ready)
+    CELERY_QUEUE_DEPTH.labels(queue, "unacked").set(unacked)
+
+
+def update_autoscaler_estimate(worker_type: str, **values: float | None) -> None:
+    """Publish the autoscaler's estimates for *worker_type*; ``None`` values are skipped."""
+    for kind, value in values.items():
+        if value is not None:
+            AUTOSCALER_ESTIMATE.labels(worker_type, kind).set(value)
+
+
+def record_worker_ready(worker_type: str, start: str, seconds: float) -> None:
+    """Record how long a ``cold`` or ``standby`` worker container took to become ready."""
+    WORKER_TIME_TO_READY.labels(worker_type, start).observe(seconds)
+
+
+def update_worker_containers(worker_type: str, **counts: int) -> None:
+    """Publish container counts per state for *worker_type*."""
+    for state, count in counts.items():
+        WORKER_CONTAINERS.labels(worker_type, state).set(count)
+
+
 def record_frame(direction: str, duration_s: float) -> None:
     """Record one processed TankPit frame."""
     FRAME_TOTAL.labels(direction).inc()
@@ -3,12 +3,37 @@ Docker API Scaling Backend
 ==========================
 
 Implements scaling using direct Docker API for proper container lifecycle management.
+
+Scale-down is drain-aware.  Workers run with ``task_acks_late``, so stopping a
+container mid-task requeues the task to start over elsewhere.  Victims are
+therefore ranked by load (Celery ``inspect().active()``, falling back to the
+``state`` of the worker heartbeat), idle containers first.  Each victim is then
+told to stop consuming its queue (``cancel_consumer``) and stopped once its
+active tasks finished or ``drain_timeout`` expired.
+
+Scale-up creates containers concurrently (at most ``create_concurrency`` at a
+time).  With ``standby_count`` set, the backend also keeps that many
+pre-booted standby containers per worker type (``<project>_<type>_standby_<n>``).
+They consume an unused ``<type>.standby`` queue and are paused once their
+Celery worker answers a ping; paused containers do not count as workers.
+Activating one (rename, unpause, ``add_consumer``) takes about a second
+instead of a full cold start.  Time-to-ready of every new worker is recorded
+in ``worker_time_to_ready_seconds``.
+
+With ``watch_events`` the backend keeps a :class:`ContainerInventory` fed by
+the Docker events stream; worker counts are then answered from memory and
+crash-looping containers are the first scale-down victims.  Call ``start()``
+before use and ``stop()`` on shutdown.
 """
 
 import asyncio
+import json
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, cast
+
+from celery.utils.nodenames import host_format
 
 try:
     import docker
@@ -17,7 +42,11 @@ try:
 except ImportError:
     raise ImportError("Docker SDK required. Install with: pip install docker")
 
+from swarm.core.telemetry import record_worker_ready
+from swarm.distributed.backends.docker_inventory import STANDBY_MARKER, ContainerInventory
 from swarm.distributed.services.scaling_service import ScalingBackend
+from swarm.types import RedisBytes
+from swarm.utils.async_helpers import run_in_threadpool
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +65,15 @@ class DockerApiBackend(ScalingBackend):
         project_name: str = "swarm",
         app_mount_path: str | None = None,
         worker_metrics_port: int = 9100,
+        celery_app: Any | None = None,
+        redis_client: RedisBytes | None = None,
+        drain_timeout: float = 45.0,
+        drain_poll_interval: float = 2.0,
+        create_concurrency: int = 4,
+        standby_count: int = 0,
+        ready_timeout: float = 180.0,
+        watch_events: bool = False,
+        reconcile_interval: float = 60.0,
     ):
         """
         Initialize Docker API backend.
@@ -46,11 +84,39 @@ class DockerApiBackend(ScalingBackend):
             project_name: Project name prefix for containers
             app_mount_path: Path to mount as /app in container (auto-detected if None)
             worker_metrics_port: Port for worker metrics endpoint (default: 9100)
+            celery_app: Celery app used to inspect and drain workers on scale-down
+            redis_client: Redis holding the worker heartbeats (busy/idle state)
+            drain_timeout: Seconds to wait for a victim's active tasks before stopping it;
+                keep it below ``SCALING_TYPE_TIMEOUT`` or the pass is cancelled mid-drain
+            drain_poll_interval: Seconds between checks of a draining or starting worker
+            create_concurrency: Containers created in parallel on scale-up
+            standby_count: Paused standby containers kept per worker type (needs celery_app)
+            ready_timeout: Seconds to wait for a new worker's first ping
+            watch_events: Keep an in-memory container inventory from Docker events
+            reconcile_interval: Seconds between full listings that correct the inventory
         """
         self.image = image
         self.project_name = project_name
         self.client = docker.from_env()
         self.worker_metrics_port = worker_metrics_port
+        self.celery_app = celery_app
+        self.redis = redis_client
+        self.drain_timeout = drain_timeout
+        self.drain_poll_interval = drain_poll_interval
+        self.ready_timeout = ready_timeout
+        self._create_slots = asyncio.Semaphore(max(create_concurrency, 1))
+        self._ready_tasks: set[asyncio.Task[None]] = set()
+        if standby_count and celery_app is None:
+            logger.warning("Standby containers need a Celery app to activate them; disabled")
+            standby_count = 0
+        self.standby_count = standby_count
+        self.inventory = (
+            ContainerInventory(
+                self.client, project_name, reconcile_interval=reconcile_interval
+            )
+            if watch_events
+            else None
+        )
 
         # Auto-detect app mount path if not provided
         if app_mount_path is None:
@@ -74,16 +140,23 @@ class DockerApiBackend(ScalingBackend):
                 return True
 
             if current_count < target_count:
-                # Scale up
-                containers_to_create = target_count - current_count
-                logger.info(f"Scaling up {worker_type}: creating {containers_to_create} containers")
-
-                for i in range(containers_to_create):
-                    success = await self._create_worker_container(
-                        worker_type, current_count + i + 1
+                # Scale up: activate standby containers first, create the rest
+                needed = target_count - current_count
+                needed -= await self._activate_standby(worker_type, needed)
+                if needed > 0:
+                    logger.info(f"Scaling up {worker_type}: creating {needed} containers")
+                    used = {
+                        self._get_container_number(c.name)
+                        for c in await self._list_containers(worker_type, ["running", "paused"])
+                        if not self._is_standby(c)
+                    }
+                    numbers = self._free_numbers(used, needed)
+                    results = await asyncio.gather(
+                        *(self._create_limited(worker_type, n) for n in numbers)
                     )
-                    if not success:
-                        logger.error(f"Failed to create worker {current_count + i + 1}")
+                    failed = [n for n, ok in zip(numbers, results) if not ok]
+                    if failed:
+                        logger.error(f"Failed to create {worker_type} workers {failed}")
                         return False
 
             else:
@@ -94,20 +167,39 @@ class DockerApiBackend(ScalingBackend):
                 )
 
                 containers = await self._get_worker_containers(worker_type)
-                # Remove the highest numbered containers first
-                containers.sort(key=lambda c: self._get_container_number(c.name), reverse=True)
-
-                for container in containers[:containers_to_remove]:
-                    await self._remove_container(container)
+                victims = await self._select_victims(
+                    worker_type, containers, containers_to_remove
+                )
+                await asyncio.gather(
+                    *(self._drain_and_remove(worker_type, container) for container in victims)
+                )
 
+            await self._replenish_standby(worker_type)
             return True
 
         except Exception as e:
             logger.error(f"Failed to scale {worker_type} to {target_count}: {e}")
             return False
 
+    async def start(self) -> None:
+        """Start the event-driven inventory (no-op without ``watch_events``)."""
+        if self.inventory is not None:
+            await self.inventory.start()
+
+    async def stop(self) -> None:
+        """Stop following Docker events."""
+        if self.inventory is not None:
+            await self.inventory.stop()
+
+    def subscribe(self, callback: Callable[[str], None]) -> None:
+        """Call *callback(worker_type)* when the inventory sees a container change."""
+        if self.inventory is not None:
+            self.inventory.add_listener(callback)
+
     async def get_current_count(self, worker_type: str) -> int:
         """Get current number of workers."""
+        if self.inventory is not None and self.inventory.synced:
+            return self.inventory.count(worker_type)
         try:
             containers = await self._get_worker_containers(worker_type)
             return len(containers)
@@ -115,14 +207,36 @@ class DockerApiBackend(ScalingBackend):
             logger.error(f"Failed to count {worker_type} containers: {e}")
             return 0
 
-    async def _create_worker_container(self, worker_type: str, instance_num: int) -> bool:
-        """Create a single worker container."""
-        container_name = f"{self.project_name}_{worker_type}_{instance_num}"
+    @staticmethod
+    def _free_numbers(used: set[int], count: int) -> list[int]:
+        """The *count* lowest instance numbers not in *used*."""
+        numbers: list[int] = []
+        candidate = 1
+        while len(numbers) < count:
+            if candidate not in used:
+                numbers.append(candidate)
+            candidate += 1
+        return numbers
+
+    async def _create_limited(
+        self, worker_type: str, instance_num: int, standby: bool = False
+    ) -> bool:
+        async with self._create_slots:
+            return await self._create_worker_container(worker_type, instance_num, standby)
+
+    async def _create_worker_container(
+        self, worker_type: str, instance_num: int, standby: bool = False
+    ) -> bool:
+        """Create a single worker container (a standby one if *standby*)."""
+        role = "standby_" if standby else ""
+        container_name = f"{self.project_name}_{worker_type}_{role}{instance_num}"
 
         # Proactively remove any pre-existing container with the same name to avoid
         # 409 Conflict errors if a crashed container was left behind.
         try:
-            existing_container = self.client.containers.get(container_name)
+            existing_container = await run_in_threadpool(
+                self.client.containers.get, container_name, pool="docker"
+            )
             logger.warning(
                 "Container '%s' already exists with status '%s'. Removing it before recreation.",
                 container_name,
@@ -148,8 +262,9 @@ class DockerApiBackend(ScalingBackend):
                 "LOG_TO_FILE": "0",
                 "PYTHONPATH": "/app",
                 "WORKER_TYPE": worker_type,  # For worker identification
-                "CELERY_QUEUES": worker_type,  # Which queue to consume
-                "CELERY_HOSTNAME": f"{worker_type}-{instance_num}@%h",
+                # Which queue to consume; standby workers idle on an unused one
+                "CELERY_QUEUES": f"{worker_type}.standby" if standby else worker_type,
+                "CELERY_HOSTNAME": f"{worker_type}-{role.replace('_', '-')}{instance_num}@%h",
                 "CELERY_CONCURRENCY": "2",
                 "CELERY_LOGLEVEL": "info",
             }
@@ -192,30 +307,141 @@ class DockerApiBackend(ScalingBackend):
                 },
             }
 
-            # Run in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, lambda: self.client.containers.run(**config))
+            # Run in the docker pool to avoid blocking
+            started = time.monotonic()
+            container = await run_in_threadpool(
+                self.client.containers.run, pool="docker", **config
+            )
 
             logger.info(f"Created worker container: {container_name}")
+            if self.celery_app is not None:
+                task = asyncio.create_task(
+                    self._await_ready(worker_type, container, started, standby)
+                )
+                self._ready_tasks.add(task)
+                task.add_done_callback(self._ready_tasks.discard)
             return True
 
         except Exception as e:
             logger.error(f"Failed to create container {container_name}: {e}")
             return False
 
+    def _ping(self, node: str) -> bool:
+        """True if the Celery worker *node* answers a ping (blocking broadcast)."""
+        return bool(self.celery_app.control.ping(destination=[node], timeout=1.0))
+
+    async def _await_ready(
+        self, worker_type: str, container: Container, started: float, standby: bool
+    ) -> None:
+        """Wait for a new worker's first ping; record cold starts, pause standby ones."""
+        node = self._node_name(worker_type, container)
+        deadline = started + self.ready_timeout
+        try:
+            while not await run_in_threadpool(self._ping, node, pool="docker"):
+                if time.monotonic() >= deadline:
+                    logger.warning(f"{node} not ready after {self.ready_timeout:.0f}s")
+                    return
+                await asyncio.sleep(self.drain_poll_interval)
+            if standby:
+                await run_in_threadpool(container.pause, pool="docker")
+                logger.info(f"Standby worker {node} ready and paused")
+            else:
+                record_worker_ready(worker_type, "cold", time.monotonic() - started)
+        except Exception as e:
+            logger.warning(f"Could not track readiness of {node}: {e}")
+
+    @staticmethod
+    def _is_standby(container: Container) -> bool:
+        return STANDBY_MARKER in (container.name or "")
+
+    async def _activate_standby(self, worker_type: str, count: int) -> int:
+        """Turn up to *count* paused standby containers into workers; return how many."""
+        if self.standby_count <= 0 or count <= 0:
+            return 0
+        try:
+            paused = await self._list_containers(worker_type, ["paused"])
+            standby = [c for c in paused if self._is_standby(c)][:count]
+            if not standby:
+                return 0
+            used = {
+                self._get_container_number(c.name)
+                for c in await self._list_containers(worker_type, ["running", "paused"])
+                if not self._is_standby(c)
+            }
+        except Exception as e:
+            logger.warning(f"Could not list {worker_type} standby containers: {e}")
+            return 0
+        numbers = self._free_numbers(used, len(standby))
+        results = await asyncio.gather(
+            *(self._activate(worker_type, c, n) for c, n in zip(standby, numbers))
+        )
+        activated = sum(results)
+        logger.info(f"Scaling up {worker_type}: activated {activated} standby containers")
+        return activated
+
+    async def _activate(self, worker_type: str, container: Container, instance_num: int) -> bool:
+        """Rename, unpause and point a standby worker at the *worker_type* queue."""
+        started = time.monotonic()
+        node = self._node_name(worker_type, container)
+        try:
+            name = f"{self.project_name}_{worker_type}_{instance_num}"
+            await run_in_threadpool(container.rename, name, pool="docker")
+            await run_in_threadpool(container.unpause, pool="docker")
+            await run_in_threadpool(
+                self.celery_app.control.add_consumer,
+                worker_type,
+                destination=[node],
+                reply=True,
+                pool="docker",
+            )
+            await run_in_threadpool(
+                self.celery_app.control.cancel_consumer,
+                f"{worker_type}.standby",
+                destination=[node],
+                pool="docker",
+            )
+        except Exception as e:
+            logger.error(f"Failed to activate standby worker {node}: {e}")
+            await self._remove_container(container)
+            return False
+        record_worker_ready(worker_type, "standby", time.monotonic() - started)
+        logger.info(f"Activated standby worker {node} as {worker_type} #{instance_num}")
+        return True
+
+    async def _replenish_standby(self, worker_type: str) -> None:
+        """Create standby containers until ``standby_count`` exist for *worker_type*."""
+        if self.standby_count <= 0:
+            return
+        try:
+            existing = [
+                c
+                for c in await self._list_containers(worker_type, ["running", "paused"])
+                if self._is_standby(c)
+            ]
+        except Exception as e:
+            logger.warning(f"Could not list {worker_type} standby containers: {e}")
+            return
+        missing = self.standby_count - len(existing)
+        if missing <= 0:
+            return
+        used = {self._get_container_number(c.name) for c in existing}
+        await asyncio.gather(
+            *(
+                self._create_limited(worker_type, n, standby=True)
+                for n in self._free_numbers(used, missing)
+            )
+        )
+
     async def _remove_container(self, container: Container) -> None:
         """Remove a container."""
         try:
             container_name = container.name
 
-            # Run in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-
-            # Stop the container
-            await loop.run_in_executor(None, container.stop)
+            # Stop the container (in the docker pool to avoid blocking)
+            await run_in_threadpool(container.stop, pool="docker")
 
             # Remove the container
-            await loop.run_in_executor(None, container.remove)
+            await run_in_threadpool(container.remove, pool="docker")
 
             logger.info(f"Removed container: {container_name}")
 
@@ -224,25 +450,149 @@ class DockerApiBackend(ScalingBackend):
         except Exception as e:
             logger.error(f"Failed to remove container {container.name}: {e}")
 
-    async def _get_worker_containers(self, worker_type: str) -> list[Container]:
-        """Get all containers for a worker type."""
+    def _node_name(self, worker_type: str, container: Container) -> str:
+        """
+        Celery nodename of a worker container.
+
+        The entrypoint passes ``CELERY_HOSTNAME`` as ``--hostname`` and
+        ``swarm.celery_worker`` expands it against the container hostname;
+        containers started without it run under Celery's ``celery@<host>``.
+        """
+        hostname = self._container_hostname(container)
+        env = (container.attrs or {}).get("Config", {}).get("Env") or []
+        for item in env:
+            if isinstance(item, str) and item.startswith("CELERY_HOSTNAME="):
+                return host_format(item.partition("=")[2], host=hostname)
+        return f"celery@{hostname}"
+
+    @staticmethod
+    def _container_hostname(container: Container) -> str:
+        hostname = (container.attrs or {}).get("Config", {}).get("Hostname")
+        return str(hostname or (container.id or "")[:12])
+
+    def _inspect_active(self, nodes: list[str]) -> dict[str, int]:
+        """Number of active tasks per Celery node (blocking broadcast)."""
+        inspector = self.celery_app.control.inspect(destination=nodes, timeout=1.0)
+        replies = inspector.active() or {}
+        return {node: len(tasks or []) for node, tasks in replies.items()}
+
+    async def _active_tasks(self, nodes: list[str]) -> dict[str, int]:
+        """Active tasks per node; nodes that did not reply are missing."""
+        if self.celery_app is None or not nodes:
+            return {}
+        try:
+            return await run_in_threadpool(self._inspect_active, nodes, pool="docker")
+        except Exception as e:
+            logger.warning(f"Could not inspect active Celery tasks: {e}")
+            return {}
+
+    async def _heartbeat_states(self, worker_type: str) -> dict[str, str]:
+        """Map container hostname to the ``WorkerState`` name of its latest heartbeat."""
+        if self.redis is None:
+            return {}
+        states: dict[str, str] = {}
         try:
-            # Run in executor to avoid blocking
-            loop = asyncio.get_event_loop()
+            # SCAN in pages rather than one blocking KEYS over the whole keyspace
+            keys: list[bytes] = []
+            cursor = 0
+            while True:
+                cursor, page = await self.redis.scan(
+                    cursor, match=f"worker:heartbeat:{worker_type}:*", count=100
+                )
+                keys.extend(page)
+                if cursor == 0:
+                    break
+            for key in keys:
+                data = await cast(Awaitable[dict[bytes, bytes]], self.redis.hgetall(key))
+                fields = {
+                    (k.decode() if isinstance(k, bytes) else k): (
+                        v.decode() if isinstance(v, bytes) else v
+                    )
+                    for k, v in data.items()
+                }
+                try:
+                    hostname = json.loads(fields.get("system", "{}")).get("hostname")
+                except (ValueError, AttributeError):
+                    hostname = None
+                if hostname and "state" in fields:
+                    states[hostname] = fields["state"]
+        except Exception as e:
+            logger.warning(f"Could not read {worker_type} heartbeats: {e}")
+        return states
 
-            filters = {
-                "label": [
-                    f"com.docker.compose.project={self.project_name}",
-                    f"discord.worker.type={worker_type}",
-                ],
-                "status": "running",
-            }
+    async def _select_victims(
+        self, worker_type: str, containers: list[Container], count: int
+    ) -> list[Container]:
+        """
+        Pick *count* containers to remove: idle first, then least busy.
 
-            containers = await loop.run_in_executor(
-                None, lambda: self.client.containers.list(filters=filters)
-            )
+        Load is the number of active Celery tasks when the node replied, else
+        1 for a ``BUSY`` heartbeat and 0 otherwise; crash-looping containers go
+        first.  Ties remove the highest numbered container, as before
+        drain-aware scale-down.
+        """
+        nodes = {id(c): self._node_name(worker_type, c) for c in containers}
+        active = await self._active_tasks(list(nodes.values()))
+        states = await self._heartbeat_states(worker_type)
+        crashing = set(self.inventory.crash_looping(worker_type)) if self.inventory else set()
+
+        def load(container: Container) -> int:
+            if container.id in crashing:
+                return -1
+            node = nodes[id(container)]
+            if node in active:
+                return active[node]
+            return 1 if states.get(self._container_hostname(container)) == "BUSY" else 0
+
+        ranked = sorted(
+            containers, key=lambda c: (load(c), -self._get_container_number(c.name))
+        )
+        return ranked[:count]
+
+    async def _drain_and_remove(self, worker_type: str, container: Container) -> None:
+        """Stop *container* consuming, wait for its active tasks, then remove it."""
+        if self.celery_app is not None:
+            node = self._node_name(worker_type, container)
+            try:
+                await run_in_threadpool(
+                    self.celery_app.control.cancel_consumer,
+                    worker_type,
+                    destination=[node],
+                    pool="docker",
+                )
+                deadline = time.monotonic() + self.drain_timeout
+                while (await self._active_tasks([node])).get(node, 0) > 0:
+                    if time.monotonic() >= deadline:
+                        logger.warning(
+                            f"{node} still busy after {self.drain_timeout:.0f}s drain, stopping"
+                        )
+                        break
+                    await asyncio.sleep(self.drain_poll_interval)
+            except Exception as e:
+                logger.warning(f"Could not drain {node}: {e}")
+        await self._remove_container(container)
+
+    async def _list_containers(self, worker_type: str, statuses: list[str]) -> list[Container]:
+        """Containers of *worker_type* (workers and standby) in any of *statuses*."""
+        filters = {
+            "label": [
+                f"com.docker.compose.project={self.project_name}",
+                f"discord.worker.type={worker_type}",
+            ],
+            "status": statuses,
+        }
+
+        # Run in the docker pool to avoid blocking
+        containers = await run_in_threadpool(
+            self.client.containers.list, filters=filters, pool="docker"
+        )
+        return list(containers)
 
-            return list(containers)
+    async def _get_worker_containers(self, worker_type: str) -> list[Container]:
+        """Get all running worker containers for a worker type (standby excluded)."""
+        try:
+            containers = await self._list_containers(worker_type, ["running"])
+            return [c for c in containers if not self._is_standby(c)]
 
         except Exception as e:
             logger.error(f"Failed to list {worker_type} containers: {e}")
@@ -265,15 +615,13 @@ class DockerApiBackend(ScalingBackend):
         """
         try:
             # Get all worker containers (including stopped ones)
-            loop = asyncio.get_event_loop()
-
             filters = {
                 "label": f"com.docker.compose.project={self.project_name}",
             }
 
             # Get both running and stopped containers
-            all_containers = await loop.run_in_executor(
-                None, lambda: self.client.containers.list(all=True, filters=filters)
+            all_containers = await run_in_threadpool(
+                self.client.containers.list, all=True, filters=filters, pool="docker"
             )
 
             # Filter for only worker containers (those with discord.worker.type label)
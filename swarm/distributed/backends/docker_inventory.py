@@ -0,0 +1,293 @@
+"""
+Docker Container Inventory
+==========================
+
+In-memory view of the worker containers, kept current from the Docker events
+stream instead of a ``containers.list`` call per scaling check.
+
+A daemon thread follows ``client.events()`` for the compose project and hands
+every container event to the event loop; ``start``/``unpause``, ``pause``,
+``die``, ``rename``, ``destroy`` and ``health_status`` update the matching
+:class:`ContainerRecord`.  A full listing reconciles the inventory on start and
+every ``reconcile_interval`` seconds, and the stream resumes with ``since``
+after a disconnect so no event is lost.
+
+Worker counts are O(1) reads.  A container restarted ``crash_threshold`` times
+within ``crash_window`` seconds is reported as crash-looping as soon as the
+last restart happens.  Listeners (``ScalingService.invalidate_count``) are
+called with the worker type whenever one of its containers changes.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from swarm.core.telemetry import update_worker_containers
+from swarm.utils.async_helpers import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+PROJECT_LABEL = "com.docker.compose.project"
+WORKER_TYPE_LABEL = "discord.worker.type"
+# Standby containers (see DockerApiBackend) are not workers until activated
+STANDBY_MARKER = "_standby_"
+
+
+@dataclass
+class ContainerRecord:
+    """Last known state of one worker container."""
+
+    id: str
+    name: str
+    worker_type: str
+    status: str  # created, running, paused, restarting, exited
+    health: str | None = None  # starting, healthy, unhealthy (None without a healthcheck)
+    restarts: deque[float] = field(default_factory=deque)
+
+    @property
+    def is_worker(self) -> bool:
+        return self.status == "running" and STANDBY_MARKER not in self.name
+
+
+class ContainerInventory:
+    """Worker containers of a compose project, updated from Docker events."""
+
+    def __init__(
+        self,
+        client: Any,
+        project_name: str,
+        *,
+        reconcile_interval: float = 60.0,
+        crash_threshold: int = 3,
+        crash_window: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.client = client
+        self.project_name = project_name
+        self.reconcile_interval = reconcile_interval
+        self.crash_threshold = crash_threshold
+        self.crash_window = crash_window
+        self._clock = clock
+        self.records: dict[str, ContainerRecord] = {}
+        # worker type -> ids of its running (non-standby) containers
+        self._workers: dict[str, set[str]] = {}
+        self._listeners: list[Callable[[str], None]] = []
+        self.synced = False
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._stream: Any = None
+        self._stopped = threading.Event()
+        self._reconciler: asyncio.Task[None] | None = None
+
+    # ------------------------------------------------------------------ reads
+
+    def count(self, worker_type: str) -> int:
+        """Running worker containers of *worker_type*."""
+        return len(self._workers.get(worker_type, ()))
+
+    def unhealthy(self, worker_type: str) -> list[str]:
+        """Names of *worker_type* containers whose healthcheck fails."""
+        return [
+            r.name
+            for r in self.records.values()
+            if r.worker_type == worker_type and r.health == "unhealthy"
+        ]
+
+    def crash_looping(self, worker_type: str) -> list[str]:
+        """Ids of *worker_type* containers restarting over and over."""
+        return [
+            r.id
+            for r in self.records.values()
+            if r.worker_type == worker_type and self._is_crash_looping(r)
+        ]
+
+    def add_listener(self, callback: Callable[[str], None]) -> None:
+        """Call *callback(worker_type)* whenever a container of that type changes."""
+        self._listeners.append(callback)
+
+    # ---------------------------------------------------------------- updates
+
+    def _is_crash_looping(self, record: ContainerRecord) -> bool:
+        while record.restarts and record.restarts[0] < self._clock() - self.crash_window:
+            record.restarts.popleft()
+        return len(record.restarts) >= self.crash_threshold
+
+    def _notify(self, worker_type: str) -> None:
+        update_worker_containers(
+            worker_type,
+            running=self.count(worker_type),
+            unhealthy=len(self.unhealthy(worker_type)),
+            crash_looping=len(self.crash_looping(worker_type)),
+        )
+        for callback in self._listeners:
+            try:
+                callback(worker_type)
+            except Exception as e:
+                logger.warning(f"Inventory listener failed for {worker_type}: {e}")
+
+    def _index(self, record: ContainerRecord) -> None:
+        workers = self._workers.setdefault(record.worker_type, set())
+        if record.is_worker:
+            workers.add(record.id)
+        else:
+            workers.discard(record.id)
+
+    def apply_event(self, event: dict[str, Any]) -> None:
+        """Fold one Docker event into the inventory."""
+        if event.get("Type") != "container":
+            return
+        actor = event.get("Actor") or {}
+        attributes = actor.get("Attributes") or {}
+        container_id = actor.get("ID") or event.get("id")
+        action = str(event.get("Action") or event.get("status") or "")
+        if not container_id:
+            return
+
+        record = self.records.get(container_id)
+        if record is None:
+            worker_type = attributes.get(WORKER_TYPE_LABEL)
+            if not worker_type or attributes.get(PROJECT_LABEL) != self.project_name:
+                return
+            if action == "destroy":
+                return
+            record = ContainerRecord(
+                container_id, attributes.get("name", ""), worker_type, "created"
+            )
+            self.records[container_id] = record
+
+        if attributes.get("name"):
+            record.name = attributes["name"]
+        if action in ("start", "unpause"):
+            if action == "start" and record.status in ("exited", "restarting"):
+                # Started again after dying: the restart policy brought it back
+                looping = self._is_crash_looping(record)
+                record.restarts.append(float(event.get("time") or self._clock()))
+                if not looping and self._is_crash_looping(record):
+                    logger.error(
+                        f"Container {record.name} is crash-looping "
+                        f"({len(record.restarts)} restarts in {self.crash_window:.0f}s)"
+                    )
+            record.status = "running"
+            if action == "start":
+                record.health = None
+        elif action == "pause":
+            record.status = "paused"
+        elif action == "die":
+            record.status = "exited"
+        elif action.startswith("health_status"):
+            record.health = action.partition(":")[2].strip() or None
+        elif action == "destroy":
+            del self.records[container_id]
+            self._workers.get(record.worker_type, set()).discard(container_id)
+            self._notify(record.worker_type)
+            return
+        elif action != "rename":
+            return
+
+        self._index(record)
+        self._notify(record.worker_type)
+
+    def load(self, containers: list[Any]) -> None:
+        """Replace the inventory with a full listing, keeping restart history."""
+        records: dict[str, ContainerRecord] = {}
+        for container in containers:
+            labels = container.labels or {}
+            worker_type = labels.get(WORKER_TYPE_LABEL)
+            if not worker_type:
+                continue
+            previous = self.records.get(container.id)
+            state = (container.attrs or {}).get("State") or {}
+            records[container.id] = ContainerRecord(
+                container.id,
+                container.name,
+                worker_type,
+                container.status,
+                health=(state.get("Health") or {}).get("Status"),
+                restarts=previous.restarts if previous else deque(),
+            )
+
+        before = {worker_type: set(ids) for worker_type, ids in self._workers.items()}
+        self.records = records
+        self._workers = {}
+        for record in records.values():
+            self._index(record)
+        self.synced = True
+        for worker_type in set(before) | set(self._workers):
+            if before.get(worker_type) != self._workers.get(worker_type):
+                if before.get(worker_type) is not None:
+                    logger.info(f"Reconciled {worker_type} inventory: missed events corrected")
+                self._notify(worker_type)
+
+    # -------------------------------------------------------------- lifecycle
+
+    async def reconcile(self) -> None:
+        """Reload every worker container of the project from ``containers.list``."""
+        filters = {"label": [f"{PROJECT_LABEL}={self.project_name}", WORKER_TYPE_LABEL]}
+        try:
+            containers = await run_in_threadpool(
+                self.client.containers.list, all=True, filters=filters, pool="docker"
+            )
+        except Exception as e:
+            logger.warning(f"Could not reconcile container inventory: {e}")
+            return
+        self.load(list(containers))
+
+    async def _reconcile_loop(self) -> None:
+        while not self._stopped.is_set():
+            await asyncio.sleep(self.reconcile_interval)
+            await self.reconcile()
+
+    def _watch(self, since: int) -> None:
+        """Follow the events stream (blocking); runs in its own daemon thread."""
+        assert self._loop is not None
+        filters = {"type": "container", "label": f"{PROJECT_LABEL}={self.project_name}"}
+        while not self._stopped.is_set():
+            try:
+                self._stream = self.client.events(decode=True, since=since, filters=filters)
+                for event in self._stream:
+                    since = int(event.get("time") or since)
+                    self._loop.call_soon_threadsafe(self.apply_event, event)
+            except Exception as e:
+                if self._stopped.is_set():
+                    break
+                logger.warning(f"Docker events stream failed, reconnecting: {e}")
+            self._stopped.wait(5.0)
+
+    async def start(self) -> None:
+        """Load the inventory and start following Docker events."""
+        if self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._stopped.clear()
+        # Events from the listing onwards are replayed, so none fall in between
+        since = int(time.time())
+        await self.reconcile()
+        self._thread = threading.Thread(
+            target=self._watch, args=(since,), name="docker-events", daemon=True
+        )
+        self._thread.start()
+        self._reconciler = asyncio.create_task(self._reconcile_loop())
+
+    async def stop(self) -> None:
+        """Stop following events; reads fall back to listing containers."""
+        self._stopped.set()
+        self.synced = False
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            except Exception:
+                pass
+        if self._reconciler is not None:
+            self._reconciler.cancel()
+            try:
+                await self._reconciler
+            except asyncio.CancelledError:
+                pass
+            self._reconciler = None
+        self._thread = None
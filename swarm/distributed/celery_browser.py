@@ -5,7 +5,6 @@ Replaces the old RemoteBrowserRuntime with Celery task invocations.
 This provides better reliability, monitoring, and scalability.
 """
 
-import asyncio
 import base64
 import logging
 from typing import Any, Dict, Optional
@@ -14,9 +13,14 @@ from celery import group
 from celery.result import AsyncResult
 
 from swarm.celery_app import app
+from swarm.utils.async_helpers import run_in_threadpool
 
 logger = logging.getLogger(__name__)
 
+# Blocking AsyncResult.get() calls get their own pool so slow browser tasks
+# cannot starve other thread-pool work.
+_WAIT_POOL = "celery-wait"
+
 
 class CeleryBrowserRuntime:
     """
@@ -34,7 +38,7 @@ class CeleryBrowserRuntime:
         result = app.send_task("browser.goto", kwargs={"url": url}, queue="browser")
 
         # Wait for result
-        response = await asyncio.get_event_loop().run_in_executor(None, result.get, 30.0)
+        response = await run_in_threadpool(result.get, 30.0, pool=_WAIT_POOL)
 
         if not response.get("success"):
             raise RuntimeError(f"Navigation failed: {response.get('error', 'Unknown error')}")
@@ -48,7 +52,7 @@ class CeleryBrowserRuntime:
         """Start a browser session."""
         result = app.send_task("browser.start", queue="browser")
 
-        response = await asyncio.get_event_loop().run_in_executor(None, result.get, 30.0)
+        response = await run_in_threadpool(result.get, 30.0, pool=_WAIT_POOL)
 
         if not response.get("success"):
             raise RuntimeError(f"Start failed: {response.get('error', 'Unknown error')}")
@@ -62,7 +66,7 @@ class CeleryBrowserRuntime:
         """Take a screenshot."""
         result = app.send_task("browser.screenshot", queue="browser")
 
-        response = await asyncio.get_event_loop().run_in_executor(None, result.get, 30.0)
+        response = await run_in_threadpool(result.get, 30.0, pool=_WAIT_POOL)
 
         if not response.get("success"):
             raise RuntimeError(f"Screenshot failed: {response.get('error', 'Unknown error')}")
@@ -81,9 +85,7 @@ class CeleryBrowserRuntime:
             )
 
             try:
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None, status_result.get, 5.0
-                )
+                response = await run_in_threadpool(status_result.get, 5.0, pool=_WAIT_POOL)
 
                 if response.get("success") and response["data"]["status"] == "not_found":
                     # Task no longer exists, remove from tracking
@@ -106,7 +108,7 @@ class CeleryBrowserRuntime:
         # Wait for all cleanups to complete
         if cleanup_tasks:
             group_result = group(*cleanup_tasks)()
-            await asyncio.get_event_loop().run_in_executor(None, group_result.get, 10.0)
+            await run_in_threadpool(group_result.get, 10.0, pool=_WAIT_POOL)
 
         self._active_tasks.clear()
 
@@ -125,7 +127,7 @@ class CeleryBrowserRuntime:
             "browser.scrape_data", kwargs={"url": url, "actions": actions}, queue="browser"
         )
 
-        response = await asyncio.get_event_loop().run_in_executor(None, result.get, 60.0)
+        response = await run_in_threadpool(result.get, 60.0, pool=_WAIT_POOL)
 
         if not response.get("success"):
             raise RuntimeError(f"Scraping failed: {response}")
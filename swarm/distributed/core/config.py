@@ -17,19 +17,60 @@ class ScalingConfig:
 
     min_workers: int
     max_workers: int
-    scale_up_threshold: int  # Queue depth to trigger scale up
-    scale_down_threshold: int  # Queue depth to trigger scale down
+    scale_up_threshold: int  # Minimum queue depth before scaling up
+    # Unused since scale-down follows the target; kept so *_SCALE_DOWN_THRESHOLD parses
+    scale_down_threshold: int
     cooldown_seconds: int = 60  # Time between scaling operations
+    # Target tracking: size the pool so the backlog drains within
+    # target_drain_seconds at the measured per-worker throughput
+    # (est_job_seconds per job and worker until a measurement exists).
+    target_drain_seconds: float = 60.0
+    est_job_seconds: float = 10.0
+    max_scale_up_step: int = 10  # Workers added per scaling pass at most
+    max_scale_down_step: int = 1  # Workers removed per scaling pass at most
+    # Act on the lowest (up) / highest (down) recommendation seen in the window
+    scale_up_stabilization_seconds: int = 0
+    scale_down_stabilization_seconds: int = 120
+    # SLO mode (> 0): size the pool for a p95 queue wait of this many seconds
+    # instead of the drain target (scale_up_threshold is ignored).
+    target_wait_p95_seconds: float = 0.0
+    # Predictive pre-scaling (> 0): keep the forecast peak demand of the next
+    # this-many seconds warm, e.g. the container cold-start time.
+    prewarm_lead_seconds: int = 0
 
     @classmethod
-    def from_env(cls, prefix: str) -> "ScalingConfig":
-        """Load from environment variables with prefix."""
+    def from_env(
+        cls,
+        prefix: str,
+        *,
+        min_workers: int = 1,
+        max_workers: int = 10,
+        scale_up_threshold: int = 1,
+        scale_down_threshold: int = 0,
+    ) -> "ScalingConfig":
+        """Load from environment variables with prefix; keyword arguments are the defaults."""
         return cls(
-            min_workers=int(os.getenv(f"{prefix}_MIN_WORKERS", "1")),
-            max_workers=int(os.getenv(f"{prefix}_MAX_WORKERS", "10")),
-            scale_up_threshold=int(os.getenv(f"{prefix}_SCALE_UP_THRESHOLD", "1")),
-            scale_down_threshold=int(os.getenv(f"{prefix}_SCALE_DOWN_THRESHOLD", "0")),
+            min_workers=int(os.getenv(f"{prefix}_MIN_WORKERS", str(min_workers))),
+            max_workers=int(os.getenv(f"{prefix}_MAX_WORKERS", str(max_workers))),
+            scale_up_threshold=int(
+                os.getenv(f"{prefix}_SCALE_UP_THRESHOLD", str(scale_up_threshold))
+            ),
+            scale_down_threshold=int(
+                os.getenv(f"{prefix}_SCALE_DOWN_THRESHOLD", str(scale_down_threshold))
+            ),
             cooldown_seconds=int(os.getenv(f"{prefix}_COOLDOWN", "60")),
+            target_drain_seconds=float(os.getenv(f"{prefix}_TARGET_DRAIN_SECONDS", "60")),
+            est_job_seconds=float(os.getenv(f"{prefix}_EST_JOB_SECONDS", "10")),
+            max_scale_up_step=int(os.getenv(f"{prefix}_MAX_SCALE_UP_STEP", "10")),
+            max_scale_down_step=int(os.getenv(f"{prefix}_MAX_SCALE_DOWN_STEP", "1")),
+            scale_up_stabilization_seconds=int(
+                os.getenv(f"{prefix}_SCALE_UP_STABILIZATION", "0")
+            ),
+            scale_down_stabilization_seconds=int(
+                os.getenv(f"{prefix}_SCALE_DOWN_STABILIZATION", "120")
+            ),
+            target_wait_p95_seconds=float(os.getenv(f"{prefix}_TARGET_WAIT_P95", "0")),
+            prewarm_lead_seconds=int(os.getenv(f"{prefix}_PREWARM_LEAD", "0")),
         )
 
 
@@ -74,6 +115,14 @@ class DistributedConfig:
 
         # Autoscaler configuration
         self.autoscaler_interval = int(os.getenv("AUTOSCALER_INTERVAL", "30"))
+        # Worker types are evaluated concurrently: each one gets this long per
+        # pass, and a pass returns after the deadline even if some still run.
+        self.scaling_type_timeout = float(os.getenv("SCALING_TYPE_TIMEOUT", "60"))
+        self.scaling_deadline = float(
+            os.getenv("SCALING_DEADLINE", str(self.autoscaler_interval))
+        )
+        # Backend worker counts are reused this long unless a change invalidates them
+        self.worker_count_ttl = float(os.getenv("WORKER_COUNT_TTL", "300"))
         self.orchestration_backend = os.getenv("ORCHESTRATION_BACKEND", "docker-compose")
 
     def _load_worker_types(self) -> None:
@@ -82,24 +131,14 @@ class DistributedConfig:
         self.worker_types["browser"] = WorkerTypeConfig(
             name="browser",
             job_queue="browser:jobs",
-            scaling=ScalingConfig(
-                min_workers=int(os.getenv("BROWSER_MIN_WORKERS", "1")),
-                max_workers=int(os.getenv("BROWSER_MAX_WORKERS", "10")),
-                scale_up_threshold=int(os.getenv("BROWSER_SCALE_UP_THRESHOLD", "1")),
-                scale_down_threshold=int(os.getenv("BROWSER_SCALE_DOWN_THRESHOLD", "0")),
-                cooldown_seconds=int(os.getenv("BROWSER_COOLDOWN", "60")),
-            ),
+            scaling=ScalingConfig.from_env("BROWSER", min_workers=1, max_workers=10),
         )
 
         self.worker_types["tankpit"] = WorkerTypeConfig(
             name="tankpit",
             job_queue="tankpit:jobs",
-            scaling=ScalingConfig(
-                min_workers=int(os.getenv("TANKPIT_MIN_WORKERS", "0")),
-                max_workers=int(os.getenv("TANKPIT_MAX_WORKERS", "50")),
-                scale_up_threshold=int(os.getenv("TANKPIT_SCALE_UP_THRESHOLD", "1")),
-                scale_down_threshold=int(os.getenv("TANKPIT_SCALE_DOWN_THRESHOLD", "2")),
-                cooldown_seconds=int(os.getenv("TANKPIT_COOLDOWN", "60")),
+            scaling=ScalingConfig.from_env(
+                "TANKPIT", min_workers=0, max_workers=50, scale_down_threshold=2
             ),
         )
 
@@ -0,0 +1,98 @@
+"""
+Celery Queue Reader
+===================
+
+Reads Celery queue depths straight from the kombu Redis transport, so the
+autoscaler needs neither Flower nor a worker round-trip.
+
+The transport stores each queue as Redis lists – the bare queue name for the
+default priority and ``<queue>\\x06\\x16<priority>`` for every other priority
+step – and keeps delivered-but-unacknowledged messages in the ``unacked``
+hash, whose values are ``[payload, exchange, routing_key]``.  One pipeline
+fetches every list length plus the unacked hash.
+"""
+
+import json
+import logging
+from typing import Any
+
+from celery import Celery
+
+from swarm.core.telemetry import update_celery_queue_depth
+from swarm.types import RedisBytes
+
+logger = logging.getLogger(__name__)
+
+# kombu.transport.redis.Channel.sep / unacked_key
+PRIORITY_SEP = "\x06\x16"
+UNACKED_KEY = "unacked"
+
+
+class CeleryQueueReader:
+    """Batched ready/unacked counts for Celery queues on the Redis transport."""
+
+    def __init__(
+        self,
+        redis_client: RedisBytes,
+        queues: list[str],
+        priority_steps: list[int] | None = None,
+    ):
+        self.redis = redis_client
+        self.queues = list(queues)
+        steps = priority_steps if priority_steps is not None else [0]
+        self._keys: dict[str, list[str]] = {
+            queue: [queue if step == 0 else f"{queue}{PRIORITY_SEP}{step}" for step in steps]
+            for queue in self.queues
+        }
+
+    @classmethod
+    def from_app(cls, redis_client: RedisBytes, app: Celery) -> "CeleryQueueReader":
+        """Build a reader for every queue declared in ``app.conf.task_queues``."""
+        queues = [q.name for q in app.conf.task_queues or ()]
+        options = app.conf.broker_transport_options or {}
+        return cls(redis_client, queues, options.get("priority_steps"))
+
+    async def read(self) -> dict[str, dict[str, int]]:
+        """
+        Return ``{queue: {"depth", "messages_ready", "messages_unacknowledged"}}``.
+
+        Also publishes the counts as the ``celery_queue_depth`` gauge.  Returns
+        an empty dict if Redis cannot be reached.
+        """
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for keys in self._keys.values():
+                for key in keys:
+                    pipe.llen(key)
+            pipe.hvals(UNACKED_KEY)
+            results = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to read Celery queue depths: {e}")
+            return {}
+
+        unacked = self._count_unacked(results[-1])
+        stats: dict[str, dict[str, int]] = {}
+        offset = 0
+        for queue, keys in self._keys.items():
+            ready = sum(int(n) for n in results[offset : offset + len(keys)])
+            offset += len(keys)
+            pending = unacked.get(queue, 0)
+            stats[queue] = {
+                "depth": ready + pending,
+                "messages_ready": ready,
+                "messages_unacknowledged": pending,
+            }
+            update_celery_queue_depth(queue, ready, pending)
+        return stats
+
+    @staticmethod
+    def _count_unacked(values: list[Any]) -> dict[str, int]:
+        """Count unacked messages per routing key (= queue name for our routes)."""
+        counts: dict[str, int] = {}
+        for raw in values or []:
+            try:
+                _, _, routing_key = json.loads(raw)
+            except (TypeError, ValueError):
+                continue
+            counts[routing_key] = counts.get(routing_key, 0) + 1
+        return counts
@@ -0,0 +1,188 @@
+"""
+Demand Forecast
+===============
+
+Predictive pre-scaling from the daily load pattern.
+
+Container cold start (image pull, Chromium, Celery mingle) adds 30-60 s on
+top of every reactive scale-up.  :class:`DemandForecaster` learns how many
+workers each worker type needed at each time of day and predicts the demand
+``prewarm_lead_seconds`` ahead, so ``ScalingService`` can raise the minimum
+before the peak arrives.
+
+The model is seasonal exponential smoothing (additive Holt-Winters without a
+trend term) over fixed time slots::
+
+    level     <- alpha * (y - season[slot]) + (1 - alpha) * level
+    season[s] <- gamma * (y - level) + (1 - gamma) * season[s]
+    forecast  =  level + season[slot]
+
+where ``y`` is the peak desired worker count seen during a slot.  The state
+is kept in the ``scaling:forecast`` Redis hash so it survives restarts; a
+worker type without saved state is bootstrapped from the demand recorded in
+the ``scaling:events`` stream.  Forecasts are only used once a full season has
+been observed.
+"""
+
+import json
+import logging
+import math
+import time
+from collections.abc import Callable
+from typing import Any
+
+from swarm.types import RedisBytes
+
+logger = logging.getLogger(__name__)
+
+FORECAST_KEY = "scaling:forecast"
+EVENTS_STREAM = "scaling:events"
+
+
+def _text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+class SeasonalDemandModel:
+    """Level + per-slot seasonal offsets, updated once per completed slot."""
+
+    def __init__(self, season_slots: int, alpha: float = 0.2, gamma: float = 0.3):
+        self.season_slots = season_slots
+        self.alpha = alpha
+        self.gamma = gamma
+        self.level: float | None = None
+        self.seasonal = [0.0] * season_slots
+        self.observed = [False] * season_slots
+
+    @property
+    def ready(self) -> bool:
+        """True once every slot of the season has been seen at least once."""
+        return all(self.observed)
+
+    def update(self, slot: int, value: float) -> None:
+        """Fold the demand *value* of time slot *slot* into the model."""
+        slot %= self.season_slots
+        if self.level is None:
+            self.level = value
+        season = self.seasonal[slot] if self.observed[slot] else value - self.level
+        self.level = self.alpha * (value - season) + (1 - self.alpha) * self.level
+        self.seasonal[slot] = self.gamma * (value - self.level) + (1 - self.gamma) * season
+        self.observed[slot] = True
+
+    def predict(self, slot: int) -> float:
+        """Forecast demand for *slot* (0 before the first update)."""
+        if self.level is None:
+            return 0.0
+        return max(0.0, self.level + self.seasonal[slot % self.season_slots])
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"level": self.level, "seasonal": self.seasonal, "observed": self.observed}
+
+    @classmethod
+    def from_dict(
+        cls, data: dict[str, Any], season_slots: int, alpha: float = 0.2, gamma: float = 0.3
+    ) -> "SeasonalDemandModel":
+        model = cls(season_slots, alpha, gamma)
+        if len(data.get("seasonal", [])) == season_slots:
+            model.level = data.get("level")
+            model.seasonal = [float(v) for v in data["seasonal"]]
+            model.observed = [bool(v) for v in data["observed"]]
+        return model
+
+
+class DemandForecaster:
+    """Learn per-worker-type demand by time of day and predict it ahead of time."""
+
+    def __init__(
+        self,
+        redis_client: RedisBytes,
+        *,
+        slot_seconds: int = 300,
+        season_seconds: int = 24 * 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.redis = redis_client
+        self.slot_seconds = slot_seconds
+        self.season_slots = max(1, season_seconds // slot_seconds)
+        self._clock = clock
+        self.models: dict[str, SeasonalDemandModel] = {}
+        # worker type -> (absolute slot number, peak demand in it so far)
+        self._current: dict[str, tuple[int, float]] = {}
+
+    def _slot(self, timestamp: float) -> int:
+        return int(timestamp // self.slot_seconds)
+
+    async def load(self, worker_type: str) -> SeasonalDemandModel:
+        """Return the model of *worker_type*, restoring or bootstrapping it on first use."""
+        model = self.models.get(worker_type)
+        if model is not None:
+            return model
+        model = SeasonalDemandModel(self.season_slots)
+        try:
+            raw = await self.redis.hget(FORECAST_KEY, worker_type)
+            if raw:
+                model = SeasonalDemandModel.from_dict(json.loads(raw), self.season_slots)
+            else:
+                await self._bootstrap(worker_type, model)
+        except Exception as e:
+            logger.warning(f"Could not restore demand forecast for {worker_type}: {e}")
+        self.models[worker_type] = model
+        return model
+
+    async def _bootstrap(self, worker_type: str, model: SeasonalDemandModel) -> None:
+        """
+        Replay the demand recorded in ``scaling:events`` slot by slot.
+
+        Uses each event's ``desired`` count, not ``to_count``: the latter
+        includes floors raised by earlier forecasts and would feed the prewarm
+        back into its own input.  Only the last two seasons are replayed.
+        """
+        changes: list[tuple[float, int]] = []
+        for _, fields in await self.redis.xrange(EVENTS_STREAM):
+            data = {_text(k): _text(v) for k, v in fields.items()}
+            if data.get("worker_type") == worker_type and "desired" in data:
+                changes.append((float(data["timestamp"]), int(data["desired"])))
+        if not changes:
+            return
+        changes.sort()
+        end = self._slot(self._clock())
+        start = max(self._slot(changes[0][0]), end - 2 * self.season_slots)
+        index, count = 0, 0
+        # Demand carried into the window by the last earlier event
+        while index < len(changes) and self._slot(changes[index][0]) < start:
+            count = changes[index][1]
+            index += 1
+        # The demand holds from one event until the next; sample each slot's peak
+        for slot in range(start, end):
+            peak = count
+            while index < len(changes) and self._slot(changes[index][0]) <= slot:
+                count = changes[index][1]
+                peak = max(peak, count)
+                index += 1
+            model.update(slot, max(peak, count))
+
+    async def observe(self, worker_type: str, demand: float) -> None:
+        """Record the desired worker count of one scaling pass."""
+        model = await self.load(worker_type)
+        slot = self._slot(self._clock())
+        current = self._current.get(worker_type)
+        if current is None or current[0] == slot:
+            peak = max(demand, current[1]) if current else demand
+            self._current[worker_type] = (slot, peak)
+            return
+        # Slot finished: fold its peak into the model and persist
+        model.update(current[0], current[1])
+        self._current[worker_type] = (slot, demand)
+        try:
+            await self.redis.hset(FORECAST_KEY, worker_type, json.dumps(model.to_dict()))
+        except Exception as e:
+            logger.warning(f"Could not save demand forecast for {worker_type}: {e}")
+
+    def min_workers(self, worker_type: str, lead_seconds: float) -> int:
+        """Peak forecast demand from now until *lead_seconds* ahead (0 until learned)."""
+        model = self.models.get(worker_type)
+        if model is None or not model.ready or lead_seconds <= 0:
+            return 0
+        now = self._clock()
+        first, last = self._slot(now), self._slot(now + lead_seconds)
+        return math.ceil(max(model.predict(slot) for slot in range(first, last + 1)))
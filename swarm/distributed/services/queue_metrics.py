@@ -7,6 +7,7 @@ consumer group information.
 """
 
 import logging
+import time
 from typing import Any, Dict, Optional
 
 import redis.asyncio as redis_asyncio
@@ -16,6 +17,85 @@ from swarm.types import RedisBytes
 
 logger = logging.getLogger(__name__)
 
+# Entries counted per XRANGE call when the server does not report group lag.
+_XRANGE_PAGE = 1000
+# XRANGE pages the snapshot script counts before handing the rest to the client,
+# so a deep backlog cannot keep Redis busy inside one script call.
+_SNAPSHOT_PAGES = 4
+
+# KEYS = streams, ARGV = consumer groups (same order), then the page limit and
+# page size.  For each queue returns {xlen, group exists, consumers, pending,
+# new, oldest pending idle ms, source, entries read, oldest new ms, resume id}
+# where "new" is the group's lag when Redis (>= 7) knows it, else the number of
+# entries after last-delivered-id; "entries read" is -1 when the server does
+# not track it; "oldest new ms" is how long the first undelivered entry has
+# been waiting (from the timestamp in its ID).  When counting stops at the page
+# limit the source is "capped" and counting resumes after "resume id".
+_SNAPSHOT_LUA = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local max_pages = tonumber(ARGV[#KEYS + 1])
+local page_size = tonumber(ARGV[#KEYS + 2])
+local out = {}
+for i, stream in ipairs(KEYS) do
+  local group = ARGV[i]
+  local total = redis.call('XLEN', stream)
+  local found, consumers, pending, lag, last_id, read = 0, 0, 0, false, '0-0', -1
+  local resume = ''
+  if redis.call('EXISTS', stream) == 1 then
+    for _, g in ipairs(redis.call('XINFO', 'GROUPS', stream)) do
+      local info = {}
+      for j = 1, #g, 2 do info[g[j]] = g[j + 1] end
+      if info['name'] == group then
+        found = 1
+        consumers = info['consumers']
+        pending = info['pending']
+        lag = info['lag'] or false
+        last_id = info['last-delivered-id']
+        read = info['entries-read'] or -1
+      end
+    end
+  end
+  local new, source = total, 'nogroup'
+  if found == 1 and lag then
+    new, source = lag, 'lag'
+  elseif found == 1 then
+    new, source = 0, 'xrange'
+    local cursor = '(' .. last_id
+    for _ = 1, max_pages do
+      local page = redis.call('XRANGE', stream, cursor, '+', 'COUNT', page_size)
+      new = new + #page
+      if #page < page_size then
+        cursor = false
+        break
+      end
+      cursor = '(' .. page[#page][1]
+    end
+    if cursor then
+      source, resume = 'capped', string.sub(cursor, 2)
+    end
+  end
+  local oldest = 0
+  if found == 1 and pending > 0 then
+    local first = redis.call('XPENDING', stream, group, '-', '+', 1)[1]
+    if first then oldest = first[3] end
+  end
+  local waiting = 0
+  if new > 0 then
+    local head = redis.call('XRANGE', stream, '(' .. last_id, '+', 'COUNT', 1)[1]
+    if head then
+      waiting = math.max(0, now_ms - tonumber(string.match(head[1], '^(%d+)')))
+    end
+  end
+  out[i] = {total, found, consumers, pending, new, oldest, source, read, waiting, resume}
+end
+return out
+"""
+
+
+def _text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value or "")
+
 
 class QueueMetricsService:
     """
@@ -29,6 +109,7 @@ class QueueMetricsService:
 
     def __init__(self, redis_client: RedisBytes):
         self.redis = redis_client
+        self._script: Any | None = None
 
     async def get_pending_count(self, stream: str, group: str) -> int:
         """
@@ -52,7 +133,7 @@ class QueueMetricsService:
         try:
             groups = await xinfo_groups(self.redis, stream)
             for group_info in groups:
-                if group_info.get("name") == group:
+                if _text(group_info.get("name")) == group:
                     return dict(group_info)
             return None
         except Exception as e:
@@ -61,51 +142,23 @@ class QueueMetricsService:
 
     async def get_new_messages_count(self, stream: str, group: str) -> int:
         """
-        Estimate the number of new (undelivered) messages.
+        Count the messages not yet delivered to *group*.
 
-        This is calculated as the difference between the stream's last ID
-        and the group's last delivered ID.
+        Uses the group's ``lag`` (Redis >= 7) when the server knows it, and
+        otherwise counts the entries after ``last-delivered-id`` with XRANGE.
         """
         try:
-            # Get group info
             group_info = await self.get_consumer_group_info(stream, group)
             if not group_info:
                 # Group doesn't exist, all messages are new
                 return int(await self.redis.xlen(stream))
 
-            last_delivered_id = group_info.get("last-delivered-id", "0-0")
-
-            # If no messages delivered yet
-            if last_delivered_id == "0-0":
-                return int(await self.redis.xlen(stream))
-
-            # Get stream info to find the latest message ID
-            stream_info = await self.redis.xinfo_stream(stream)
-            last_entry = stream_info.get("last-entry")
+            lag = group_info.get("lag")
+            if lag is not None:
+                return int(lag)
 
-            if not last_entry:
-                return 0
-
-            last_stream_id = last_entry[0]
-
-            # Count messages between last delivered and end of stream
-            # Note: This is approximate, as we can't efficiently count
-            # messages between two IDs without XRANGE
-            # For production, consider tracking this metric separately
-
-            # Simple heuristic: if last delivered != last stream, there are new messages
-            if last_delivered_id != last_stream_id:
-                # Get total length and subtract estimated processed
-                total_len = await self.redis.xlen(stream)
-                # This is still approximate but better than just using XLEN
-                pending = await self.get_pending_count(stream, group)
-
-                # Rough estimate: assume most old messages are processed
-                # This works well if stream is regularly trimmed
-                new_estimate = max(0, min(total_len - pending, total_len // 2))
-                return int(new_estimate)
-
-            return 0
+            last_delivered_id = _text(group_info.get("last-delivered-id")) or "0-0"
+            return await self._count_after(stream, last_delivered_id)
 
         except Exception as e:
             logger.error(f"Failed to get new messages count for {stream}/{group}: {e}")
@@ -115,6 +168,17 @@ class QueueMetricsService:
             except Exception:
                 return 0
 
+    async def _count_after(self, stream: str, last_id: str) -> int:
+        """Count entries with an ID greater than *last_id* (paged XRANGE)."""
+        count = 0
+        cursor = f"({last_id}"
+        while True:
+            page = await self.redis.xrange(stream, min=cursor, max="+", count=_XRANGE_PAGE)
+            count += len(page)
+            if len(page) < _XRANGE_PAGE:
+                return count
+            cursor = f"({_text(page[-1][0])}"
+
     async def get_true_queue_depth(self, stream: str, group: str) -> int:
         """
         Get the true queue depth: pending + new messages.
@@ -122,14 +186,142 @@ class QueueMetricsService:
         This gives a more accurate representation of work to be done
         compared to just using XLEN.
         """
-        pending = await self.get_pending_count(stream, group)
-        new_messages = await self.get_new_messages_count(stream, group)
+        snapshot = await self.snapshot([(stream, group)])
+        return int(snapshot[stream]["true_queue_depth"])
 
-        # For scaling decisions, we care about:
-        # 1. Messages being processed (pending) - these need workers
-        # 2. Messages waiting to be picked up (new) - these need more workers
+    async def snapshot(self, queues: list[tuple[str, str]]) -> dict[str, dict[str, Any]]:
+        """
+        Collect the metrics of every ``(stream, group)`` in one round-trip.
 
-        return pending + new_messages
+        Runs a server-side Lua script; clients without scripting support fall
+        back to per-queue commands.  Returns metrics keyed by stream.
+        """
+        if not queues:
+            return {}
+        script = self._snapshot_script()
+        if script is not None:
+            try:
+                rows = await script(
+                    keys=[s for s, _ in queues],
+                    args=[g for _, g in queues] + [_SNAPSHOT_PAGES, _XRANGE_PAGE],
+                )
+                return {
+                    stream: await self._metrics_from_row(stream, group, row)
+                    for (stream, group), row in zip(queues, rows)
+                }
+            except Exception as e:
+                logger.warning(f"Queue snapshot script failed, querying per queue: {e}")
+        return {stream: await self._collect(stream, group) for stream, group in queues}
+
+    def _snapshot_script(self) -> Any | None:
+        if self._script is None:
+            register = getattr(self.redis, "register_script", None)
+            if register is not None:
+                self._script = register(_SNAPSHOT_LUA)
+        return self._script
+
+    async def _metrics_from_row(
+        self, stream: str, group: str, row: list[Any]
+    ) -> dict[str, Any]:
+        total, found, consumers, pending, new, oldest_ms, source, *rest = row
+        source = _text(source) if found else "nogroup"
+        new = int(new)
+        if source == "capped":
+            # The script stopped at its page limit; finish the exact count here
+            new += await self._count_after(stream, _text(rest[2]))
+            source = "xrange"
+        return self._metrics(
+            stream,
+            group,
+            total=int(total),
+            pending=int(pending),
+            new=new,
+            oldest_ms=int(oldest_ms),
+            consumers=int(consumers),
+            source=source,
+            entries_read=int(rest[0]) if rest else -1,
+            oldest_new_ms=int(rest[1]) if len(rest) > 1 else 0,
+        )
+
+    async def _collect(self, stream: str, group: str) -> dict[str, Any]:
+        """Per-command fallback of :meth:`snapshot` for one queue."""
+        try:
+            total = int(await self.redis.xlen(stream))
+            group_info = await self.get_consumer_group_info(stream, group)
+            if not group_info:
+                return self._metrics(
+                    stream,
+                    group,
+                    total=total,
+                    pending=0,
+                    new=total,
+                    oldest_ms=0,
+                    consumers=0,
+                    source="nogroup",
+                    oldest_new_ms=await self.get_oldest_new_age_ms(stream) if total else 0,
+                )
+            pending = int(group_info.get("pending", 0) or 0)
+            lag = group_info.get("lag")
+            last_id = _text(group_info.get("last-delivered-id")) or "0-0"
+            if lag is not None:
+                new, source = int(lag), "lag"
+            else:
+                new, source = await self._count_after(stream, last_id), "xrange"
+            oldest_ms = await self.get_oldest_pending_age_ms(stream, group) if pending else 0
+            entries_read = group_info.get("entries-read")
+            oldest_new_ms = await self.get_oldest_new_age_ms(stream, last_id) if new else 0
+            return self._metrics(
+                stream,
+                group,
+                total=total,
+                pending=pending,
+                new=new,
+                oldest_ms=oldest_ms,
+                consumers=int(group_info.get("consumers", 0) or 0),
+                source=source,
+                entries_read=int(entries_read) if entries_read is not None else -1,
+                oldest_new_ms=oldest_new_ms,
+            )
+        except Exception as e:
+            logger.error(f"Failed to get comprehensive metrics for {stream}/{group}: {e}")
+            return {
+                "stream": stream,
+                "group": group,
+                "error": str(e),
+                "true_queue_depth": 0,
+            }
+
+    def _metrics(
+        self,
+        stream: str,
+        group: str,
+        *,
+        total: int,
+        pending: int,
+        new: int,
+        oldest_ms: int,
+        consumers: int,
+        source: str,
+        entries_read: int = -1,
+        oldest_new_ms: int = 0,
+    ) -> dict[str, Any]:
+        return {
+            "stream": stream,
+            "group": group,
+            "total_messages": total,
+            "pending_count": pending,
+            "new_messages": new,
+            "new_messages_source": source,  # lag | xrange | nogroup
+            "true_queue_depth": pending + new,
+            "oldest_pending_ms": oldest_ms,
+            "oldest_pending_seconds": oldest_ms / 1000 if oldest_ms else 0,
+            "active_consumers": consumers,
+            "entries_read": entries_read,  # delivered to the group so far, -1 if unknown
+            # Queue wait of the head-of-line job (first entry not yet delivered)
+            "oldest_new_ms": oldest_new_ms,
+            "oldest_new_seconds": oldest_new_ms / 1000 if oldest_new_ms else 0,
+            "health_status": self._calculate_health_status(pending, oldest_ms, consumers),
+        }
 
     async def get_oldest_pending_age_ms(self, stream: str, group: str) -> int:
         """
@@ -153,8 +345,10 @@ class QueueMetricsService:
                 oldest = pending_details[0]
                 if isinstance(oldest, list) and len(oldest) > 2:
                     return int(oldest[2])  # idle_time_ms
-                elif isinstance(oldest, dict) and "idle_time_ms" in oldest:
-                    return int(oldest["idle_time_ms"])
+                elif isinstance(oldest, dict):
+                    # redis-py parses the entry as {"time_since_delivered": ms, ...}
+                    idle = oldest.get("time_since_delivered", oldest.get("idle_time_ms", 0))
+                    return int(idle)
                 return 0
 
             return 0
@@ -163,45 +357,28 @@ class QueueMetricsService:
             logger.error(f"Failed to get oldest pending age for {stream}/{group}: {e}")
             return 0
 
-    async def get_comprehensive_metrics(self, stream: str, group: str) -> dict[str, Any]:
+    async def get_oldest_new_age_ms(self, stream: str, last_delivered_id: str = "0-0") -> int:
         """
-        Get comprehensive queue metrics for monitoring and scaling decisions.
+        Get how long the first entry after *last_delivered_id* has been waiting.
+
+        Stream IDs start with their creation time in milliseconds, so this is
+        the queue wait of the job at the head of the line.
         """
         try:
-            # Gather all metrics
-            total_messages = await self.redis.xlen(stream)
-            pending_count = await self.get_pending_count(stream, group)
-            new_messages = await self.get_new_messages_count(stream, group)
-            oldest_pending_ms = await self.get_oldest_pending_age_ms(stream, group)
-            true_depth = pending_count + new_messages
-
-            # Get consumer information
-            group_info = await self.get_consumer_group_info(stream, group)
-            consumers = group_info.get("consumers", 0) if group_info else 0
-
-            return {
-                "stream": stream,
-                "group": group,
-                "total_messages": total_messages,
-                "pending_count": pending_count,
-                "new_messages_estimate": new_messages,
-                "true_queue_depth": true_depth,
-                "oldest_pending_ms": oldest_pending_ms,
-                "oldest_pending_seconds": oldest_pending_ms / 1000 if oldest_pending_ms else 0,
-                "active_consumers": consumers,
-                "health_status": self._calculate_health_status(
-                    pending_count, oldest_pending_ms, consumers
-                ),
-            }
-
+            head = await self.redis.xrange(stream, min=f"({last_delivered_id}", max="+", count=1)
+            if not head:
+                return 0
+            created_ms = int(_text(head[0][0]).split("-")[0])
+            return max(0, int(time.time() * 1000) - created_ms)
         except Exception as e:
-            logger.error(f"Failed to get comprehensive metrics for {stream}/{group}: {e}")
-            return {
-                "stream": stream,
-                "group": group,
-                "error": str(e),
-                "true_queue_depth": 0,
-            }
+            logger.error(f"Failed to get oldest new entry age for {stream}: {e}")
+            return 0
+
+    async def get_comprehensive_metrics(self, stream: str, group: str) -> dict[str, Any]:
+        """
+        Get comprehensive queue metrics for monitoring and scaling decisions.
+        """
+        return (await self.snapshot([(stream, group)]))[stream]
 
     def _calculate_health_status(
         self, pending_count: int, oldest_pending_ms: int, consumers: int
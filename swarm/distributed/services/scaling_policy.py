@@ -0,0 +1,206 @@
+"""
+Scaling Policy
+==============
+
+Target-tracking worker sizing shared by the stream and Celery autoscalers.
+
+The desired worker count is the number of workers that would drain the
+current backlog within ``target_drain_seconds``::
+
+    desired = ceil(backlog / (per_worker_rate * target_drain_seconds))
+
+where the per-worker rate is measured (see ``ThroughputEstimator``) or, until a
+measurement exists, ``1 / est_job_seconds``.  A burst is therefore answered in
+one pass instead of one worker per pass.
+
+Recommendations are smoothed per worker type: scale-up acts on the *lowest*
+recommendation of the last ``scale_up_stabilization_seconds`` and scale-down
+on the *highest* of the last ``scale_down_stabilization_seconds``, and each
+pass moves at most ``max_scale_up_step`` / ``max_scale_down_step`` workers.
+The pool is held at that target: a pass scales up only while the stabilized
+target is above the current count and down only while it is below.
+``scale_up_threshold`` remains a minimum backlog before scaling up at all.
+
+SLO mode (``target_wait_p95_seconds > 0``) sizes the target from a
+queue-wait objective instead and ignores the threshold.  The pool is sized as the larger of
+
+* the workers needed to start the current backlog within the target
+  (Little's law: ``backlog * service_time / target``), and
+* the smallest ``c`` for which an M/M/c queue with the measured arrival rate
+  and service time keeps ``P(wait > target)`` at or below 5 % (Erlang C),
+
+and it scales up regardless whenever the head-of-line job has already waited
+longer than the target.
+"""
+
+import math
+import time
+from collections import deque
+from collections.abc import Callable
+from enum import Enum
+
+from swarm.core.telemetry import update_autoscaler_estimate
+from swarm.distributed.core.config import ScalingConfig
+from swarm.distributed.services.throughput import LoadEstimate
+
+# Share of jobs that must start within target_wait_p95_seconds in SLO mode.
+SLO_PERCENTILE = 0.95
+
+
+class ScalingDecision(Enum):
+    """Possible scaling decisions."""
+
+    SCALE_UP = "scale_up"
+    SCALE_DOWN = "scale_down"
+    NO_CHANGE = "no_change"
+
+
+def desired_workers(
+    queue_depth: int, scaling: ScalingConfig, per_worker_rate: float | None = None
+) -> int:
+    """Workers needed to drain *queue_depth* jobs within the target drain time."""
+    if queue_depth <= 0:
+        return 0
+    rate = per_worker_rate or 1.0 / max(scaling.est_job_seconds, 1e-3)
+    capacity = rate * max(scaling.target_drain_seconds, 1.0)
+    return math.ceil(queue_depth / capacity)
+
+
+def _erlang_c(servers: int, offered_load: float) -> float:
+    """Probability that a job has to wait in an M/M/c queue (Erlang C)."""
+    # Erlang B by its numerically stable recursion, then converted to C
+    blocking = 1.0
+    for k in range(1, servers + 1):
+        blocking = offered_load * blocking / (k + offered_load * blocking)
+    utilisation = offered_load / servers
+    return blocking / (1 - utilisation + utilisation * blocking)
+
+
+def slo_workers(
+    queue_depth: int,
+    scaling: ScalingConfig,
+    load: LoadEstimate | None = None,
+) -> int:
+    """Workers needed to keep the p95 queue wait within ``target_wait_p95_seconds``."""
+    target = scaling.target_wait_p95_seconds
+    service_time = (load and load.service_time) or scaling.est_job_seconds
+    arrival_rate = (load and load.arrival_rate) or 0.0
+
+    # Little's law: the queued work has to be started within the target
+    backlog_workers = math.ceil(max(queue_depth, 0) * service_time / max(target, 1e-3))
+    if arrival_rate <= 0:
+        return backlog_workers
+
+    offered_load = arrival_rate * service_time
+    servers = max(1, math.floor(offered_load) + 1)  # fewer would never catch up
+    while servers < scaling.max_workers:
+        slack = servers / service_time - arrival_rate
+        if _erlang_c(servers, offered_load) * math.exp(-slack * target) <= 1 - SLO_PERCENTILE:
+            break
+        servers += 1
+    return max(backlog_workers, servers)
+
+
+class TargetTrackingPolicy:
+    """Turn backlog and throughput into bounded, stabilized scaling decisions."""
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        # worker type -> (timestamp, desired workers), oldest first
+        self._recommendations: dict[str, deque[tuple[float, int]]] = {}
+
+    def decide(
+        self,
+        worker_type: str,
+        queue_depth: int,
+        current_workers: int,
+        scaling: ScalingConfig,
+        load: LoadEstimate | None = None,
+        last_scale_time: float = 0.0,
+        queue_wait_seconds: float = 0.0,
+        forecast_min: int = 0,
+    ) -> tuple[ScalingDecision, int]:
+        """
+        Decide how to scale *worker_type*.
+
+        *load* carries the measured throughput, arrival rate and service time;
+        *queue_wait_seconds* is how long the head-of-line job has waited.
+        *forecast_min* raises ``min_workers`` ahead of a predicted peak.
+
+        Returns:
+            Tuple of (decision, target_count)
+        """
+        # Ensure minimum workers are running (no cooldown - critical for system health)
+        floor = min(max(scaling.min_workers, forecast_min), scaling.max_workers)
+        if current_workers < floor:
+            return ScalingDecision.SCALE_UP, floor
+
+        now = self._clock()
+        slo = scaling.target_wait_p95_seconds > 0
+        if slo:
+            desired = slo_workers(queue_depth, scaling, load)
+        else:
+            rate = load.per_worker_rate if load else None
+            desired = desired_workers(queue_depth, scaling, rate)
+        desired = min(desired, scaling.max_workers)
+        up_target, down_target = self._stabilized(worker_type, now, desired, scaling)
+        update_autoscaler_estimate(
+            worker_type,
+            arrival_rate=load.arrival_rate if load else None,
+            service_seconds=load.service_time if load else None,
+            queue_wait_seconds=queue_wait_seconds,
+            desired_workers=desired,
+            forecast_workers=forecast_min,
+        )
+
+        late = slo and queue_wait_seconds > scaling.target_wait_p95_seconds
+        if late:
+            # The head-of-line job already missed the objective: add at least one
+            up_target = max(up_target, current_workers + 1)
+        wants_up = up_target > current_workers and (
+            slo or queue_depth >= scaling.scale_up_threshold
+        )
+        wants_down = not late and down_target < current_workers
+
+        # Scale up (no cooldown - responsiveness is key)
+        if wants_up and current_workers < scaling.max_workers:
+            step = min(up_target - current_workers, max(scaling.max_scale_up_step, 1))
+            return ScalingDecision.SCALE_UP, min(current_workers + step, scaling.max_workers)
+
+        # Check cooldown only for scale-down operations (prevent thrashing)
+        if now - last_scale_time < scaling.cooldown_seconds:
+            return ScalingDecision.NO_CHANGE, current_workers
+
+        if wants_down and current_workers > floor:
+            step = min(current_workers - down_target, scaling.max_scale_down_step)
+            if step > 0:
+                return ScalingDecision.SCALE_DOWN, max(current_workers - step, floor)
+
+        return ScalingDecision.NO_CHANGE, current_workers
+
+    def _stabilized(
+        self, worker_type: str, now: float, desired: int, scaling: ScalingConfig
+    ) -> tuple[int, int]:
+        """Record *desired* and return the (scale-up, scale-down) recommendation."""
+        history = self._recommendations.setdefault(worker_type, deque())
+        history.append((now, desired))
+        horizon = max(
+            scaling.scale_up_stabilization_seconds, scaling.scale_down_stabilization_seconds
+        )
+        while history and history[0][0] < now - horizon:
+            history.popleft()
+
+        up_since = now - scaling.scale_up_stabilization_seconds
+        down_since = now - scaling.scale_down_stabilization_seconds
+        up = min(n for t, n in history if t >= up_since)
+        down = max(n for t, n in history if t >= down_since)
+        return up, down
+
+    def last_desired(self, worker_type: str) -> int | None:
+        """The most recent (unstabilized) desired worker count of *worker_type*."""
+        history = self._recommendations.get(worker_type)
+        return history[-1][1] if history else None
+
+    def reset(self, worker_type: str) -> None:
+        """Forget the recommendation history of *worker_type*."""
+        self._recommendations.pop(worker_type, None)
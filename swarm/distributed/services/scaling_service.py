@@ -9,27 +9,22 @@ Separates scaling logic from UI/presentation layer.
 import asyncio
 import logging
 import time
-from enum import Enum
+from collections.abc import Callable
 from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
 
 import redis.asyncio as redis_asyncio
 
 from swarm.distributed.core.config import DistributedConfig, WorkerTypeConfig
 from swarm.distributed.core.pool import WorkerPool
+from swarm.distributed.services.forecast import DemandForecaster
 from swarm.distributed.services.queue_metrics import QueueMetricsService
+from swarm.distributed.services.scaling_policy import ScalingDecision, TargetTrackingPolicy
+from swarm.distributed.services.throughput import ThroughputEstimator
 from swarm.types import RedisBytes
 
 logger = logging.getLogger(__name__)
 
 
-class ScalingDecision(Enum):
-    """Possible scaling decisions."""
-
-    SCALE_UP = "scale_up"
-    SCALE_DOWN = "scale_down"
-    NO_CHANGE = "no_change"
-
-
 @runtime_checkable
 class ScalingBackend(Protocol):
     """Protocol for scaling backend implementations."""
@@ -52,6 +47,11 @@ class ScalingService:
     - Makes scaling decisions based on configuration
     - Executes scaling through the configured backend
     - Tracks scaling history and metrics
+
+    Worker types are checked concurrently, so one slow backend call (a Docker
+    list, ``fly status``, ``kubectl``) does not delay the other types.  Backend
+    worker counts are cached between passes and invalidated when a scale
+    operation or a heartbeat change says they moved.
     """
 
     def __init__(
@@ -59,10 +59,12 @@ class ScalingService:
         redis_client: RedisBytes,
         config: DistributedConfig,
         backend: ScalingBackend | None = None,
+        clock: Callable[[], float] = time.time,
     ):
         self.redis = redis_client
         self.config = config
         self.backend = backend
+        self._clock = clock  # replaced by the simulator's virtual time
 
         # Track last scaling operations
         self.last_scale_time: dict[str, float] = {}
@@ -76,6 +78,45 @@ class ScalingService:
         # Initialize queue metrics service
         self.queue_metrics = QueueMetricsService(redis_client)
 
+        # Target tracking: measured drain rate per worker type -> desired workers
+        self.throughput = ThroughputEstimator(clock=clock)
+        self.policy = TargetTrackingPolicy(clock=clock)
+        # Daily demand pattern for predictive pre-scaling
+        self.forecaster = DemandForecaster(redis_client, clock=clock)
+
+        # worker type -> (backend worker count, when it was observed)
+        self._counts: dict[str, tuple[int, float]] = {}
+        # worker type -> its check still running from an earlier pass
+        self._inflight: dict[str, asyncio.Task[bool]] = {}
+
+        # Backends that track their containers push changes instead of waiting for the TTL
+        subscribe = getattr(backend, "subscribe", None)
+        if callable(subscribe):
+            subscribe(self.invalidate_count)
+
+    async def get_queue_snapshot(self, worker_types: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch queue metrics for all *worker_types* in one Redis round-trip."""
+        queues: list[tuple[str, str]] = []
+        owners: dict[str, list[str]] = {}
+        for worker_type in worker_types:
+            config = self.config.get_worker_type(worker_type)
+            if not config:
+                continue
+            if config.job_queue not in owners:
+                queues.append((config.job_queue, worker_type.rstrip(".")))
+            owners.setdefault(config.job_queue, []).append(worker_type)
+        try:
+            by_stream = await self.queue_metrics.snapshot(queues)
+        except Exception as e:
+            logger.error(f"Failed to snapshot queues: {e}")
+            return {}
+        return {
+            worker_type: by_stream[stream]
+            for stream, worker_types_for_stream in owners.items()
+            if stream in by_stream
+            for worker_type in worker_types_for_stream
+        }
+
     async def get_queue_depth(self, worker_type: str) -> int:
         """Get current queue depth for a worker type."""
         config = self.config.get_worker_type(worker_type)
@@ -101,6 +142,25 @@ class ScalingService:
             logger.error(f"Failed to get queue length fallback for {worker_type}: {e}")
             return 0
 
+    async def get_current_count(self, worker_type: str) -> int:
+        """Worker count from the backend, cached until invalidated or stale."""
+        if not self.backend:
+            pool = self.pools.get(worker_type)
+            return len(pool) if pool else 0
+        cached = self._counts.get(worker_type)
+        if cached is not None and self._clock() - cached[1] < self.config.worker_count_ttl:
+            return cached[0]
+        count = await self.backend.get_current_count(worker_type)
+        self._counts[worker_type] = (count, self._clock())
+        return count
+
+    def invalidate_count(self, worker_type: str | None = None) -> None:
+        """Drop the cached worker count of *worker_type* (or of every type)."""
+        if worker_type is None:
+            self._counts.clear()
+        else:
+            self._counts.pop(worker_type, None)
+
     async def update_worker_health(self) -> None:
         """Update worker health from Redis heartbeats."""
         for worker_type, pool in self.pools.items():
@@ -108,6 +168,7 @@ class ScalingService:
             if not config:
                 continue
 
+            known = set(pool.workers)
             try:
                 # Get all worker heartbeats
                 pattern = config.heartbeat_pattern
@@ -138,6 +199,10 @@ class ScalingService:
                 if removed:
                     logger.info(f"Removed stale {worker_type} workers: {removed}")
 
+                # A worker appeared or vanished: the backend count moved too
+                if set(pool.workers) != known:
+                    self.invalidate_count(worker_type)
+
             except Exception as e:
                 logger.error(f"Error updating worker health for {worker_type}: {e}")
 
@@ -151,6 +216,13 @@ class ScalingService:
         """
         Make a scaling decision based on current state.
 
+        The target is sized from the backlog and the measured per-worker
+        throughput (see ``TargetTrackingPolicy``), so a burst can add several
+        workers at once.  Worker types with ``target_wait_p95_seconds`` are
+        sized for that queue wait from *queue_metrics* and the measured
+        arrival rate and service time instead.  With ``prewarm_lead_seconds``
+        the minimum is raised to the demand forecast for the lead time.
+
         Returns:
             Tuple of (decision, target_count)
         """
@@ -158,30 +230,28 @@ class ScalingService:
         if not config or not config.enabled:
             return ScalingDecision.NO_CHANGE, current_workers
 
-        scaling = config.scaling
-
-        # Ensure minimum workers are running (no cooldown - critical for system health)
-        if current_workers < scaling.min_workers:
-            target = scaling.min_workers
-            return ScalingDecision.SCALE_UP, target
-
-        # Scale up based on queue depth (no cooldown - responsiveness is key)
-        if queue_depth >= scaling.scale_up_threshold and current_workers < scaling.max_workers:
-            target = min(current_workers + 1, scaling.max_workers)
-            return ScalingDecision.SCALE_UP, target
-
-        # Check cooldown only for scale-down operations (prevent thrashing)
-        now = time.time()
-        last_scale = self.last_scale_time.get(worker_type, 0)
-        if now - last_scale < scaling.cooldown_seconds:
-            return ScalingDecision.NO_CHANGE, current_workers
-
-        # Scale down (with cooldown protection)
-        if queue_depth <= scaling.scale_down_threshold and current_workers > scaling.min_workers:
-            target = max(current_workers - 1, scaling.min_workers)
-            return ScalingDecision.SCALE_DOWN, target
+        return self.policy.decide(
+            worker_type,
+            queue_depth,
+            current_workers,
+            config.scaling,
+            load=self.throughput.estimate(worker_type),
+            last_scale_time=self.last_scale_time.get(worker_type, 0),
+            queue_wait_seconds=float((queue_metrics or {}).get("oldest_new_seconds", 0)),
+            forecast_min=self.forecaster.min_workers(
+                worker_type, config.scaling.prewarm_lead_seconds
+            ),
+        )
+
+    def observe_queue(
+        self, worker_type: str, queue_metrics: dict[str, Any], current_workers: int
+    ) -> None:
+        """Feed one queue snapshot into the throughput / arrival estimates."""
+        self.throughput.observe(worker_type, queue_metrics, current_workers)
 
-        return ScalingDecision.NO_CHANGE, current_workers
+    def mark_scaled(self, worker_type: str) -> None:
+        """Start the scale-down cooldown of *worker_type* now."""
+        self.last_scale_time[worker_type] = self._clock()
 
     async def execute_scaling(
         self,
@@ -199,7 +269,7 @@ class ScalingService:
 
         try:
             # Get current count
-            current = await self.backend.get_current_count(worker_type)
+            current = await self.get_current_count(worker_type)
 
             # Execute scaling
             logger.info(f"Scaling {worker_type}: {current} -> {target_count} ({decision.value})")
@@ -207,12 +277,13 @@ class ScalingService:
 
             if success:
                 # Update tracking
-                self.last_scale_time[worker_type] = time.time()
+                self.mark_scaled(worker_type)
+                self._counts[worker_type] = (target_count, self._clock())
 
                 # Record history
                 self.scaling_history.append(
                     {
-                        "timestamp": time.time(),
+                        "timestamp": self._clock(),
                         "worker_type": worker_type,
                         "decision": decision.value,
                         "from_count": current,
@@ -223,11 +294,14 @@ class ScalingService:
 
                 # Store event in Redis
                 await self._record_scaling_event(worker_type, decision, current, target_count)
+            else:
+                self.invalidate_count(worker_type)
 
             return success
 
         except Exception as e:
             logger.error(f"Failed to execute scaling for {worker_type}: {e}")
+            self.invalidate_count(worker_type)
             return False
 
     async def _record_scaling_event(
@@ -238,59 +312,113 @@ class ScalingService:
         to_count: int,
     ) -> None:
         """Record scaling event in Redis for monitoring."""
+        event = {
+            "worker_type": worker_type,
+            "decision": decision.value,
+            "from_count": str(from_count),
+            "to_count": str(to_count),
+            "timestamp": str(self._clock()),
+        }
+        # Demand before min_workers / forecast floors; seeds the demand forecast
+        desired = self.policy.last_desired(worker_type)
+        if desired is not None:
+            event["desired"] = str(desired)
         try:
-            await self.redis.xadd(
-                "scaling:events",
-                {
-                    "worker_type": worker_type,
-                    "decision": decision.value,
-                    "from_count": str(from_count),
-                    "to_count": str(to_count),
-                    "timestamp": str(time.time()),
-                },
-                maxlen=1000,
-            )
+            await self.redis.xadd("scaling:events", event, maxlen=1000)
         except Exception as e:
             logger.error(f"Failed to record scaling event: {e}")
 
     async def check_and_scale_all(self) -> dict[str, bool]:
-        """Check all worker types and scale as needed."""
-        results = {}
+        """
+        Check all worker types concurrently and scale as needed.
+
+        Each type is bounded by ``scaling_type_timeout``; the pass returns once
+        every type finished or ``scaling_deadline`` expired.  A type still
+        running at the deadline reports ``False`` and keeps going in the
+        background; it is skipped by later passes until it finished.
+        """
+        results: dict[str, bool] = {}
 
         # Update worker health first
         await self.update_worker_health()
 
-        for worker_type in self.config.get_enabled_worker_types():
-            try:
-                # Get current state
-                queue_depth = await self.get_queue_depth(worker_type)
-
-                # Get actual worker count from backend, not just from heartbeats
-                # This ensures we can scale from 0 workers
-                if self.backend:
-                    current_workers = await self.backend.get_current_count(worker_type)
-                else:
-                    pool = self.pools.get(worker_type)
-                    current_workers = len(pool) if pool else 0
-
-                # Make decision
-                decision, target = self.make_scaling_decision(
-                    worker_type, queue_depth, current_workers
-                )
-
-                # Execute if needed
-                if decision != ScalingDecision.NO_CHANGE:
-                    success = await self.execute_scaling(worker_type, decision, target)
-                    results[worker_type] = success
-                else:
-                    results[worker_type] = True
+        worker_types = self.config.get_enabled_worker_types()
+        snapshot = await self.get_queue_snapshot(list(worker_types))
 
-            except Exception as e:
-                logger.error(f"Error checking/scaling {worker_type}: {e}")
+        started: dict[str, asyncio.Task[bool]] = {}
+        for worker_type in worker_types:
+            running = self._inflight.get(worker_type)
+            if running is not None and not running.done():
+                logger.warning(f"Scaling of {worker_type} still in progress, skipping this pass")
+                results[worker_type] = False
+                continue
+            task = asyncio.create_task(
+                self._check_and_scale(worker_type, snapshot.get(worker_type)),
+                name=f"scale:{worker_type}",
+            )
+            self._inflight[worker_type] = started[worker_type] = task
+
+        if started:
+            await asyncio.wait(started.values(), timeout=self.config.scaling_deadline)
+        for worker_type, task in started.items():
+            if task.done():
+                results[worker_type] = task.result()
+            else:
+                logger.warning(f"Scaling of {worker_type} missed the pass deadline")
                 results[worker_type] = False
 
         return results
 
+    async def _check_and_scale(
+        self, worker_type: str, queue_metrics: dict[str, Any] | None
+    ) -> bool:
+        """Evaluate and scale one worker type within ``scaling_type_timeout``."""
+        try:
+            return await asyncio.wait_for(
+                self._evaluate(worker_type, queue_metrics), self.config.scaling_type_timeout
+            )
+        except TimeoutError:
+            logger.error(f"Scaling check for {worker_type} timed out")
+            self.invalidate_count(worker_type)
+            return False
+        except Exception as e:
+            logger.error(f"Error checking/scaling {worker_type}: {e}")
+            return False
+
+    async def _evaluate(self, worker_type: str, queue_metrics: dict[str, Any] | None) -> bool:
+        # Get current state
+        if queue_metrics is not None and "error" not in queue_metrics:
+            queue_depth = int(queue_metrics["true_queue_depth"])
+        else:
+            queue_metrics = None
+            queue_depth = await self.get_queue_depth(worker_type)
+
+        # Get actual worker count from backend, not just from heartbeats
+        # This ensures we can scale from 0 workers
+        current_workers = await self.get_current_count(worker_type)
+
+        if queue_metrics is not None:
+            self.observe_queue(worker_type, queue_metrics, current_workers)
+
+        config = self.config.get_worker_type(worker_type)
+        prewarm = config is not None and config.scaling.prewarm_lead_seconds > 0
+        if prewarm:
+            await self.forecaster.load(worker_type)
+
+        # Make decision
+        decision, target = self.make_scaling_decision(
+            worker_type, queue_depth, current_workers, queue_metrics
+        )
+
+        desired = self.policy.last_desired(worker_type)
+        if prewarm and desired is not None:
+            await self.forecaster.observe(worker_type, desired)
+
+        # Execute if needed
+        if decision != ScalingDecision.NO_CHANGE:
+            return await self.execute_scaling(worker_type, decision, target)
+        return True
+
     def get_metrics(self) -> dict[str, Any]:
         """Get scaling service metrics."""
         return {
@@ -0,0 +1,365 @@
+"""
+Autoscaling Simulator
+=====================
+
+Replays a recorded arrival trace against a scaling policy in virtual time, so
+changes to ``ScalingConfig`` thresholds, cooldowns and step sizes can be
+measured before they ship.
+
+The simulation is discrete-event: job arrivals, job completions, containers
+becoming ready and autoscaler passes are processed in time order.  The policy
+is anything with ``make_scaling_decision(worker_type, queue_depth,
+current_workers, queue_metrics)`` – normally a ``ScalingService`` sharing the
+simulator's :class:`VirtualClock` – and it scales a :class:`SimulatedBackend` whose
+containers take a sampled cold-start time before they pick up work.  Two
+optional policy hooks are honoured when present: ``observe_queue`` receives
+the same queue snapshot ``check_and_scale_all`` would feed it, and
+``mark_scaled`` is called after every scale action.
+
+Arrival traces come from the enqueue timestamps in a job stream's entry IDs
+(:func:`arrivals_from_stream`) or from a JSON-lines dump of Celery events
+(:func:`arrivals_from_events`).
+"""
+
+import heapq
+import json
+import logging
+import math
+import random
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from swarm.distributed.services.scaling_policy import ScalingDecision
+from swarm.types import RedisBytes
+
+logger = logging.getLogger(__name__)
+
+# Samples a duration in seconds
+Distribution = Callable[[random.Random], float]
+
+
+class ScalingPolicyLike(Protocol):
+    """What the simulator needs from a policy under test."""
+
+    def make_scaling_decision(
+        self,
+        worker_type: str,
+        queue_depth: int,
+        current_workers: int,
+        queue_metrics: dict[str, Any] | None = None,
+    ) -> tuple[ScalingDecision, int]: ...
+
+
+def constant(seconds: float) -> Distribution:
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float) -> Distribution:
+    return lambda rng: rng.uniform(low, high)
+
+
+def exponential(mean: float) -> Distribution:
+    return lambda rng: rng.expovariate(1 / mean)
+
+
+def lognormal(mean: float, sigma: float = 0.5) -> Distribution:
+    """Lognormal with the given *mean* (a typical right-skewed job duration)."""
+    mu = math.log(mean) - sigma**2 / 2
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def parse_distribution(spec: str) -> Distribution:
+    """
+    Parse ``const:10``, ``uniform:30:60``, ``exp:10`` or ``lognormal:10[:0.5]``.
+
+    A bare number is a constant.
+    """
+    name, _, rest = spec.partition(":")
+    if not rest:
+        return constant(float(name))
+    args = [float(a) for a in rest.split(":")]
+    factories: dict[str, Callable[..., Distribution]] = {
+        "const": constant,
+        "uniform": uniform,
+        "exp": exponential,
+        "lognormal": lognormal,
+    }
+    if name not in factories:
+        raise ValueError(f"Unknown distribution '{name}' in '{spec}'")
+    return factories[name](*args)
+
+
+async def arrivals_from_stream(redis_client: RedisBytes, stream: str) -> list[float]:
+    """Enqueue times (seconds) of every entry still in *stream*, from the entry IDs."""
+    arrivals = []
+    for entry_id, _ in await redis_client.xrange(stream):
+        raw = entry_id.decode("utf-8") if isinstance(entry_id, bytes) else str(entry_id)
+        arrivals.append(int(raw.split("-")[0]) / 1000)
+    return sorted(arrivals)
+
+
+def arrivals_from_events(
+    lines: Iterable[str], event_type: str = "task-received", queue: str | None = None
+) -> list[float]:
+    """Arrival times from JSON-lines Celery events (``type``, ``timestamp``, ``queue``)."""
+    arrivals = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if event.get("type", event_type) != event_type:
+            continue
+        if queue and event.get("queue", event.get("routing_key", queue)) != queue:
+            continue
+        if "timestamp" in event:
+            arrivals.append(float(event["timestamp"]))
+    return sorted(arrivals)
+
+
+@dataclass(frozen=True)
+class SimulationReport:
+    """Outcome of one simulated run."""
+
+    jobs: int
+    completed: int
+    wait_p50: float
+    wait_p95: float
+    wait_p99: float
+    wait_max: float
+    worker_seconds: float
+    scale_actions: int
+    peak_workers: int
+
+    def summary(self) -> str:
+        return (
+            f"jobs={self.jobs} completed={self.completed} "
+            f"wait p50={self.wait_p50:.1f}s p95={self.wait_p95:.1f}s "
+            f"p99={self.wait_p99:.1f}s max={self.wait_max:.1f}s "
+            f"worker-seconds={self.worker_seconds:.0f} "
+            f"scale-actions={self.scale_actions} peak-workers={self.peak_workers}"
+        )
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+
+
+class VirtualClock:
+    """Simulated time, callable like ``time.time``; shared by simulator and policy."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@dataclass
+class _Worker:
+    ready_at: float
+    job: float | None = None  # arrival time of the job being served
+    wait_index: int = -1  # its entry in AutoscalingSimulator.waits
+
+
+class SimulatedBackend:
+    """``ScalingBackend`` whose containers live in the simulator's virtual time."""
+
+    def __init__(self, simulator: "AutoscalingSimulator"):
+        self._sim = simulator
+
+    async def scale_to(self, worker_type: str, target_count: int) -> bool:
+        self._sim._scale_to(target_count)
+        return True
+
+    async def get_current_count(self, worker_type: str) -> int:
+        return len(self._sim.workers)
+
+
+class AutoscalingSimulator:
+    """Discrete-event replay of an arrival trace against a scaling policy."""
+
+    def __init__(
+        self,
+        policy: ScalingPolicyLike,
+        worker_type: str,
+        arrivals: Iterable[float],
+        *,
+        service_time: Distribution,
+        cold_start: Distribution = constant(45.0),
+        check_interval: float = 30.0,
+        initial_workers: int = 0,
+        tail_seconds: float = 600.0,
+        seed: int = 0,
+        clock: VirtualClock | None = None,
+    ):
+        self.policy = policy
+        self.worker_type = worker_type
+        self.arrivals = sorted(arrivals)
+        self.service_time = service_time
+        self.cold_start = cold_start
+        self.check_interval = check_interval
+        self.initial_workers = initial_workers
+        self.tail_seconds = tail_seconds  # keep scaling this long after the last job
+        self.rng = random.Random(seed)
+        self.backend = SimulatedBackend(self)
+
+        start = self.arrivals[0] if self.arrivals else 0.0
+        self.clock = clock or VirtualClock()
+        self.clock.now = start
+        self._last_accounted = start
+        self._events: list[tuple[float, int, str, Any]] = []
+        self._seq = 0
+        self.workers: dict[int, _Worker] = {}
+        self._next_worker = 0
+        self.queue: deque[float] = deque()  # arrival times, oldest first
+        self.waits: list[float] = []
+        self.delivered = 0
+        self.completed = 0
+        self.worker_seconds = 0.0
+        self.scale_actions = 0
+        self.peak_workers = 0
+
+    @property
+    def _now(self) -> float:
+        return self.clock.now
+
+    def _push(self, at: float, kind: str, payload: Any = None) -> None:
+        self._seq += 1
+        heapq.heappush(self._events, (at, self._seq, kind, payload))
+
+    def _advance(self, to: float) -> None:
+        self.worker_seconds += len(self.workers) * (to - self._last_accounted)
+        self._last_accounted = self.clock.now = to
+
+    def _add_worker(self, ready_at: float) -> None:
+        worker_id = self._next_worker
+        self._next_worker += 1
+        self.workers[worker_id] = _Worker(ready_at)
+        if ready_at > self._now:
+            self._push(ready_at, "ready", worker_id)
+        self.peak_workers = max(self.peak_workers, len(self.workers))
+
+    def _scale_to(self, target: int) -> None:
+        target = max(target, 0)
+        while len(self.workers) < target:
+            self._add_worker(self._now + self.cold_start(self.rng))
+        if len(self.workers) > target:
+            # Remove starting containers first, then idle ones, then busy ones
+            def cost(item: tuple[int, _Worker]) -> int:
+                worker = item[1]
+                if worker.ready_at > self._now:
+                    return 0
+                return 1 if worker.job is None else 2
+
+            for worker_id, worker in sorted(self.workers.items(), key=cost)[
+                : len(self.workers) - target
+            ]:
+                if worker.job is not None:
+                    # The message was never acked: it goes back to the queue
+                    self.queue.appendleft(worker.job)
+                    self.waits[worker.wait_index] = math.nan
+                del self.workers[worker_id]
+
+    def _dispatch(self) -> None:
+        for worker_id, worker in self.workers.items():
+            if not self.queue:
+                return
+            if worker.job is None and worker.ready_at <= self._now:
+                worker.job = self.queue.popleft()
+                worker.wait_index = len(self.waits)
+                self.delivered += 1
+                self.waits.append(self._now - worker.job)
+                self._push(self._now + self.service_time(self.rng), "done", worker_id)
+
+    def queue_metrics(self) -> dict[str, Any]:
+        """The snapshot ``QueueMetricsService`` would report right now."""
+        busy = sum(1 for w in self.workers.values() if w.job is not None)
+        return {
+            "pending_count": busy,
+            "new_messages": len(self.queue),
+            "true_queue_depth": busy + len(self.queue),
+            "entries_read": self.delivered,
+            "oldest_new_seconds": self._now - self.queue[0] if self.queue else 0,
+            "active_consumers": sum(1 for w in self.workers.values() if w.ready_at <= self._now),
+        }
+
+    async def _check(self) -> None:
+        metrics = self.queue_metrics()
+        current = len(self.workers)
+        observe = getattr(self.policy, "observe_queue", None)
+        if callable(observe):
+            observe(self.worker_type, metrics, current)
+        decision, target = self.policy.make_scaling_decision(
+            self.worker_type, int(metrics["true_queue_depth"]), current, metrics
+        )
+        if decision != ScalingDecision.NO_CHANGE and target != current:
+            await self.backend.scale_to(self.worker_type, target)
+            self.scale_actions += 1
+            mark = getattr(self.policy, "mark_scaled", None)
+            if callable(mark):
+                mark(self.worker_type)
+
+    async def run(self, max_duration: float | None = None) -> SimulationReport:
+        """
+        Replay the whole trace and report waits, cost and scale actions.
+
+        After the last job completed the autoscaler keeps running for
+        ``tail_seconds`` so the cost of scaling back down is included.
+        """
+        start = self._now
+        for _ in range(self.initial_workers):
+            self._add_worker(start)
+        for arrival in self.arrivals:
+            self._push(arrival, "arrival")
+        self._push(start, "check")
+        end = (
+            start + max_duration
+            if max_duration is not None
+            else (self.arrivals[-1] if self.arrivals else start) + 24 * 3600
+        )
+
+        finished_at: float | None = None
+        while self._events:
+            at, _, kind, payload = heapq.heappop(self._events)
+            if at > end:
+                break
+            self._advance(at)
+            if kind == "arrival":
+                self.queue.append(at)
+            elif kind == "done":
+                worker = self.workers.get(payload)
+                if worker is None or worker.job is None:
+                    continue  # removed while busy, the job was requeued
+                worker.job = None
+                self.completed += 1
+                if self.completed == len(self.arrivals):
+                    finished_at = at
+            elif kind == "check":
+                await self._check()
+                if finished_at is None or at < finished_at + self.tail_seconds:
+                    self._push(at + self.check_interval, "check")
+            self._dispatch()
+
+        # Jobs that never started waited until the end of the run
+        waits = [w for w in self.waits if not math.isnan(w)]
+        waits += [self._now - arrival for arrival in self.queue]
+        return SimulationReport(
+            jobs=len(self.arrivals),
+            completed=self.completed,
+            wait_p50=_percentile(waits, 0.50),
+            wait_p95=_percentile(waits, 0.95),
+            wait_p99=_percentile(waits, 0.99),
+            wait_max=max(waits, default=0.0),
+            worker_seconds=self.worker_seconds,
+            scale_actions=self.scale_actions,
+            peak_workers=self.peak_workers,
+        )
@@ -0,0 +1,113 @@
+"""
+Throughput Estimator
+====================
+
+Measures how fast work arrives at, and is drained from, each job stream.
+
+Every autoscaler pass feeds the queue snapshot of a worker type into
+:meth:`ThroughputEstimator.observe`.  Between two snapshots the consumer group
+
+* was delivered ``Δentries_read`` jobs and completed ``Δentries_read - Δpending``
+  of them (delivered minus still in flight), and
+* received ``Δentries_read + Δnew_messages`` new jobs.
+
+From these the estimator derives, each smoothed with an exponentially
+weighted moving average:
+
+* the per-worker completion rate,
+* the arrival rate, and
+* the mean service time via Little's law (jobs in flight / completion rate).
+
+``entries-read`` is only reported by Redis >= 7; older servers never produce a
+measurement and callers fall back to their configured estimate.
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LoadEstimate:
+    """Measured load of one worker type; ``None`` where nothing was measured yet."""
+
+    per_worker_rate: float | None = None  # completed jobs/second of one worker
+    arrival_rate: float | None = None  # new jobs/second
+    service_time: float | None = None  # seconds one job occupies a worker
+
+
+class ThroughputEstimator:
+    """EWMAs of throughput, arrival rate and service time, keyed by worker type."""
+
+    def __init__(
+        self,
+        alpha: float = 0.3,
+        min_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.alpha = alpha
+        self.min_interval = min_interval  # shorter gaps are too noisy to use
+        self._clock = clock
+        # worker type -> (timestamp, entries_read, pending, new)
+        self._last: dict[str, tuple[float, int, int, int]] = {}
+        # worker type -> {"rate" | "arrival" | "service": EWMA}
+        self._ewma: dict[str, dict[str, float]] = {}
+
+    def observe(self, worker_type: str, queue_metrics: dict[str, Any], workers: int) -> None:
+        """Fold one queue snapshot (see ``QueueMetricsService``) into the estimate."""
+        entries_read = int(queue_metrics.get("entries_read", -1))
+        if entries_read < 0:
+            return
+        pending = int(queue_metrics.get("pending_count", 0))
+        new = int(queue_metrics.get("new_messages", 0))
+        now = self._clock()
+        last = self._last.get(worker_type)
+        if last is not None and now - last[0] < self.min_interval:
+            return
+        self._last[worker_type] = (now, entries_read, pending, new)
+        if last is None:
+            return
+
+        elapsed = now - last[0]
+        delivered = entries_read - last[1]
+        completed = delivered - (pending - last[2])
+        if delivered < 0 or completed < 0:  # stream or group was recreated
+            return
+        self._update(worker_type, "arrival", max(delivered + new - last[3], 0) / elapsed)
+        if completed == 0 and pending == 0:
+            return  # idle, says nothing about capacity
+        if workers > 0:
+            self._update(worker_type, "rate", completed / elapsed / workers)
+        # Little's law: mean jobs in service = completion rate * service time
+        in_flight = (pending + last[2]) / 2
+        if completed > 0 and in_flight > 0:
+            self._update(worker_type, "service", in_flight / (completed / elapsed))
+
+    def _update(self, worker_type: str, name: str, sample: float) -> None:
+        values = self._ewma.setdefault(worker_type, {})
+        previous = values.get(name)
+        values[name] = (
+            sample if previous is None else self.alpha * sample + (1 - self.alpha) * previous
+        )
+
+    def estimate(self, worker_type: str) -> LoadEstimate:
+        """Everything measured for *worker_type* so far."""
+        values = self._ewma.get(worker_type, {})
+        return LoadEstimate(
+            per_worker_rate=values.get("rate") or None,
+            arrival_rate=values.get("arrival"),
+            service_time=values.get("service") or None,
+        )
+
+    def per_worker_rate(self, worker_type: str) -> float | None:
+        """Measured jobs/second of one worker, or ``None`` before any measurement."""
+        return self.estimate(worker_type).per_worker_rate
+
+    def reset(self, worker_type: str) -> None:
+        """Forget everything measured for *worker_type*."""
+        self._last.pop(worker_type, None)
+        self._ewma.pop(worker_type, None)
@@ -9,6 +9,9 @@ bugs.
 Usage:
     >>> from swarm.frontends.discord.discord_interactions import safe_defer, safe_send, safe_followup
 
+:class:`ProgressiveReply` builds on the same fallbacks to show a streamed reply
+while it is still being generated.
+
 These helpers should be the *only* API used by command cogs and global error
 handlers when they need to defer, send, or follow-up to an interaction.
 """
@@ -17,12 +20,14 @@ from __future__ import annotations
 
 import inspect
 import logging
+import time
 from typing import Any
 
 import discord
 from swarm.core.settings import DISCORD_LIMIT, settings
 
 __all__ = [
+    "ProgressiveReply",
     "safe_defer",
     "safe_send",
 ]
@@ -159,3 +164,142 @@ async def safe_send(
         await target.send(content or "", **kwargs)
     except Exception:  # pragma: no cover – log and swallow
         logger.exception("Final channel send fallback failed.")
+
+
+# ---------------------------------------------------------------------------
+# Progressive (streamed) replies
+# ---------------------------------------------------------------------------
+
+_EXPIRED_CODES: tuple[int, ...] = (10062, 10015, 40060)
+
+
+class ProgressiveReply:
+    """Show a streamed reply as it arrives by editing one message in place.
+
+    Intended for *deferred* interactions: :meth:`start` posts a placeholder
+    follow-up, :meth:`append` grows it with at most one edit per
+    ``min_interval`` seconds (Discord rate-limits message edits), and once a
+    message would exceed ``DISCORD_LIMIT`` the reply rolls over into a new one.
+    If the transport does not hand back an editable message, the remaining
+    text is delivered through :func:`safe_send` at each rollover and on
+    :meth:`finish` instead.
+    """
+
+    def __init__(
+        self,
+        interaction: discord.Interaction,
+        *,
+        min_interval: float | None = None,
+        fence: str = "text",
+        placeholder: str = "…",
+    ) -> None:
+        self._interaction = interaction
+        self._interval = (
+            settings.discord_stream_edit_interval if min_interval is None else min_interval
+        )
+        self._open = f"```{fence}\n"
+        self._close = "\n```"
+        self._room = max(DISCORD_LIMIT - len(self._open) - len(self._close), 1)
+        self._placeholder = placeholder
+        self._message: Any | None = None  # message currently being edited
+        self._editable = True
+        self._current = ""  # text belonging to the current message
+        self._shown = ""  # prefix of ``_current`` Discord already displays
+        self._last_edit = 0.0
+        self.text = ""  # the whole reply so far
+
+    def _wrap(self, body: str) -> str:
+        return f"{self._open}{body}{self._close}"
+
+    async def _post(self, content: str) -> Any | None:
+        """Post a new message and return it, following ``safe_send``'s order."""
+        try:
+            return await self._interaction.followup.send(content, wait=True)
+        except discord.HTTPException as exc:
+            if exc.code not in _EXPIRED_CODES:
+                raise
+        channel = self._interaction.channel
+        if channel is None:
+            return None
+        return await channel.send(content)  # type: ignore[union-attr]
+
+    async def start(self) -> None:
+        """Post the placeholder so the user sees the reply has begun.
+
+        If Discord rejects it, the reply is not streamed: the text is delivered
+        through :func:`safe_send` once complete, as for a missing message handle.
+        """
+        try:
+            self._message = await self._post(self._wrap(self._placeholder))
+        except discord.HTTPException as exc:
+            logger.warning(f"Could not post reply placeholder, sending when complete: {exc}")
+            self._message = None
+        self._editable = self._message is not None and hasattr(self._message, "edit")
+
+    async def append(self, fragment: str) -> None:
+        """Add *fragment* and refresh the visible message if the rate limit allows."""
+        self.text += fragment
+        pending = fragment
+        while pending:
+            take = pending[: self._room - len(self._current)]
+            self._current += take
+            pending = pending[len(take) :]
+            if pending:
+                # Current message is full – settle it and continue in a new one.
+                await self._flush(force=True)
+                self._message = None
+                self._current = ""
+                self._shown = ""
+        await self._flush()
+
+    async def finish(self, empty: str = "[No response]") -> str:
+        """Flush whatever is still unseen and return the full reply text."""
+        if not self.text:
+            self._current = empty
+        await self._flush(force=True)
+        return self.text
+
+    async def fail(self, notice: str) -> None:
+        """End the reply with *notice* after a provider error; never raises.
+
+        An untouched placeholder is edited into the notice.  Text that already
+        streamed is kept and the notice follows it as an ephemeral message.
+        """
+        try:
+            if not self.text and self._editable and self._message is not None:
+                await self._message.edit(content=notice)
+                return
+            if self.text:
+                await self._flush(force=True)
+            await safe_send(self._interaction, notice, ephemeral=True)
+        except Exception:
+            logger.exception("Could not report the failed reply.")
+
+    async def _flush(self, *, force: bool = False) -> None:
+        if self._current == self._shown:
+            return
+        if not self._editable:
+            # No message handle to edit: deliver only the unseen tail, and only
+            # when the segment is complete, so nothing is shown twice.
+            if force:
+                await safe_send(self._interaction, self._wrap(self._current[len(self._shown) :]))
+                self._shown = self._current
+            return
+        if not force and time.monotonic() - self._last_edit < self._interval:
+            return
+        if self._message is None:
+            self._message = await self._post(self._wrap(self._current))
+        else:
+            try:
+                await self._message.edit(content=self._wrap(self._current))
+            except discord.HTTPException as exc:
+                if exc.code not in _EXPIRED_CODES:
+                    raise
+                # Webhook token expired mid-reply: continue in a fresh message
+                # that starts where the old one left off.
+                self._current = self._current[len(self._shown) :]
+                self._message = await self._post(self._wrap(self._current))
+        if self._message is None:
+            self._editable = False
+        self._shown = self._current
+        self._last_edit = time.monotonic()
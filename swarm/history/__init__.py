@@ -4,13 +4,17 @@ Importing :pymod:`swarm.history` provides convenient access to the most common
 symbols without needing to know the individual module paths.
 """
 
-from .backends import HistoryBackend, Turn
+from .backends import HistoryBackend, Turn, TurnEntry, estimate_tokens
+from .cached import CachedHistoryBackend
 from .in_memory import MemoryBackend
 from .redis_backend import RedisBackend
 
 __all__ = [
     "HistoryBackend",
     "Turn",
+    "TurnEntry",
+    "estimate_tokens",
+    "CachedHistoryBackend",
     "MemoryBackend",
     "RedisBackend",
 ]
@@ -10,24 +10,95 @@ from __future__ import annotations
 
 # ruff: noqa: D205,D400
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 
 # Alias for readability: (user_message, assistant_message)
 Turn = tuple[str, str]
 
+# A stored turn together with its token cost, measured once at write time.
+TurnEntry = tuple[Turn, int]
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap provider-agnostic token estimate (~4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def turn_tokens(turn: Turn) -> int:
+    """Return the estimated prompt cost of replaying *turn*."""
+    return estimate_tokens(turn[0]) + estimate_tokens(turn[1])
+
+
+def select_recent(
+    entries: Iterable[TurnEntry],
+    limit: int | None = None,
+    max_tokens: int | None = None,
+) -> list[Turn]:
+    """Pick the newest *entries* (oldest first) within *limit* turns / *max_tokens*.
+
+    Selection stops at the first turn that would overflow the budget so the
+    returned window is always a contiguous tail of the conversation.
+    """
+    items = list(entries)
+    if limit is not None:
+        items = items[-limit:] if limit > 0 else []
+    if max_tokens is None:
+        return [turn for turn, _ in items]
+    picked: list[Turn] = []
+    used = 0
+    for turn, cost in reversed(items):
+        if used + cost > max_tokens:
+            break
+        used += cost
+        picked.append(turn)
+    picked.reverse()
+    return picked
+
 
 class HistoryBackend(ABC):
     """Abstract storage for conversation turns."""
 
     @abstractmethod
-    async def record(self, channel: int, persona: str, turn: Turn) -> None:  # noqa: D401 – imperative
-        """Append *turn* to the tail of the history for *channel* / *persona*."""
+    async def record(  # noqa: D401 – imperative
+        self, channel: int, persona: str, turn: Turn
+    ) -> int | None:
+        """Append *turn* to the tail of the history for *channel* / *persona*.
+
+        Return the number of turns now stored, or ``None`` if the backend
+        cannot tell without another read.
+        """
 
     @abstractmethod
-    async def recent(self, channel: int, persona: str) -> list[Turn]:
+    async def recent(
+        self,
+        channel: int,
+        persona: str,
+        limit: int | None = None,
+        max_tokens: int | None = None,
+    ) -> list[Turn]:
         """Return buffered turns for *channel*/*persona* (oldest first).
 
         The concrete backend decides how many turns to retain based on the
-        *max_turns* value provided to its constructor."""
+        *max_turns* value provided to its constructor.  *limit* further bounds
+        the result to the newest *limit* turns and *max_tokens* to the newest
+        turns whose stored token counts fit the budget."""
+
+    async def recent_entries(self, channel: int, persona: str) -> list[TurnEntry]:
+        """Return every buffered turn paired with its token cost (oldest first).
+
+        Backends that persist costs alongside turns should override this so
+        callers never have to re-measure stored text."""
+        return [(turn, turn_tokens(turn)) for turn in await self.recent(channel, persona)]
+
+    async def compact(
+        self, channel: int, persona: str, folded: list[Turn], summary: Turn
+    ) -> bool:
+        """Atomically replace the oldest turns *folded* with the single *summary* turn.
+
+        Must return *False* without changing anything when the head of the
+        buffer no longer matches *folded* (e.g. it was trimmed concurrently).
+        Backends that cannot do this safely keep the default and never compact."""
+        return False
 
     @abstractmethod
     async def clear(self, channel: int, persona: str | None = None) -> None:
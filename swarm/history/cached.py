@@ -0,0 +1,207 @@
+"""Two-tier conversation history: in-process LRU in front of another backend.
+
+Reads are served from per-(channel, persona) deques kept in process memory;
+writes go through to the wrapped backend first.  When several frontend
+replicas share one Redis, every write/clear is announced on a pub/sub channel
+so the other replicas drop their now-stale copy.  While the invalidation
+subscription is not live, reads bypass the local tier so a replica never
+serves history it cannot prove is fresh.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, cast
+
+from .backends import HistoryBackend, Turn, TurnEntry, select_recent, turn_tokens
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "history:invalidate"
+
+
+async def publish_invalidation(
+    redis: Any, channel: int, persona: str | None, origin: str = "-"
+) -> None:
+    """Tell every cache replica to drop its copy of *channel* (/*persona*)."""
+    await redis.publish(INVALIDATION_CHANNEL, f"{origin}|{channel}|{persona or '*'}")
+
+
+class CachedHistoryBackend(HistoryBackend):
+    """Write-through LRU cache (evicting whole channels) around *backend*."""
+
+    def __init__(
+        self,
+        backend: HistoryBackend,
+        max_turns: int,
+        max_channels: int = 1024,
+        redis: Any | None = None,
+    ) -> None:
+        self._backend = backend
+        self._max_turns = max_turns
+        self._max_channels = max_channels
+        # channel_id -> persona -> deque[(Turn, tokens)]; channel order is LRU order.
+        self._cache: OrderedDict[int, dict[str, deque[TurnEntry]]] = OrderedDict()
+        # Optional Redis client used for cross-replica invalidation.
+        self._redis = redis
+        self._origin = uuid.uuid4().hex
+        self._listener: asyncio.Task[None] | None = None
+        self._listening = redis is None  # no peers to hear from → cache always valid
+        # Bumped on every mutation so a read that raced a write never caches stale turns.
+        self._epoch = 0
+
+    # ------------------------------------------------------------------
+    # Local tier helpers
+    # ------------------------------------------------------------------
+    def _get(self, channel: int, persona: str) -> deque[TurnEntry] | None:
+        personas = self._cache.get(channel)
+        if personas is None or persona not in personas:
+            return None
+        self._cache.move_to_end(channel)
+        return personas[persona]
+
+    def _put(self, channel: int, persona: str, entries: list[TurnEntry]) -> None:
+        personas = self._cache.setdefault(channel, {})
+        personas[persona] = deque(entries, maxlen=self._max_turns)
+        self._cache.move_to_end(channel)
+        while len(self._cache) > self._max_channels:
+            self._cache.popitem(last=False)
+
+    def _invalidate(self, channel: int, persona: str | None) -> None:
+        self._epoch += 1
+        if persona is None:
+            self._cache.pop(channel, None)
+            return
+        personas = self._cache.get(channel)
+        if personas is not None:
+            personas.pop(persona, None)
+
+    # ------------------------------------------------------------------
+    # Cross-replica invalidation
+    # ------------------------------------------------------------------
+    def _ensure_listener(self) -> None:
+        if self._redis is None or self._listener is not None:
+            return
+        try:
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        except RuntimeError:  # pragma: no cover – called outside a loop
+            pass
+
+    async def _listen(self) -> None:
+        """Subscribe to invalidations, reconnecting with back-off on failure."""
+        delay = 1.0
+        while True:
+            pubsub = cast(Any, self._redis).pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Anything cached before the subscription went live may be stale.
+                self._cache.clear()
+                self._epoch += 1
+                self._listening = True
+                delay = 1.0
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._handle_invalidation(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"History invalidation listener failed, retrying: {exc}")
+            finally:
+                self._listening = False
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    def _handle_invalidation(self, data: str | bytes | None) -> None:
+        """Apply an ``"<origin>|<channel>|<persona or *>"`` invalidation message."""
+        if data is None:
+            return
+        raw = data.decode("utf-8") if isinstance(data, bytes) else data
+        try:
+            origin, channel_s, persona = raw.split("|", 2)
+            channel = int(channel_s)
+        except ValueError:
+            logger.debug(f"Ignoring malformed history invalidation: {raw!r}")
+            return
+        if origin == self._origin:
+            return
+        self._invalidate(channel, None if persona == "*" else persona)
+
+    async def _publish(self, channel: int, persona: str | None) -> None:
+        if self._redis is None:
+            return
+        try:
+            await publish_invalidation(self._redis, channel, persona, self._origin)
+        except Exception as exc:
+            # Peers may serve a stale copy until their next miss or reconnect.
+            logger.warning(f"Failed to publish history invalidation: {exc}")
+
+    async def aclose(self) -> None:
+        """Stop the invalidation listener."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self._listening = self._redis is None
+
+    # ------------------------------------------------------------------
+    # Backend API
+    # ------------------------------------------------------------------
+    async def record(self, channel: int, persona: str, turn: Turn) -> int | None:  # noqa: D401
+        self._ensure_listener()
+        count = await self._backend.record(channel, persona, turn)
+        self._epoch += 1
+        buf = self._get(channel, persona)
+        if buf is not None:
+            buf.append((turn, turn_tokens(turn)))
+        await self._publish(channel, persona)
+        return count
+
+    async def recent(
+        self,
+        channel: int,
+        persona: str,
+        limit: int | None = None,
+        max_tokens: int | None = None,
+    ) -> list[Turn]:
+        self._ensure_listener()
+        if not self._listening:
+            return await self._backend.recent(channel, persona, limit, max_tokens)
+        return select_recent(await self.recent_entries(channel, persona), limit, max_tokens)
+
+    async def recent_entries(self, channel: int, persona: str) -> list[TurnEntry]:
+        self._ensure_listener()
+        if not self._listening:
+            return await self._backend.recent_entries(channel, persona)
+        buf = self._get(channel, persona)
+        if buf is not None:
+            return list(buf)
+        epoch = self._epoch
+        entries = await self._backend.recent_entries(channel, persona)
+        if epoch == self._epoch and self._listening:
+            self._put(channel, persona, entries)
+        return entries
+
+    async def compact(
+        self, channel: int, persona: str, folded: list[Turn], summary: Turn
+    ) -> bool:
+        compacted = await self._backend.compact(channel, persona, folded, summary)
+        if compacted:
+            self._invalidate(channel, persona)
+            await self._publish(channel, persona)
+        return compacted
+
+    async def clear(self, channel: int, persona: str | None = None) -> None:  # noqa: D401
+        self._ensure_listener()
+        await self._backend.clear(channel, persona)
+        self._invalidate(channel, persona)
+        await self._publish(channel, persona)
@@ -0,0 +1,229 @@
+"""Rolling summarization of long conversation histories.
+
+Instead of silently dropping the oldest turns once a buffer fills up, the
+older part of a channel/persona history is folded into a single *summary turn*
+produced by the configured :class:`~swarm.ai.contracts.LLMProvider`.  The
+summary replaces the folded turns atomically (see
+:meth:`HistoryBackend.compact`) so concurrent writers never lose a turn.
+
+The work itself never runs on the request path: :class:`CompactingHistoryBackend`
+only notices that a buffer crossed its threshold and hands the
+``(channel, persona)`` pair to a *scheduler* – a Celery ``llm.*`` task when the
+history lives in Redis, or a background asyncio task for the in-memory backend.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from swarm.ai.contracts import LLMProvider
+
+from .backends import HistoryBackend, Turn, TurnEntry
+
+if TYPE_CHECKING:
+    from swarm.core.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# The summary is stored as an ordinary turn so every backend and the chat
+# replay logic handle it without special cases.
+SUMMARY_REQUEST = "Summarize our conversation so far."
+SUMMARY_PREFIX = "Summary of our earlier conversation: "
+
+SUMMARIZE_SYSTEM_PROMPT = (
+    "You compress chat transcripts. Write a concise third-person summary of the "
+    "conversation below that preserves facts, names, decisions, open questions and "
+    "the user's preferences. If the transcript starts with an earlier summary, fold "
+    "it in. Reply with the summary only."
+)
+
+CompactionScheduler = Callable[[int, str], None]
+ProviderFactory = Callable[[], tuple[LLMProvider, str | None]]
+
+
+def is_summary(turn: Turn) -> bool:
+    """Return *True* if *turn* is a rolling summary produced by compaction."""
+    return turn[0] == SUMMARY_REQUEST and turn[1].startswith(SUMMARY_PREFIX)
+
+
+def _transcript(turns: list[Turn]) -> str:
+    lines: list[str] = []
+    for user, assistant in turns:
+        if is_summary((user, assistant)):
+            lines.append(f"Earlier summary: {assistant[len(SUMMARY_PREFIX) :]}")
+            continue
+        lines.append(f"User: {user}")
+        lines.append(f"Assistant: {assistant}")
+    return "\n".join(lines)
+
+
+async def summarize_turns(
+    provider: LLMProvider, turns: list[Turn], *, model: str | None = None
+) -> str:
+    """Ask *provider* for a summary of *turns* and return it as plain text."""
+    reply = await provider.generate(
+        messages=[{"role": "user", "content": _transcript(turns)}],
+        stream=False,
+        model=model,
+        system_prompt=SUMMARIZE_SYSTEM_PROMPT,
+        priority="background",
+    )
+    if isinstance(reply, str):
+        return reply.strip()
+    return "".join([fragment async for fragment in reply]).strip()
+
+
+async def compact_history(
+    backend: HistoryBackend,
+    provider: LLMProvider,
+    channel: int,
+    persona: str,
+    *,
+    keep_recent: int,
+    model: str | None = None,
+) -> bool:
+    """Fold all but the newest *keep_recent* turns into one summary turn.
+
+    Returns *True* if the history was compacted, *False* if there was nothing
+    to fold or the buffer changed underneath us (the next trigger will retry).
+    """
+    entries: list[TurnEntry] = await backend.recent_entries(channel, persona)
+    folded = [turn for turn, _ in entries[: max(0, len(entries) - keep_recent)]]
+    if not folded or (len(folded) == 1 and is_summary(folded[0])):
+        # Nothing new to absorb into the summary.
+        return False
+
+    text = await summarize_turns(provider, folded, model=model)
+    if not text:
+        return False
+    summary: Turn = (SUMMARY_REQUEST, SUMMARY_PREFIX + text)
+    compacted = await backend.compact(channel, persona, folded, summary)
+    if compacted:
+        logger.info(f"Compacted {len(folded)} turns of history {channel}/{persona}")
+    return compacted
+
+
+class CompactingHistoryBackend(HistoryBackend):
+    """Wrap *backend* and schedule compaction once a buffer reaches *threshold* turns.
+
+    A buffer is scheduled at most once per *cooldown_seconds* so a slow
+    summarization does not pile up duplicate jobs while new turns arrive.
+    """
+
+    def __init__(
+        self,
+        backend: HistoryBackend,
+        threshold: int,
+        scheduler: CompactionScheduler,
+        cooldown_seconds: float = 60.0,
+    ) -> None:
+        self._backend = backend
+        self._threshold = threshold
+        self._scheduler = scheduler
+        self._cooldown = cooldown_seconds
+        self._last_scheduled: dict[tuple[int, str], float] = {}
+
+    async def record(self, channel: int, persona: str, turn: Turn) -> int | None:  # noqa: D401
+        count = await self._backend.record(channel, persona, turn)
+        try:
+            turns = count
+            if turns is None:
+                turns = len(await self._backend.recent_entries(channel, persona))
+            if turns < self._threshold:
+                return count
+            now = time.monotonic()
+            if now - self._last_scheduled.get((channel, persona), -self._cooldown) >= self._cooldown:
+                self._last_scheduled[(channel, persona)] = now
+                self._scheduler(channel, persona)
+        except Exception as exc:
+            # Compaction is an optimisation – never fail the chat turn over it.
+            logger.warning(f"Could not schedule history compaction: {exc}")
+        return count
+
+    async def recent(
+        self,
+        channel: int,
+        persona: str,
+        limit: int | None = None,
+        max_tokens: int | None = None,
+    ) -> list[Turn]:
+        return await self._backend.recent(channel, persona, limit, max_tokens)
+
+    async def recent_entries(self, channel: int, persona: str) -> list[TurnEntry]:
+        return await self._backend.recent_entries(channel, persona)
+
+    async def compact(
+        self, channel: int, persona: str, folded: list[Turn], summary: Turn
+    ) -> bool:
+        return await self._backend.compact(channel, persona, folded, summary)
+
+    async def clear(self, channel: int, persona: str | None = None) -> None:  # noqa: D401
+        await self._backend.clear(channel, persona)
+        for key in [k for k in self._last_scheduled if k[0] == channel]:
+            if persona is None or key[1] == persona:
+                del self._last_scheduled[key]
+
+
+def configured_provider(settings: Settings) -> ProviderFactory:
+    """Return a factory resolving the chat provider/model selected in *settings*.
+
+    Resolution is deferred to call time so registry overrides made after
+    start-up (tests, hot-swapped providers) are honoured.
+    """
+
+    def factory() -> tuple[LLMProvider, str | None]:
+        from swarm.ai import providers
+
+        name: str = getattr(settings, "llm_provider", "gemini")
+        return providers.get(name), getattr(settings, f"{name}_model", None)
+
+    return factory
+
+
+def local_scheduler(
+    backend: HistoryBackend,
+    provider_factory: ProviderFactory,
+    keep_recent: int,
+) -> CompactionScheduler:
+    """Build a scheduler that compacts *backend* in a background asyncio task.
+
+    Used for the in-process backend, which a Celery worker cannot reach.  At
+    most one compaction per ``(channel, persona)`` runs at a time.
+    """
+    running: dict[tuple[int, str], asyncio.Task[bool]] = {}
+
+    async def _run(channel: int, persona: str) -> bool:
+        try:
+            provider, model = provider_factory()
+            return await compact_history(
+                backend, provider, channel, persona, keep_recent=keep_recent, model=model
+            )
+        except Exception as exc:
+            logger.warning(f"History compaction for {channel}/{persona} failed: {exc}")
+            return False
+        finally:
+            running.pop((channel, persona), None)
+
+    def schedule(channel: int, persona: str) -> None:
+        if (channel, persona) in running:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        running[(channel, persona)] = loop.create_task(_run(channel, persona))
+
+    return schedule
+
+
+__all__ = [
+    "CompactingHistoryBackend",
+    "compact_history",
+    "configured_provider",
+    "local_scheduler",
+    "summarize_turns",
+]
@@ -3,6 +3,13 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from swarm.history.backends import HistoryBackend
+from swarm.history.cached import CachedHistoryBackend
+from swarm.history.compaction import (
+    CompactingHistoryBackend,
+    CompactionScheduler,
+    configured_provider,
+    local_scheduler,
+)
 from swarm.history.in_memory import MemoryBackend
 from swarm.history.redis_backend import RedisBackend
 
@@ -13,19 +20,59 @@ if TYPE_CHECKING:
 import logging
 
 
+def _celery_scheduler(channel: int, persona: str) -> None:
+    # Imported lazily: pulls in the Celery app and task modules.
+    from swarm.tasks.llm import enqueue_history_compaction
+
+    enqueue_history_compaction(channel, persona)
+
+
 def choose(settings: Settings) -> HistoryBackend:
     """
     Select and instantiate the appropriate HistoryBackend.
     Prioritizes Redis if enabled and configured, else falls back to in-memory.
+    Redis is fronted by an in-process LRU unless ``history_cache_channels`` is 0,
+    and long buffers are summarized in the background unless
+    ``history_compact_threshold`` is 0.
     """
+    backend = _choose_storage(settings)
+    threshold = getattr(settings, "history_compact_threshold", 0)
+    if threshold <= 0:
+        return backend
+    scheduler: CompactionScheduler
+    if isinstance(backend, MemoryBackend):
+        # A Celery worker cannot see this process's memory – summarize locally.
+        scheduler = local_scheduler(
+            backend,
+            configured_provider(settings),
+            keep_recent=getattr(settings, "history_compact_keep", 2),
+        )
+    else:
+        scheduler = _celery_scheduler
+    return CompactingHistoryBackend(backend, threshold=threshold, scheduler=scheduler)
+
+
+def _choose_storage(settings: Settings) -> HistoryBackend:
     url = getattr(settings.redis, "url", None)
+    max_turns = getattr(settings, "conversation_max_turns", 100)
     if getattr(settings.redis, "enabled", False) and isinstance(url, str) and url:
         logging.info(f"[HistoryBackend] Using RedisBackend for conversation history (url={url})")
-        return RedisBackend(
+        backend = RedisBackend(
             url,
-            max_turns=getattr(settings, "conversation_max_turns", 100),
+            max_turns=max_turns,
+            ttl_seconds=getattr(settings, "conversation_ttl_seconds", 0),
+            legacy_encoding=getattr(settings, "history_legacy_encoding", False),
         )
+        cache_channels = getattr(settings, "history_cache_channels", 0)
+        if cache_channels > 0:
+            return CachedHistoryBackend(
+                backend,
+                max_turns=max_turns,
+                max_channels=cache_channels,
+                redis=backend.client,
+            )
+        return backend
     logging.info(
         "[HistoryBackend] Using in-memory backend for conversation history (non-persistent)"
     )
-    return MemoryBackend(max_turns=getattr(settings, "conversation_max_turns", 100))
+    return MemoryBackend(max_turns=max_turns)
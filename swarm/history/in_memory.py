@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from collections import defaultdict, deque
 
-from .backends import HistoryBackend, Turn
+from .backends import HistoryBackend, Turn, TurnEntry, select_recent, turn_tokens
 
 
 class MemoryBackend(HistoryBackend):
@@ -10,21 +10,43 @@ class MemoryBackend(HistoryBackend):
 
     def __init__(self, max_turns: int) -> None:
         self._max_turns = max_turns
-        # channel_id -> persona -> deque[Turn]
-        self._store: dict[int, dict[str, deque[Turn]]] = defaultdict(
+        # channel_id -> persona -> deque[(Turn, tokens)]
+        self._store: dict[int, dict[str, deque[TurnEntry]]] = defaultdict(
             lambda: defaultdict(lambda: deque(maxlen=self._max_turns))
         )
 
     # ------------------------------------------------------------------
     # Backend API
     # ------------------------------------------------------------------
-    async def record(self, channel: int, persona: str, turn: Turn) -> None:  # noqa: D401
-        self._store[channel][persona].append(turn)
-
-    async def recent(self, channel: int, persona: str) -> list[Turn]:
-        buf: deque[Turn] = self._store[channel][persona]
+    async def record(self, channel: int, persona: str, turn: Turn) -> int:  # noqa: D401
+        buf = self._store[channel][persona]
+        buf.append((turn, turn_tokens(turn)))
+        return len(buf)
+
+    async def recent(
+        self,
+        channel: int,
+        persona: str,
+        limit: int | None = None,
+        max_tokens: int | None = None,
+    ) -> list[Turn]:
+        buf: deque[TurnEntry] = self._store[channel][persona]
         # Oldest first so higher-level code can stream messages chronologically.
-        return list(buf)
+        return select_recent(buf, limit, max_tokens)
+
+    async def recent_entries(self, channel: int, persona: str) -> list[TurnEntry]:
+        return list(self._store[channel][persona])
+
+    async def compact(
+        self, channel: int, persona: str, folded: list[Turn], summary: Turn
+    ) -> bool:
+        buf: deque[TurnEntry] = self._store[channel][persona]
+        if not folded or [turn for turn, _ in list(buf)[: len(folded)]] != folded:
+            return False
+        for _ in folded:
+            buf.popleft()
+        buf.appendleft((summary, turn_tokens(summary)))
+        return True
 
     async def clear(self, channel: int, persona: str | None = None) -> None:  # noqa: D401
         if persona is None:
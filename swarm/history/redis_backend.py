@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import logging
+import time
 from typing import Any, cast
 
 import redis.asyncio as redis_asyncio
@@ -9,7 +10,10 @@ import redis.asyncio as redis_asyncio
 from .backends import (
     HistoryBackend,
     Turn,
+    TurnEntry,
+    turn_tokens,
 )  # must precede runtime code to satisfy ruff E402
+from .cached import INVALIDATION_CHANNEL
 
 # Using `Any` for Redis client type avoids mismatches with stubs that declare
 # sync return types (ints, lists) even for async API. This keeps `mypy --strict`
@@ -18,51 +22,287 @@ RedisT = Any
 
 logger = logging.getLogger(__name__)
 
+# Sorted set of channel ids scored by last write time; drives idle purging.
+ACTIVITY_KEY = "history:channels"
+# Set once keys written before the channel index existed have been indexed.
+BACKFILL_KEY = "history:index:backfilled"
+
+# Append + trim + refresh TTL in one server-side step so a chat turn costs a
+# single round-trip and concurrent writers never observe an untrimmed list.
+# The same step registers the persona in the channel's key index and bumps the
+# channel's last-activity score, and returns the trimmed list length.  The keys
+# live in different hash slots, so this backend expects a single Redis node.
+#   KEYS[1] = history key, KEYS[2] = channel index set, KEYS[3] = activity zset
+#   ARGV[1] = encoded turn, ARGV[2] = max turns, ARGV[3] = TTL seconds (0 = none),
+#   ARGV[4] = persona, ARGV[5] = channel id, ARGV[6] = now (unix seconds)
+_RECORD_LUA = """
+redis.call('RPUSH', KEYS[1], ARGV[1])
+redis.call('LTRIM', KEYS[1], -tonumber(ARGV[2]), -1)
+redis.call('SADD', KEYS[2], ARGV[4])
+redis.call('ZADD', KEYS[3], ARGV[6], ARGV[5])
+local ttl = tonumber(ARGV[3])
+if ttl > 0 then
+    redis.call('EXPIRE', KEYS[1], ttl)
+    redis.call('EXPIRE', KEYS[2], ttl)
+end
+return redis.call('LLEN', KEYS[1])
+"""
+
+# Replace the oldest N turns with a summary, but only if the head of the list
+# still holds exactly the turns that were summarized.
+#   KEYS[1] = history key
+#   ARGV[1] = N, ARGV[2] = expected first entry, ARGV[3] = expected Nth entry,
+#   ARGV[4] = encoded summary, ARGV[5] = TTL seconds (0 = none)
+_COMPACT_LUA = """
+local n = tonumber(ARGV[1])
+if redis.call('LINDEX', KEYS[1], 0) ~= ARGV[2] then return 0 end
+if redis.call('LINDEX', KEYS[1], n - 1) ~= ARGV[3] then return 0 end
+redis.call('LTRIM', KEYS[1], n, -1)
+redis.call('LPUSH', KEYS[1], ARGV[4])
+local ttl = tonumber(ARGV[5])
+if ttl > 0 then
+    redis.call('EXPIRE', KEYS[1], ttl)
+end
+return 1
+"""
+
+
+def _encode_turn(turn: Turn, tokens: int | None = None) -> str:
+    """Encode *turn* as ``"<tokens>,<len(user)>:<user><assistant>"``.
+
+    The length prefix makes decoding a single slice instead of a JSON parse, and
+    the token count lets readers apply a budget without touching the text.
+    """
+    user, assistant = turn
+    if tokens is None:
+        tokens = turn_tokens(turn)
+    return f"{tokens},{len(user)}:{user}{assistant}"
+
+
+def _decode_entry(raw: str) -> TurnEntry:
+    """Inverse of :func:`_encode_turn`; also accepts legacy JSON-encoded turns."""
+    if raw.startswith("["):
+        user, assistant = json.loads(raw)
+        return (user, assistant), turn_tokens((user, assistant))
+    sep = raw.index(":")
+    header = raw[:sep]
+    start = sep + 1
+    if "," in header:
+        tokens_s, len_s = header.split(",", 1)
+        end = start + int(len_s)
+        return (raw[start:end], raw[end:]), int(tokens_s)
+    # Length-prefixed turn written before token counts were stored.
+    end = start + int(header)
+    turn = (raw[start:end], raw[end:])
+    return turn, turn_tokens(turn)
+
+
+def _decode_turn(raw: str) -> Turn:
+    """Decode an encoded turn without its token count."""
+    return _decode_entry(raw)[0]
+
+
+def _entry_tokens(raw: str) -> int:
+    """Read just the stored token count of an encoded turn."""
+    comma = raw.find(",")
+    if comma != -1 and raw[:comma].isdigit():
+        return int(raw[:comma])
+    return _decode_entry(raw)[1]
+
 
 class RedisBackend(HistoryBackend):
-    """Redis-based implementation of :class:`HistoryBackend`."""
+    """Redis-based implementation of :class:`HistoryBackend`.
+
+    Both the length-prefixed and the older JSON encoding are read.  With
+    *legacy_encoding* turns are also written as JSON, so replicas still on a
+    release that only reads JSON keep working during a rolling upgrade.
+    """
 
-    def __init__(self, url: str, max_turns: int) -> None:
+    def __init__(
+        self, url: str, max_turns: int, ttl_seconds: int = 0, legacy_encoding: bool = False
+    ) -> None:
         self._max_turns = max_turns
+        self._ttl_seconds = ttl_seconds
+        self._legacy_encoding = legacy_encoding
         # Decode responses (str) so we get strings not bytes.  Cast keeps mypy strict happy.
         self._r: RedisT = cast(
             RedisT,
             redis_asyncio.from_url(url, encoding="utf-8", decode_responses=True),
         )
+        # redis-py caches the SHA and transparently falls back from EVALSHA to EVAL.
+        self._record_script: Any = self._r.register_script(_RECORD_LUA)
+        self._compact_script: Any = self._r.register_script(_COMPACT_LUA)
+
+    @property
+    def client(self) -> RedisT:
+        """Underlying Redis client (shared with e.g. cache invalidation)."""
+        return self._r
 
     # Internal helper -----------------------------------------------------
     def _key(self, channel: int, persona: str) -> str:
         return f"history:{channel}:{persona}"
 
+    def _index_key(self, channel: int) -> str:
+        return f"history:index:{channel}"
+
+    def _encode(self, turn: Turn) -> str:
+        if self._legacy_encoding:
+            return json.dumps(list(turn))
+        return _encode_turn(turn)
+
     # Backend API ---------------------------------------------------------
-    async def record(self, channel: int, persona: str, turn: Turn) -> None:  # noqa: D401
+    async def record(self, channel: int, persona: str, turn: Turn) -> int:  # noqa: D401
         key: str = self._key(channel, persona)
-        await cast(Any, self._r).rpush(key, json.dumps(turn))
-        # Trim to last N items (-N to -1 keeps last N)
-        await cast(Any, self._r).ltrim(key, -self._max_turns, -1)
+        length = await self._record_script(
+            keys=[key, self._index_key(channel), ACTIVITY_KEY],
+            args=[
+                self._encode(turn),
+                self._max_turns,
+                self._ttl_seconds,
+                persona,
+                channel,
+                int(time.time()),
+            ],
+        )
+        return int(length)
 
-    async def recent(self, channel: int, persona: str) -> list[Turn]:
+    async def recent(
+        self,
+        channel: int,
+        persona: str,
+        limit: int | None = None,
+        max_tokens: int | None = None,
+    ) -> list[Turn]:
         key: str = self._key(channel, persona)
-        raw: list[str] = await cast(Any, self._r).lrange(key, -self._max_turns, -1)
-        return cast(list[Turn], [tuple(json.loads(t)) for t in raw])
+        count = self._max_turns if limit is None else min(limit, self._max_turns)
+        if count <= 0:
+            return []
+        raw: list[str] = await cast(Any, self._r).lrange(key, -count, -1)
+        if max_tokens is not None:
+            # Walk newest-first on the stored counts; only decode what fits.
+            used = 0
+            keep = 0
+            for item in reversed(raw):
+                used += _entry_tokens(item)
+                if used > max_tokens:
+                    break
+                keep += 1
+            raw = raw[len(raw) - keep :]
+        return [_decode_turn(t) for t in raw]
+
+    async def recent_entries(self, channel: int, persona: str) -> list[TurnEntry]:
+        raw: list[str] = await cast(Any, self._r).lrange(
+            self._key(channel, persona), -self._max_turns, -1
+        )
+        return [_decode_entry(t) for t in raw]
+
+    async def compact(
+        self, channel: int, persona: str, folded: list[Turn], summary: Turn
+    ) -> bool:
+        if not folded:
+            return False
+        # Entries written by this backend re-encode byte-for-byte, which is what
+        # the script compares; older encodings simply never match and are skipped.
+        result = await self._compact_script(
+            keys=[self._key(channel, persona)],
+            args=[
+                len(folded),
+                self._encode(folded[0]),
+                self._encode(folded[-1]),
+                self._encode(summary),
+                self._ttl_seconds,
+            ],
+        )
+        return bool(result)
 
     async def clear(self, channel: int, persona: str | None = None) -> None:  # noqa: D401
-        if persona is None:
-            # Wildcard delete using SCAN to avoid blocking KEYS.  Handle both async and sync iterators gracefully.
-            pattern = f"history:{channel}:*"
-            try:
-                iterator = cast(Any, self._r).scan_iter(match=pattern)
-                if hasattr(iterator, "__aiter__"):
-                    async for key in iterator:
-                        await cast(Any, self._r).delete(key)
-                else:  # Fallback for sync generator
-                    for key in iterator:
-                        await cast(Any, self._r).delete(key)
-            except Exception as exc:
-                # Fallback to KEYS if SCAN not available or fails
-                logger.warning(f"Redis SCAN operation failed, falling back to KEYS: {exc}")
-                keys = await cast(Any, self._r).keys(pattern)
-                if keys:
-                    await cast(Any, self._r).delete(*keys)
-        else:
-            await cast(Any, self._r).delete(self._key(channel, persona))
+        r = cast(Any, self._r)
+        index = self._index_key(channel)
+        if persona is not None:
+            pipe = r.pipeline(transaction=False)
+            pipe.unlink(self._key(channel, persona))
+            pipe.srem(index, persona)
+            await pipe.execute()
+            return
+
+        personas: set[str] = await r.smembers(index)
+        # UNLINK frees the values off the main thread; one pipeline, one round-trip.
+        pipe = r.pipeline(transaction=False)
+        if personas:
+            pipe.unlink(*(self._key(channel, p) for p in personas), index)
+        pipe.zrem(ACTIVITY_KEY, channel)
+        await pipe.execute()
+
+    async def backfill_index(self, batch: int = 500) -> int:
+        """Index history keys written before the per-channel index existed.
+
+        A one-off migration: the first caller claims :data:`BACKFILL_KEY` and
+        walks the keyspace with SCAN, later calls return 0 at once.  Backfilled
+        channels are scored as active now, so idle purging starts counting from
+        the migration.  Returns the number of keys indexed.
+        """
+        r = cast(Any, self._r)
+        now = int(time.time())
+        if not await r.set(BACKFILL_KEY, now, nx=True):
+            return 0
+        indexed = 0
+        cursor = 0
+        while True:
+            cursor, keys = await r.scan(cursor, match="history:*", count=batch)
+            pipe = r.pipeline(transaction=False)
+            page = 0
+            for key in keys:
+                parts = key.split(":", 2)
+                if len(parts) != 3 or not parts[1].isdigit():
+                    continue  # index, activity and marker keys
+                _, channel, persona = parts
+                pipe.sadd(self._index_key(int(channel)), persona)
+                pipe.zadd(ACTIVITY_KEY, {channel: now}, nx=True)
+                page += 1
+            if page:
+                await pipe.execute()
+                indexed += page
+            if not cursor:
+                break
+        logger.info(f"Backfilled the history index with {indexed} keys")
+        return indexed
+
+    async def purge_idle(self, max_idle_seconds: int, batch: int = 100) -> int:
+        """Drop all history of channels with no writes for *max_idle_seconds*.
+
+        Returns the number of channels purged.  Only channels recorded since the
+        activity index was introduced (or indexed by :meth:`backfill_index`) are
+        considered.  Keys are unlinked from the client in pipelines; a channel's
+        idle score is re-read right before it is purged, so only a write landing
+        in that last round-trip can be lost.
+        """
+        r = cast(Any, self._r)
+        cutoff = int(time.time()) - max_idle_seconds
+        purged = 0
+        while True:
+            channels: list[str] = await r.zrangebyscore(
+                ACTIVITY_KEY, "-inf", cutoff, start=0, num=batch
+            )
+            if not channels:
+                return purged
+
+            pipe = r.pipeline(transaction=False)
+            for channel in channels:
+                pipe.smembers(f"history:index:{channel}")
+                pipe.zscore(ACTIVITY_KEY, channel)
+            replies = await pipe.execute()
+
+            pipe = r.pipeline(transaction=False)
+            for i, channel in enumerate(channels):
+                personas, score = replies[2 * i], replies[2 * i + 1]
+                if score is not None and float(score) > cutoff:
+                    continue  # became active meanwhile
+                keys = [f"history:{channel}:{p}" for p in personas]
+                pipe.unlink(*keys, f"history:index:{channel}")
+                pipe.zrem(ACTIVITY_KEY, channel)
+                # Cached frontends drop their copies
+                pipe.publish(INVALIDATION_CHANNEL, f"purge|{channel}|*")
+                purged += 1
+            await pipe.execute()
+            if len(channels) < batch:
+                return purged
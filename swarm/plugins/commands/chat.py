@@ -10,11 +10,12 @@ from swarm.ai.personas import (
     prompt as persona_prompt,
     visible as persona_visible,
 )
+from swarm.ai.routing import with_fallbacks
 from swarm.core.exceptions import ModelOverloaded
-from swarm.core.settings import DISCORD_LIMIT, settings  # fully typed alias
+from swarm.core.settings import settings
 
 # Centralized interaction helpers
-from swarm.frontends.discord.discord_interactions import safe_send
+from swarm.frontends.discord.discord_interactions import ProgressiveReply, safe_send
 from swarm.history.backends import HistoryBackend
 from swarm.history.in_memory import MemoryBackend
 from swarm.plugins.commands.decorators import background_app_command
@@ -98,6 +99,8 @@ class Chat(commands.Cog):
                 ephemeral=True,
             )
             return
+        # Route to configured fallback providers when the primary fails or is slow.
+        provider = with_fallbacks(provider_name, provider)
 
         if prompt is None:
             prompt = "Hello!"
@@ -134,10 +137,16 @@ class Chat(commands.Cog):
 
         # Inform Discord we are processing (shows typing indicator)
 
-        # Build chat history (excluding the system prompt – passed separately)
+        # Build chat history (excluding the system prompt – passed separately).
+        # The token budget keeps one pasted document from bloating later prompts.
+        history = await self._history.recent(
+            channel_id_int,
+            personality,
+            max_tokens=settings.conversation_max_tokens,
+        )
         messages: list[dict[str, str]] = [
             {"role": role, "content": content}
-            for u, a in await self._history.recent(channel_id_int, personality)
+            for u, a in history
             for role, content in (("user", u), ("assistant", a))
         ]
         messages.append({"role": "user", "content": prompt})
@@ -150,6 +159,7 @@ class Chat(commands.Cog):
                 stream=True,
                 model=model,
                 system_prompt=final_system_prompt,
+                persona=personality,
             )
         except ModelOverloaded:
             await safe_send(
@@ -168,66 +178,31 @@ class Chat(commands.Cog):
             logger.exception(f"LLM provider error during generation: {exc}")
             return
 
-        # Providers may still return an async iterator – normalise to a string
+        # Show the reply while it streams; plain-string providers land in one go.
+        reply = ProgressiveReply(interaction)
+        await reply.start()
         if isinstance(raw_reply, str):
-            response_text = raw_reply
+            await reply.append(raw_reply)
         else:
-            parts: list[str] = []
             try:
                 async for fragment in raw_reply:
-                    parts.append(fragment)
+                    await reply.append(fragment)
             except ModelOverloaded:
-                await safe_send(
-                    interaction,
-                    "The language model is currently overloaded. Please try again in a moment.",
-                    ephemeral=True,
+                await reply.fail(
+                    "The language model is currently overloaded. Please try again in a moment."
                 )
                 return
             except Exception as exc:  # handle unforeseen provider errors mid-stream
+                logger.exception(f"LLM provider error during streaming: {exc}")
                 # Don't expose internal errors to users
-                await safe_send(
-                    interaction,
-                    "❌ Sorry, the language model encountered an error during response. Please try again.",
-                    ephemeral=True,
+                await reply.fail(
+                    "❌ Sorry, the language model encountered an error during response. Please try again."
                 )
-                logger.exception(f"LLM provider error during streaming: {exc}")
                 return
-            response_text = "".join(parts)
-
-        # Handle Discord's character limit by splitting into chunks
+        response_text = await reply.finish()
         if not response_text:
-            await safe_send(interaction, "[No response]")
             return
 
-        DISCORD_CHAR_LIMIT: int = DISCORD_LIMIT
-        # Wrap response in Discord code blocks and chunk if necessary
-        if len(response_text) + 10 <= DISCORD_CHAR_LIMIT:
-            # Single-message response – simple code block
-            await safe_send(interaction, f"```text\n{response_text}\n```")
-        else:
-            # Determine the maximum prefix length (e.g. "[Part 10/10]\n") so we can
-            # make sure each chunk, plus its prefix *inside* the code-block fence, is
-            # guaranteed to fit within Discord's hard limit (2000 characters).
-            # We pessimistically assume two-digit indices – that is more than enough
-            # for the 2000-char limit.
-            # Reserve space for opening/closing code fences (`````text\n```) -> 10
-            max_prefix_len: int = len(f"[Part {99}/{99}]\n")
-            chunk_size: int = DISCORD_CHAR_LIMIT - 10 - max_prefix_len
-            if chunk_size <= 0:
-                # Fall-back safety – should never happen, but avoid ZeroDivisionError
-                chunk_size = 50
-
-            raw_chunks = [
-                response_text[i : i + chunk_size] for i in range(0, len(response_text), chunk_size)
-            ]
-            total_parts = len(raw_chunks)
-            for idx, chunk in enumerate(raw_chunks):
-                part_prefix = f"[Part {idx + 1}/{total_parts}]\n" if total_parts > 1 else ""
-                await safe_send(
-                    interaction,
-                    f"```text\n{part_prefix}{chunk}\n```",
-                )
-
         # Record the turn in history
         await self._history.record(channel_id_int, personality, (prompt or "", response_text))
 
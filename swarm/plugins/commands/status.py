@@ -11,6 +11,7 @@ from discord import app_commands
 from discord.ext import commands
 
 from swarm.core import metrics as default_metrics
+from swarm.core.settings import settings
 from swarm.frontends.discord.discord_interactions import safe_send as default_safe_send
 from swarm.plugins.base_di import BaseDIClientCog
 from swarm.plugins.commands.decorators import background_app_command
@@ -18,6 +19,26 @@ from swarm.plugins.commands.decorators import background_app_command
 SPACER = " │ "  # visual separator in a single embed field
 
 
+def _kilo(n: float) -> str:
+    return f"{n / 1000:.1f}k" if n >= 1000 else f"{int(n)}"
+
+
+def _llm_usage_lines(usage: dict[str, dict[str, float]]) -> list[str]:
+    """One line per provider: requests against quota, tokens and estimated cost."""
+    quotas: dict[str, int] = getattr(settings, "llm_daily_request_quota", {}) or {}
+    lines = []
+    for provider, row in sorted(usage.items()):
+        requests = f"{int(row['requests'])}"
+        if quotas.get(provider):
+            requests += f"/{quotas[provider]}"
+        lines.append(
+            f"🤖 {provider}: {requests} req{SPACER}"
+            f"{_kilo(row['input_tokens'])} in / {_kilo(row['output_tokens'])} out{SPACER}"
+            f"${row['cost_usd']:.2f}"
+        )
+    return lines
+
+
 class Status(BaseDIClientCog):
     def __init__(
         self,
@@ -69,6 +90,9 @@ class Status(BaseDIClientCog):
             value=f"🖥️ {cpu} CPU{SPACER}💾 {mem}",
             inline=False,
         )
+        llm_lines = _llm_usage_lines(self.metrics.get_llm_usage())
+        if llm_lines:
+            embed.add_field(name="LLM (today, UTC)", value="\n".join(llm_lines), inline=False)
         embed.add_field(
             name="Discord",
             value=(f"⏰ {latency_ms} ms latency\n🌐 {guilds} guilds\n🔀 Shard {shard_info}"),
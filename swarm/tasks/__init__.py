@@ -20,17 +20,21 @@ from swarm.tasks.browser import (
     upload,
     wait_for,
 )
+from swarm.tasks.llm import generate, summarize, summarize_history
 
 __all__ = [
     "SwarmTask",
     "cleanup",
     "click",
     "fill",
+    "generate",
     "goto",
     "scrape_data",
     "screenshot",
     "start",
     "status",
+    "summarize",
+    "summarize_history",
     "upload",
     "wait_for",
 ]
@@ -0,0 +1,231 @@
+"""
+Language-model tasks for Celery.
+
+Background LLM work that must stay off the Discord frontend's event loop.
+Tasks are routed to the low-priority ``llm`` queue via ``llm.*`` in
+``celery_app.task_routes``.
+
+All ``llm.*`` tasks of a worker process run their coroutines on one shared
+event loop, so the provider's adaptive concurrency limit applies per worker
+and identical concurrent prompts collapse into one upstream request.  Run LLM
+workers with a thread pool (``--pool=threads --concurrency=16``) so several
+tasks can wait on the loop at once; results travel back through the Celery
+result backend.
+"""
+
+import asyncio
+import logging
+import threading
+from collections.abc import Coroutine
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from celery import Task
+
+from swarm.ai import providers as _providers
+from swarm.ai.contracts import Message
+from swarm.celery_app import app
+from swarm.core.settings import Settings
+from swarm.history.cached import publish_invalidation
+from swarm.history.compaction import compact_history, configured_provider
+from swarm.history.redis_backend import RedisBackend
+from swarm.tasks.base import SwarmTask
+from swarm.utils.async_helpers import run_in_threadpool
+
+if TYPE_CHECKING:
+    # For type checking, use the generic version
+    TaskType = Task[Any, Any]
+else:
+    # At runtime, use the non-generic version
+    TaskType = Task
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# Redis transport priorities run 0 (highest) .. 9 (lowest); summaries can wait.
+BACKGROUND_PRIORITY = 9
+# Upper bound on one summarization; the lock expires even if a worker dies.
+_COMPACT_LOCK_TTL = 300
+# Upper bound a task waits for its coroutine on the worker loop.
+_RESULT_TIMEOUT = 600.0
+
+SUMMARIZE_TEXT_PROMPT = (
+    "Summarize the text below concisely. Preserve facts, names, numbers and "
+    "decisions. Reply with the summary only."
+)
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def _worker_loop() -> asyncio.AbstractEventLoop:
+    """Start (once per process) the event loop shared by all ``llm.*`` tasks."""
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="llm-worker-loop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def _run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run *coro* on the worker loop and block the calling task until it is done."""
+    future = asyncio.run_coroutine_threadsafe(coro, _worker_loop())
+    try:
+        return future.result(timeout=_RESULT_TIMEOUT)
+    except TimeoutError:
+        future.cancel()
+        raise
+
+
+async def _generate(provider: str, messages: list[Message], **options: Any) -> str:
+    """Call *provider* at background priority and return the whole reply."""
+    options = {k: v for k, v in options.items() if v is not None}
+    reply = await _providers.get(provider).generate(
+        messages=messages, stream=False, **{"priority": "background", **options}
+    )
+    if not isinstance(reply, str):
+        reply = "".join([fragment async for fragment in reply])
+    return reply
+
+
+def _provider_name(provider: str | None) -> str:
+    return provider or getattr(Settings(), "llm_provider", "gemini")
+
+
+@app.task(base=SwarmTask, bind=True, name="llm.generate")
+def generate(
+    self: TaskType,
+    messages: list[Message],
+    provider: str | None = None,
+    model: str | None = None,
+    system_prompt: str | None = None,
+    options: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Generate a completion off the frontend at background priority.
+
+    Args:
+        messages: Chat history in role/content format
+        provider: Registered provider name (default: ``settings.llm_provider``)
+        model: Model override for the provider
+        system_prompt: Optional system instruction
+        options: Extra provider options (temperature, ...)
+
+    Returns:
+        Dict with success status, the provider used and the reply text
+    """
+    name = _provider_name(provider)
+    text = _run(
+        _generate(name, messages, model=model, system_prompt=system_prompt, **(options or {}))
+    )
+    return {"success": True, "provider": name, "model": model, "text": text}
+
+
+@app.task(base=SwarmTask, bind=True, name="llm.summarize")
+def summarize(
+    self: TaskType,
+    text: str,
+    instructions: str | None = None,
+    provider: str | None = None,
+    model: str | None = None,
+) -> dict[str, Any]:
+    """
+    Summarize a piece of text off the frontend.
+
+    Args:
+        text: Text to summarize
+        instructions: System prompt replacing the default summary instructions
+        provider: Registered provider name (default: ``settings.llm_provider``)
+        model: Model override for the provider
+
+    Returns:
+        Dict with success status, the provider used and the summary
+    """
+    name = _provider_name(provider)
+    summary = _run(
+        _generate(
+            name,
+            [{"role": "user", "content": text}],
+            model=model,
+            system_prompt=instructions or SUMMARIZE_TEXT_PROMPT,
+        )
+    )
+    return {"success": True, "provider": name, "model": model, "summary": summary.strip()}
+
+
+@app.task(base=SwarmTask, bind=True, name="llm.summarize_history")
+def summarize_history(self: TaskType, channel: int, persona: str) -> dict[str, Any]:
+    """
+    Fold the older part of a channel/persona history into a rolling summary.
+
+    Args:
+        channel: Discord channel ID of the conversation
+        persona: Persona name the history belongs to
+
+    Returns:
+        Dict with success status and whether the history was compacted
+    """
+    compacted = _run(_summarize_history(channel, persona))
+    return {"success": True, "channel": channel, "persona": persona, "compacted": compacted}
+
+
+async def _summarize_history(channel: int, persona: str) -> bool:
+    settings = Settings()
+    if not settings.redis.url:
+        raise ValueError("Redis URL not configured")
+
+    store = RedisBackend(
+        settings.redis.url,
+        max_turns=settings.conversation_max_turns,
+        ttl_seconds=settings.conversation_ttl_seconds,
+        legacy_encoding=settings.history_legacy_encoding,
+    )
+    client = store.client
+    lock_key = f"history:compact:lock:{channel}:{persona}"
+    try:
+        if not await client.set(lock_key, "1", nx=True, ex=_COMPACT_LOCK_TTL):
+            logger.debug(f"Compaction already running for {channel}/{persona}")
+            return False
+        try:
+            provider, model = configured_provider(settings)()
+            compacted = await compact_history(
+                store,
+                provider,
+                channel,
+                persona,
+                keep_recent=settings.history_compact_keep,
+                model=model,
+            )
+            if compacted:
+                # Frontends drop their local copy of the rewritten history
+                await publish_invalidation(client, channel, persona)
+            return compacted
+        finally:
+            await client.delete(lock_key)
+    finally:
+        await client.aclose()
+
+
+def enqueue_history_compaction(channel: int, persona: str) -> None:
+    """Fire-and-forget ``llm.summarize_history`` without blocking the event loop."""
+    send_kwargs: dict[str, Any] = {
+        "kwargs": {"channel": channel, "persona": persona},
+        "queue": "llm",
+        "priority": BACKGROUND_PRIORITY,
+    }
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        app.send_task("llm.summarize_history", **send_kwargs)
+        return
+    future = run_in_threadpool(
+        app.send_task, "llm.summarize_history", pool="celery-wait", **send_kwargs
+    )
+    future.add_done_callback(_log_enqueue_failure)
+
+
+def _log_enqueue_failure(future: "asyncio.Future[Any]") -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning(f"Failed to enqueue history compaction: {future.exception()}")
@@ -2,19 +2,28 @@
 
 This module provides a thin wrapper around ``asyncio.loop.run_in_executor``
 so that synchronous / CPU-heavy functions can be executed without blocking the
-asyncio event-loop.  Using the **default** executor is sufficient for most
-Discord frontend workloads – if you need fine-grained control (e.g. a dedicated)
-``ThreadPoolExecutor``), extend this helper or call the low-level API directly.
+asyncio event-loop.  Quick one-off calls can use the loop's **default**
+executor; classes of blocking work that can be slow or bursty (LLM SDK calls,
+image processing, Docker SDK calls, waiting on Celery results) each get a
+*named*, bounded pool so one of them cannot starve the others.  Pool sizes come
+from ``Settings.executors`` and every pool exports queue-wait and active-thread
+metrics.
 """
 
 from __future__ import annotations
 
 import asyncio
 import functools
+import threading
+import time
 from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, TypeVar
 
-__all__ = ["run_in_threadpool", "with_retries"]
+from swarm.core.settings import settings
+from swarm.core.telemetry import record_executor_wait, update_executor_threads
+
+__all__ = ["get_executor", "run_in_threadpool", "shutdown_executors", "with_retries"]
 
 T = TypeVar("T")
 
@@ -66,16 +75,97 @@ async def with_retries(
             delay *= backoff
 
 
-def run_in_threadpool(func: Callable[..., T], *args: Any, **kwargs: Any) -> asyncio.Future[T]:
-    """Run *func* in the event-loop's default thread-pool executor.
+class _NamedPool:
+    """A bounded ``ThreadPoolExecutor`` that reports queue wait and busy threads."""
+
+    def __init__(self, name: str, max_workers: int) -> None:
+        self.name = name
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"pool-{name}"
+        )
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+
+    def _publish(self) -> None:
+        update_executor_threads(self.name, self._active, self._queued)
+
+    def wrap(self, func: Callable[[], T]) -> Callable[[], T]:
+        submitted = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+            self._publish()
+
+        def _run() -> T:
+            record_executor_wait(self.name, time.perf_counter() - submitted)
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._publish()
+            try:
+                return func()
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._publish()
+
+        return _run
+
+
+_pools: dict[str, _NamedPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool(name: str) -> _NamedPool:
+    pool = _pools.get(name)
+    if pool is not None:
+        return pool
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            size = getattr(settings.executors, name.replace("-", "_"), None)
+            if not isinstance(size, int) or size <= 0:
+                size = settings.executors.default
+            pool = _NamedPool(name, size)
+            _pools[name] = pool
+    return pool
+
+
+def get_executor(name: str) -> ThreadPoolExecutor:
+    """Return the bounded executor for pool *name* (e.g. ``"llm"``, ``"docker"``).
+
+    Pools are created on first use and sized from ``Settings.executors``;
+    unknown names get ``executors.default`` threads.
+    """
+    return _pool(name).executor
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """Shut down all named pools (they are re-created on next use)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.executor.shutdown(wait=wait)
+
+
+def run_in_threadpool(
+    func: Callable[..., T], *args: Any, pool: str | None = None, **kwargs: Any
+) -> asyncio.Future[T]:
+    """Run *func* in a thread pool – the loop's default one unless *pool* is named.
 
     Example
     -------
     >>> content = await run_in_threadpool(path.read_bytes)
     >>> data = await run_in_threadpool(requests.get, url, timeout=5)
+    >>> png = await run_in_threadpool(_resize_sync, data, 1920, pool="image")
 
-    The returned awaitable resolves to the function's return value.
+    The returned awaitable resolves to the function's return value.  ``pool``
+    is reserved for this helper and never forwarded to *func*.
     """
     loop = asyncio.get_running_loop()
     partial_func: Callable[[], T] = functools.partial(func, *args, **kwargs)
-    return loop.run_in_executor(None, partial_func)
+    if pool is None:
+        return loop.run_in_executor(None, partial_func)
+    named = _pool(pool)
+    return loop.run_in_executor(named.executor, named.wrap(partial_func))
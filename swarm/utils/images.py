@@ -8,22 +8,22 @@ for other features.
 
 from __future__ import annotations
 
-import asyncio
 from io import BytesIO
 
 from PIL import Image
 
+from swarm.utils.async_helpers import run_in_threadpool
+
 __all__ = ["resize_png"]
 
 
 async def resize_png(data: bytes, *, max_dim: int = 1920) -> bytes:
     """Resize *data* (PNG or JPEG bytes) so that the largest dimension is
-    ``max_dim`` pixels.  Runs in a thread-pool so the event-loop is not
-    blocked.
+    ``max_dim`` pixels.  Runs in the ``image`` thread-pool so the event-loop
+    is not blocked.
     """
 
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _resize_sync, data, max_dim)
+    return await run_in_threadpool(_resize_sync, data, max_dim, pool="image")
 
 
 def _resize_sync(data: bytes, max_dim: int) -> bytes:  # pragma: no cover
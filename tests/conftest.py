@@ -62,7 +62,29 @@ def mock_settings() -> Settings:
     settings.gemini_api_key = None
     settings.openai_api_key = None
     settings.conversation_max_turns = 8
+    settings.conversation_max_tokens = 4000
+    settings.conversation_ttl_seconds = 0
+    settings.history_cache_channels = 0
+    settings.history_legacy_encoding = False
+    settings.history_compact_threshold = 0
+    settings.history_compact_keep = 2
+    settings.llm_cache_ttl_seconds = 0
+    settings.llm_cache_max_entries = 512
+    settings.llm_concurrency_initial = 4
+    settings.llm_concurrency_max = 32
+    settings.llm_queue_max = 64
+    settings.llm_queue_timeout_seconds = 30.0
+    settings.llm_fallback_providers = []
+    settings.llm_hedge_enabled = False
+    settings.llm_hedge_default_delay_seconds = 2.0
+    settings.llm_circuit_failures = 5
+    settings.llm_circuit_reset_seconds = 30.0
+    settings.llm_prompt_cache_ttl_seconds = 0
+    settings.llm_prompt_cache_min_tokens = 1024
+    settings.llm_prices = {}
+    settings.llm_daily_request_quota = {}
     settings.discord_chunk_size = 1900
+    settings.discord_stream_edit_interval = 1.0
     settings.gemini_model = "gemini-2.5-flash-preview-04-17"
     settings.personalities_file = None
     # Proxy settings
@@ -97,6 +119,18 @@ def mock_settings() -> Settings:
     return settings
 
 
+@pytest.fixture(autouse=True)
+def _reset_llm_middleware() -> Generator[None, None, None]:
+    """Give every test a fresh LLM cache and limiters so state never leaks across tests."""
+    from swarm.ai.providers import _cache, _limiter
+
+    _cache.reset()
+    _limiter.reset()
+    yield
+    _cache.reset()
+    _limiter.reset()
+
+
 # Type annotated autouse fixture (required by --strict mypy)
 @pytest.fixture(autouse=True)
 async def _cleanup_asyncio_tasks() -> AsyncGenerator[None, None]:
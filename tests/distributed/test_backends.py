@@ -7,11 +7,15 @@ properly implement the ScalingBackend protocol.
 """
 
 import asyncio
+import time
+from pathlib import Path
 from typing import Any, Dict, List, Type
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from docker.errors import NotFound
 
+from swarm.celery_worker import worker_nodename
 from swarm.distributed.backends.docker_api import DockerApiBackend
 from swarm.distributed.backends.fly_io import FlyIOBackend
 from swarm.distributed.backends.kubernetes import KubernetesBackend
@@ -98,6 +102,238 @@ class TestDockerApiBackend:
                 assert result is False
 
 
+class TestDockerDrainingScaleDown:
+    """Scale-down picks idle containers and drains them before stopping."""
+
+    @pytest.fixture
+    def celery_app(self) -> MagicMock:
+        app = MagicMock()
+        # browser-1 runs two tasks, browser-2 one, browser-3 is idle
+        app.control.inspect.return_value.active.return_value = {
+            "browser-1@host1": [{"id": "a"}, {"id": "b"}],
+            "browser-2@host2": [{"id": "c"}],
+            "browser-3@host3": [],
+        }
+        return app
+
+    @pytest.fixture
+    def backend(self, celery_app: MagicMock) -> DockerApiBackend:
+        with patch("swarm.distributed.backends.docker_api.docker.from_env"):
+            return DockerApiBackend(
+                network="test_network",
+                project_name="test",
+                app_mount_path="/app",
+                celery_app=celery_app,
+                drain_timeout=0.05,
+                drain_poll_interval=0.01,
+            )
+
+    @staticmethod
+    def _container(number: int) -> MagicMock:
+        container = MagicMock()
+        container.name = f"test_browser_{number}"
+        container.attrs = {
+            "Config": {"Hostname": f"host{number}", "Env": [f"CELERY_HOSTNAME=browser-{number}@%h"]}
+        }
+        return container
+
+    @pytest.mark.asyncio
+    async def test_node_name_matches_the_started_worker(self, backend: DockerApiBackend) -> None:
+        backend.client.containers.get.side_effect = NotFound("none")
+        assert await backend._create_worker_container("browser", 2) is True
+        for task in list(backend._ready_tasks):
+            task.cancel()
+        config = backend.client.containers.run.call_args.kwargs
+        environment = config["environment"]
+
+        # The entrypoint hands CELERY_HOSTNAME to the worker as its nodename
+        entrypoint = Path(__file__).parents[2] / "scripts" / "entrypoint.worker.sh"
+        assert "--hostname=${CELERY_HOSTNAME}" in entrypoint.read_text()
+        container = MagicMock()
+        container.name = config["name"]
+        container.attrs = {
+            "Config": {"Hostname": "f00d", "Env": [f"{k}={v}" for k, v in environment.items()]}
+        }
+        started_as = worker_nodename(environment["CELERY_HOSTNAME"], host="f00d")
+        assert backend._node_name("browser", container) == started_as == "browser-2@f00d"
+
+        # Workers started without CELERY_HOSTNAME keep Celery's default nodename
+        container.attrs = {"Config": {"Hostname": "f00d"}}
+        assert backend._node_name("browser", container) == worker_nodename(None, host="f00d")
+
+    @pytest.mark.asyncio
+    async def test_removes_idle_workers_first(
+        self, backend: DockerApiBackend, celery_app: MagicMock
+    ) -> None:
+        containers = [self._container(n) for n in (1, 2, 3)]
+
+        with patch.object(backend, "get_current_count", return_value=3):
+            with patch.object(backend, "_get_worker_containers", return_value=containers):
+                with patch.object(backend, "_remove_container") as mock_remove:
+                    assert await backend.scale_to("browser", 1) is True
+
+        removed = {call.args[0].name for call in mock_remove.call_args_list}
+        assert removed == {"test_browser_3", "test_browser_2"}
+        drained = {
+            call.kwargs["destination"][0]
+            for call in celery_app.control.cancel_consumer.call_args_list
+        }
+        assert drained == {"browser-3@host3", "browser-2@host2"}
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_state_breaks_ties_without_celery_reply(
+        self, backend: DockerApiBackend, celery_app: MagicMock
+    ) -> None:
+        celery_app.control.inspect.return_value.active.return_value = {}
+        backend.redis = MagicMock()
+        backend.redis.scan = AsyncMock(return_value=(0, [b"worker:heartbeat:browser:w3"]))
+        backend.redis.hgetall = AsyncMock(
+            return_value={b"state": b"BUSY", b"system": b'{"hostname": "host3"}'}
+        )
+        containers = [self._container(n) for n in (1, 2, 3)]
+
+        victims = await backend._select_victims("browser", containers, 1)
+
+        # The highest number is busy, so the next one goes
+        assert [c.name for c in victims] == ["test_browser_2"]
+        backend.redis.scan.assert_awaited_once_with(
+            0, match="worker:heartbeat:browser:*", count=100
+        )
+
+    @pytest.mark.asyncio
+    async def test_stops_after_drain_timeout(
+        self, backend: DockerApiBackend, celery_app: MagicMock
+    ) -> None:
+        container = self._container(1)
+
+        with patch.object(backend, "_remove_container") as mock_remove:
+            await backend._drain_and_remove("browser", container)
+
+        celery_app.control.cancel_consumer.assert_called_once_with(
+            "browser", destination=["browser-1@host1"]
+        )
+        # Still busy after the timeout: stopped anyway
+        mock_remove.assert_called_once_with(container)
+
+
+class TestDockerParallelScaleUp:
+    """Scale-up creates containers concurrently and activates standby ones first."""
+
+    @pytest.fixture
+    def backend(self) -> DockerApiBackend:
+        with patch("swarm.distributed.backends.docker_api.docker.from_env"):
+            return DockerApiBackend(
+                network="test_network",
+                project_name="test",
+                app_mount_path="/app",
+                celery_app=MagicMock(),
+                create_concurrency=2,
+                standby_count=1,
+            )
+
+    @staticmethod
+    def _container(name: str) -> MagicMock:
+        container = MagicMock()
+        container.name = name
+        container.attrs = {
+            "Config": {"Hostname": "abc", "Env": ["CELERY_HOSTNAME=browser-standby-1@%h"]}
+        }
+        return container
+
+    @pytest.mark.asyncio
+    async def test_creates_in_parallel_up_to_the_cap(self, backend: DockerApiBackend) -> None:
+        running = 0
+        peak = 0
+        created: list[tuple[int, bool]] = []
+
+        async def create(worker_type: str, number: int, standby: bool = False) -> bool:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            created.append((number, standby))
+            return True
+
+        # Workers 1 and 3 run (2 was drained away); nothing on standby yet
+        existing = [self._container("test_browser_1"), self._container("test_browser_3")]
+        with patch.object(backend, "get_current_count", return_value=2):
+            with patch.object(backend, "_list_containers", return_value=existing):
+                with patch.object(backend, "_create_worker_container", side_effect=create):
+                    assert await backend.scale_to("browser", 6) is True
+
+        assert peak == 2
+        workers = sorted(n for n, standby in created if not standby)
+        assert workers == [2, 4, 5, 6]
+        assert [n for n, standby in created if standby] == [1]
+
+    @staticmethod
+    async def _create_standby(backend: DockerApiBackend) -> MagicMock:
+        """Create standby #1 and return it as Docker would list it (hostname ``abc``)."""
+        backend.client.containers.get.side_effect = NotFound("none")
+        container = MagicMock()
+        backend.client.containers.run.return_value = container
+        with patch.object(backend, "_await_ready", new=AsyncMock()):
+            assert await backend._create_worker_container("browser", 1, standby=True) is True
+        config = backend.client.containers.run.call_args.kwargs
+        container.name = config["name"]
+        container.attrs = {
+            "Config": {
+                "Hostname": "abc",
+                "Env": [f"{k}={v}" for k, v in config["environment"].items()],
+            }
+        }
+        return container
+
+    @pytest.mark.asyncio
+    async def test_standby_is_paused_once_its_worker_answers(
+        self, backend: DockerApiBackend
+    ) -> None:
+        standby = await self._create_standby(backend)
+        env = dict(item.split("=", 1) for item in standby.attrs["Config"]["Env"])
+        node = worker_nodename(env["CELERY_HOSTNAME"], host="abc")
+        # Only the nodename the worker actually registered under replies
+        backend.celery_app.control.ping.side_effect = lambda destination, timeout: (
+            [{node: {"ok": "pong"}}] if destination == [node] else []
+        )
+        backend.ready_timeout = 1.0
+        backend.drain_poll_interval = 0.01
+
+        await backend._await_ready("browser", standby, time.monotonic(), standby=True)
+
+        standby.pause.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_activates_paused_standby_before_creating(
+        self, backend: DockerApiBackend
+    ) -> None:
+        standby = await self._create_standby(backend)
+        env = dict(item.split("=", 1) for item in standby.attrs["Config"]["Env"])
+        node = worker_nodename(env["CELERY_HOSTNAME"], host="abc")
+        worker = self._container("test_browser_1")
+
+        async def list_containers(worker_type: str, statuses: list[str]) -> list[MagicMock]:
+            return [standby] if statuses == ["paused"] else [worker, standby]
+
+        with patch.object(backend, "get_current_count", return_value=1):
+            with patch.object(backend, "_list_containers", side_effect=list_containers):
+                with patch.object(
+                    backend, "_create_worker_container", return_value=True
+                ) as mock_create:
+                    assert await backend.scale_to("browser", 2) is True
+
+        standby.rename.assert_called_once_with("test_browser_2")
+        standby.unpause.assert_called_once()
+        backend.celery_app.control.add_consumer.assert_called_once_with(
+            "browser", destination=[node], reply=True
+        )
+        backend.celery_app.control.cancel_consumer.assert_called_once_with(
+            "browser.standby", destination=[node]
+        )
+        # No cold start; the mocked listing still shows the standby, so none is replenished
+        mock_create.assert_not_called()
+
+
 class TestFlyIOBackend:
     """Test FlyIOBackend command construction."""
 
@@ -0,0 +1,75 @@
+"""
+Tests for the Celery queue reader
+=================================
+
+Queue depths are read from kombu's Redis keys in a single pipeline.
+"""
+
+import json
+from typing import Any, cast
+
+import pytest
+
+from swarm.core.telemetry import CELERY_QUEUE_DEPTH
+from swarm.distributed.services.celery_queues import PRIORITY_SEP, CeleryQueueReader
+from swarm.types import RedisBytes
+
+
+class _Pipeline:
+    def __init__(self, redis: "_BrokerRedis") -> None:
+        self.redis = redis
+        self.commands: list[tuple[str, str]] = []
+
+    def llen(self, key: str) -> None:
+        self.commands.append(("llen", key))
+
+    def hvals(self, key: str) -> None:
+        self.commands.append(("hvals", key))
+
+    async def execute(self) -> list[Any]:
+        self.redis.executed += 1
+        return [
+            len(self.redis.lists.get(key, [])) if op == "llen" else self.redis.hashes.get(key, [])
+            for op, key in self.commands
+        ]
+
+
+class _BrokerRedis:
+    def __init__(self) -> None:
+        self.lists: dict[str, list[bytes]] = {}
+        self.hashes: dict[str, list[bytes]] = {}
+        self.executed = 0
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+
+@pytest.mark.asyncio
+async def test_reads_priority_lists_and_unacked_in_one_pipeline() -> None:
+    redis = _BrokerRedis()
+    redis.lists["llm"] = [b"m"] * 2
+    redis.lists[f"llm{PRIORITY_SEP}9"] = [b"m"] * 3  # background priority
+    redis.lists["browser"] = [b"m"]
+    redis.hashes["unacked"] = [
+        json.dumps([{}, "", "llm"]).encode(),
+        json.dumps([{}, "", "browser"]).encode(),
+        b"not json",
+    ]
+    reader = CeleryQueueReader(cast(RedisBytes, redis), ["llm", "browser"], list(range(10)))
+
+    stats = await reader.read()
+
+    assert redis.executed == 1
+    assert stats["llm"] == {"depth": 6, "messages_ready": 5, "messages_unacknowledged": 1}
+    assert stats["browser"] == {"depth": 2, "messages_ready": 1, "messages_unacknowledged": 1}
+    assert CELERY_QUEUE_DEPTH.labels("llm", "ready")._value.get() == 5
+
+
+@pytest.mark.asyncio
+async def test_from_app_uses_declared_queues_and_priority_steps() -> None:
+    from swarm.celery_app import app
+
+    reader = CeleryQueueReader.from_app(cast(RedisBytes, _BrokerRedis()), app)
+
+    assert set(reader.queues) == {"browser", "tankpit", "llm", "default"}
+    assert f"llm{PRIORITY_SEP}9" in reader._keys["llm"]
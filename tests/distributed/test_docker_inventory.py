@@ -0,0 +1,128 @@
+"""
+Tests for the Docker Container Inventory
+========================================
+
+Event-driven worker counts, crash-loop detection and cache invalidation.
+"""
+
+import time
+from typing import Any, cast
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from swarm.distributed.backends.docker_api import DockerApiBackend
+from swarm.distributed.backends.docker_inventory import ContainerInventory
+from swarm.distributed.core.config import DistributedConfig
+from swarm.distributed.services.scaling_service import ScalingService
+from swarm.types import RedisBytes
+from tests.fakes.fake_redis import FakeRedisClient
+
+LABELS = {"com.docker.compose.project": "test", "discord.worker.type": "browser"}
+
+
+def _container(container_id: str, name: str, status: str = "running") -> MagicMock:
+    container = MagicMock()
+    container.id = container_id
+    container.name = name
+    container.status = status
+    container.labels = LABELS
+    container.attrs = {"State": {"Health": {"Status": "healthy"}}}
+    return container
+
+
+def _event(container_id: str, action: str, name: str = "", at: float = 0.0) -> dict[str, Any]:
+    attributes = dict(LABELS, name=name) if name else dict(LABELS)
+    return {
+        "Type": "container",
+        "Action": action,
+        "Actor": {"ID": container_id, "Attributes": attributes},
+        "time": at,
+    }
+
+
+@pytest.fixture
+def inventory() -> ContainerInventory:
+    inventory = ContainerInventory(MagicMock(), "test", clock=lambda: 100.0)
+    inventory.load(
+        [
+            _container("a", "test_browser_1"),
+            _container("b", "test_browser_2"),
+            _container("s", "test_browser_standby_1", status="paused"),
+        ]
+    )
+    return inventory
+
+
+def test_counts_follow_events(inventory: ContainerInventory) -> None:
+    changed: list[str] = []
+    inventory.add_listener(changed.append)
+    assert inventory.synced
+    assert inventory.count("browser") == 2
+
+    inventory.apply_event(_event("c", "start", "test_browser_3"))
+    assert inventory.count("browser") == 3
+
+    inventory.apply_event(_event("a", "die"))
+    inventory.apply_event(_event("a", "destroy"))
+    assert inventory.count("browser") == 2
+    assert "a" not in inventory.records
+
+    # An activated standby is renamed and unpaused into a worker
+    inventory.apply_event(_event("s", "rename", "test_browser_1"))
+    inventory.apply_event(_event("s", "unpause"))
+    assert inventory.count("browser") == 3
+
+    inventory.apply_event(_event("b", "health_status: unhealthy"))
+    assert inventory.unhealthy("browser") == ["test_browser_2"]
+    assert changed and set(changed) == {"browser"}
+
+
+def test_ignores_other_projects(inventory: ContainerInventory) -> None:
+    event = _event("x", "start", "other_browser_1")
+    event["Actor"]["Attributes"]["com.docker.compose.project"] = "other"
+
+    inventory.apply_event(event)
+
+    assert inventory.count("browser") == 2
+
+
+def test_detects_crash_loop_on_the_third_restart(inventory: ContainerInventory) -> None:
+    for at in (10.0, 20.0):
+        inventory.apply_event(_event("b", "die", at=at))
+        inventory.apply_event(_event("b", "start", at=at))
+    assert inventory.crash_looping("browser") == []
+
+    inventory.apply_event(_event("b", "die", at=30.0))
+    inventory.apply_event(_event("b", "start", at=30.0))
+    assert inventory.crash_looping("browser") == ["b"]
+
+    # Reconciliation keeps the restart history
+    inventory.load([_container("a", "test_browser_1"), _container("b", "test_browser_2")])
+    assert inventory.crash_looping("browser") == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_events_invalidate_scaling_service_count() -> None:
+    with patch("swarm.distributed.backends.docker_api.docker.from_env"):
+        backend = DockerApiBackend(
+            network="test_network", project_name="test", app_mount_path="/app", watch_events=True
+        )
+    assert backend.inventory is not None
+    backend.inventory.load([_container("a", "test_browser_1")])
+    service = ScalingService(cast(RedisBytes, FakeRedisClient()), DistributedConfig(), backend)
+
+    assert await service.get_current_count("browser") == 1
+    # Answered from memory, no listing
+    backend.client.containers.list.assert_not_called()
+
+    backend.inventory.apply_event(_event("c", "start", "test_browser_2"))
+    assert await service.get_current_count("browser") == 2
+
+    # Crash-looping containers are removed first
+    for at in (time.time() - 2, time.time() - 1, time.time()):
+        backend.inventory.apply_event(_event("a", "die", at=at))
+        backend.inventory.apply_event(_event("a", "start", at=at))
+    first, second = _container("a", "test_browser_1"), _container("c", "test_browser_2")
+    victims = await backend._select_victims("browser", [first, second], 1)
+    assert victims == [first]
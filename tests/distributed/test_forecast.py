@@ -0,0 +1,110 @@
+"""
+Tests for the Demand Forecast
+=============================
+
+Seasonal smoothing of desired worker counts and its Redis persistence.
+"""
+
+from typing import cast
+
+import pytest
+
+from swarm.distributed.services.forecast import (
+    FORECAST_KEY,
+    DemandForecaster,
+    SeasonalDemandModel,
+)
+from swarm.types import RedisBytes
+from tests.fakes.fake_redis import FakeRedisClient
+
+# A 4-slot "day" of one minute per slot with a peak in slot 2
+_PATTERN = [1, 1, 8, 1]
+
+
+async def _replay(forecaster: DemandForecaster, now: list[float], days: int) -> None:
+    for _ in range(days):
+        for demand in _PATTERN:
+            await forecaster.observe("browser", demand)
+            now[0] += 60
+
+
+@pytest.mark.asyncio
+async def test_forecast_prewarms_before_the_daily_peak() -> None:
+    now = [0.0]
+    redis = FakeRedisClient()
+    forecaster = DemandForecaster(
+        cast(RedisBytes, redis), slot_seconds=60, season_seconds=240, clock=lambda: now[0]
+    )
+
+    # Not used before a whole season was seen (the last slot is still open)
+    await _replay(forecaster, now, days=1)
+    assert forecaster.min_workers("browser", 240) == 0
+
+    await _replay(forecaster, now, days=5)
+
+    # Slot 1 of the next day: a 60 s lead reaches into the peak slot
+    now[0] += 60
+    assert forecaster.min_workers("browser", 0.1) <= 2
+    assert forecaster.min_workers("browser", 60) >= 7
+
+    # The model was persisted and is restored by a fresh forecaster
+    assert FORECAST_KEY in redis.hashes
+    restored = DemandForecaster(
+        cast(RedisBytes, redis), slot_seconds=60, season_seconds=240, clock=lambda: now[0]
+    )
+    await restored.load("browser")
+    assert restored.min_workers("browser", 60) == forecaster.min_workers("browser", 60)
+
+
+@pytest.mark.asyncio
+async def test_forecast_bootstraps_from_scaling_events() -> None:
+    redis = FakeRedisClient()
+    for ts, desired in [(0, 1), (120, 6), (180, 1), (240, 1), (360, 6), (420, 1)]:
+        await redis.xadd(
+            "scaling:events",
+            {
+                "worker_type": "browser",
+                # to_count held at 6 by an earlier forecast floor
+                "to_count": "6",
+                "desired": str(desired),
+                "timestamp": str(ts),
+            },
+        )
+    # Events from before demand was recorded are ignored
+    await redis.xadd(
+        "scaling:events", {"worker_type": "browser", "to_count": "9", "timestamp": "60"}
+    )
+    forecaster = DemandForecaster(
+        cast(RedisBytes, redis), slot_seconds=60, season_seconds=240, clock=lambda: 480.0
+    )
+
+    model = await forecaster.load("browser")
+
+    assert model.ready
+    assert model.predict(2) > model.predict(1) + 3
+    assert model.predict(1) < 3
+
+
+@pytest.mark.asyncio
+async def test_forecast_bootstrap_replays_two_seasons_at_most(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    redis = FakeRedisClient()
+    for ts, desired in [(0, 5), (600, 2)]:
+        await redis.xadd(
+            "scaling:events",
+            {"worker_type": "browser", "desired": str(desired), "timestamp": str(ts)},
+        )
+    forecaster = DemandForecaster(
+        cast(RedisBytes, redis), slot_seconds=60, season_seconds=240, clock=lambda: 6000.0
+    )
+    updates: list[tuple[int, float]] = []
+    monkeypatch.setattr(
+        SeasonalDemandModel, "update", lambda self, slot, value: updates.append((slot, value))
+    )
+
+    await forecaster.load("browser")
+
+    # 100 slots since the first event, but only the last 2 x 4 are replayed
+    assert [slot for slot, _ in updates] == list(range(92, 100))
+    assert {value for _, value in updates} == {2}
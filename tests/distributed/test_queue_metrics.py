@@ -0,0 +1,105 @@
+"""
+Tests for Queue Metrics Service
+===============================
+
+Exact backlog from group lag / XRANGE tail and the single-round-trip snapshot.
+"""
+
+from typing import Any, cast
+
+import pytest
+
+from swarm.distributed.services.queue_metrics import QueueMetricsService
+from swarm.types import RedisBytes
+from tests.fakes.fake_redis import FakeRedisClient
+
+
+class _StreamRedis(FakeRedisClient):
+    """Fake client whose group reports no lag (Redis < 7) and supports paged XRANGE."""
+
+    def __init__(self, entries: int, last_delivered: int) -> None:
+        super().__init__()
+        self.ids = [f"{i}-0" for i in range(1, entries + 1)]
+        self.last_delivered = last_delivered
+
+    async def xinfo_groups(self, stream: str) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": b"g",
+                "consumers": 1,
+                "pending": 2,
+                "last-delivered-id": f"{self.last_delivered}-0".encode(),
+                "lag": None,
+            }
+        ]
+
+    async def xrange(  # type: ignore[override]
+        self, stream: str, min: str = "-", max: str = "+", count: int | None = None
+    ) -> list[tuple[bytes, dict[bytes, bytes]]]:
+        self._record_call("xrange", stream, min, max, count=count)
+        after = int(min.lstrip("(").split("-")[0])
+        tail = [i for i in self.ids if int(i.split("-")[0]) > after]
+        return [(i.encode(), {}) for i in tail[:count]]
+
+    async def xpending_range(self, **kwargs: Any) -> list[dict[str, Any]]:
+        return [{"message_id": b"1-0", "consumer": b"c", "time_since_delivered": 42000}]
+
+
+@pytest.mark.asyncio
+async def test_new_messages_counts_tail_after_last_delivered(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from swarm.distributed.services import queue_metrics
+
+    monkeypatch.setattr(queue_metrics, "_XRANGE_PAGE", 2)
+    redis = _StreamRedis(entries=7, last_delivered=2)
+    service = QueueMetricsService(cast(RedisBytes, redis))
+
+    assert await service.get_new_messages_count("q", "g") == 5
+    # 5 entries in pages of 2 -> 3 XRANGE calls
+    assert sum(1 for call in redis.call_history if call[0] == "xrange") == 3
+
+    metrics = await service.get_comprehensive_metrics("q", "g")
+    assert metrics["true_queue_depth"] == 7
+    assert metrics["new_messages_source"] == "xrange"
+    assert metrics["oldest_pending_ms"] == 42000
+    assert metrics["health_status"] == "degraded"
+
+
+@pytest.mark.asyncio
+async def test_snapshot_uses_one_script_call_for_all_queues() -> None:
+    calls: list[tuple[list[str], list[str]]] = []
+
+    async def _script(keys: list[str], args: list[str]) -> list[list[Any]]:
+        calls.append((keys, args))
+        return [[10, 1, 2, 3, 4, 1500, b"lag"], [5, 0, 0, 0, 5, 0, b"nogroup"]]
+
+    redis = FakeRedisClient()
+    redis.register_script = lambda source: _script  # type: ignore[attr-defined]
+    service = QueueMetricsService(cast(RedisBytes, redis))
+
+    snapshot = await service.snapshot([("a:jobs", "a"), ("b:jobs", "b")])
+
+    assert calls == [(["a:jobs", "b:jobs"], ["a", "b", 4, 1000])]
+    assert snapshot["a:jobs"]["true_queue_depth"] == 7
+    assert snapshot["a:jobs"]["new_messages_source"] == "lag"
+    assert snapshot["b:jobs"]["true_queue_depth"] == 5
+    assert snapshot["b:jobs"]["new_messages_source"] == "nogroup"
+    assert redis.call_history == []  # nothing else went to Redis
+
+
+@pytest.mark.asyncio
+async def test_snapshot_finishes_capped_count_client_side() -> None:
+    async def _script(keys: list[str], args: list[str]) -> list[list[Any]]:
+        # The script counted 4 entries after 3-0 before hitting its page limit
+        return [[10, 1, 1, 2, 4, 0, b"capped", -1, 500, b"7-0"]]
+
+    redis = _StreamRedis(entries=10, last_delivered=3)
+    redis.register_script = lambda source: _script  # type: ignore[attr-defined]
+    service = QueueMetricsService(cast(RedisBytes, redis))
+
+    metrics = (await service.snapshot([("q", "g")]))["q"]
+
+    assert metrics["new_messages"] == 7
+    assert metrics["new_messages_source"] == "xrange"
+    assert [call[1][1] for call in redis.call_history if call[0] == "xrange"] == ["(7-0"]
@@ -0,0 +1,133 @@
+"""
+Tests for the Scaling Policy
+============================
+
+SLO-mode sizing from arrival rate, service time and queue wait.
+"""
+
+import pytest
+
+from swarm.distributed.core.config import ScalingConfig
+from swarm.distributed.services.scaling_policy import (
+    ScalingDecision,
+    TargetTrackingPolicy,
+    _erlang_c,
+    slo_workers,
+)
+from swarm.distributed.services.throughput import LoadEstimate, ThroughputEstimator
+
+
+def _slo_config(target: float) -> ScalingConfig:
+    return ScalingConfig(
+        min_workers=1,
+        max_workers=50,
+        scale_up_threshold=1,
+        scale_down_threshold=0,
+        cooldown_seconds=0,
+        scale_down_stabilization_seconds=0,
+        target_wait_p95_seconds=target,
+    )
+
+
+def test_erlang_c_matches_known_values() -> None:
+    # Single server: P(wait) equals the utilisation
+    assert _erlang_c(1, 0.5) == pytest.approx(0.5)
+    # Textbook value for c=2, a=1: 1/3
+    assert _erlang_c(2, 1.0) == pytest.approx(1 / 3)
+
+
+def test_slo_workers_depend_on_service_time() -> None:
+    """The same arrival rate needs far more workers for slow jobs."""
+    config = _slo_config(target=10)
+    browser = LoadEstimate(arrival_rate=1.0, service_time=3.0)
+    llm = LoadEstimate(arrival_rate=1.0, service_time=30.0)
+
+    browser_workers = slo_workers(0, config, browser)
+    llm_workers = slo_workers(0, config, llm)
+
+    assert 3 < browser_workers <= 6
+    assert 30 < llm_workers <= 40
+
+
+def test_slo_workers_cover_the_backlog() -> None:
+    # 20 queued jobs of 10 s must start within 20 s -> 10 workers
+    assert slo_workers(20, _slo_config(target=20)) == 10
+
+
+def test_slo_mode_scales_up_when_head_of_line_is_late() -> None:
+    policy = TargetTrackingPolicy(clock=lambda: 1000.0)
+    config = _slo_config(target=30)
+
+    # Sized for the load already, but the oldest job has waited too long
+    decision, target = policy.decide(
+        "browser", 1, 5, config, LoadEstimate(arrival_rate=0.1, service_time=2.0), 0.0, 45.0
+    )
+    assert (decision, target) == (ScalingDecision.SCALE_UP, 6)
+
+    # On time and over-provisioned: scale down
+    decision, target = policy.decide(
+        "browser", 0, 5, config, LoadEstimate(arrival_rate=0.1, service_time=2.0), 0.0, 0.0
+    )
+    assert (decision, target) == (ScalingDecision.SCALE_DOWN, 4)
+
+
+def test_estimator_measures_arrivals_and_service_time() -> None:
+    now = [0.0]
+    estimator = ThroughputEstimator(clock=lambda: now[0])
+
+    estimator.observe("llm", {"entries_read": 0, "pending_count": 4, "new_messages": 0}, 4)
+    now[0] = 60.0
+    # 12 delivered, 4 still in flight -> 12 completed; 3 more waiting -> 15 arrived
+    estimator.observe("llm", {"entries_read": 12, "pending_count": 4, "new_messages": 3}, 4)
+
+    load = estimator.estimate("llm")
+    assert load.arrival_rate == pytest.approx(15 / 60)
+    assert load.per_worker_rate == pytest.approx(12 / 60 / 4)
+    # 4 jobs in flight at 0.2 completions/s -> 20 s per job
+    assert load.service_time == pytest.approx(20.0)
+
+
+def test_forecast_raises_the_minimum() -> None:
+    policy = TargetTrackingPolicy(clock=lambda: 1000.0)
+    config = _slo_config(target=30)
+    load = LoadEstimate(arrival_rate=0.1, service_time=2.0)
+
+    assert policy.decide("browser", 0, 2, config, load, forecast_min=6) == (
+        ScalingDecision.SCALE_UP,
+        6,
+    )
+    # Never scaled down below the forecast either
+    assert policy.decide("browser", 0, 6, config, load, forecast_min=6) == (
+        ScalingDecision.NO_CHANGE,
+        6,
+    )
+
+
+def test_steady_backlog_holds_at_desired() -> None:
+    """Busy workers keep the backlog above the threshold without growing the pool."""
+    now = [1000.0]
+    policy = TargetTrackingPolicy(clock=lambda: now[0])
+    config = ScalingConfig(
+        min_workers=1,
+        max_workers=10,
+        scale_up_threshold=1,
+        scale_down_threshold=0,
+        cooldown_seconds=0,
+        est_job_seconds=10,
+        target_drain_seconds=60,
+    )
+
+    workers = 1
+    for _ in range(10):
+        # Two jobs in flight: desired = ceil(2 / 6) = 1
+        now[0] += 30
+        decision, workers = policy.decide("browser", 2, workers, config)
+        assert decision == ScalingDecision.NO_CHANGE
+    assert workers == 1
+
+    # A larger backlog moves straight to the target and stays there
+    now[0] += 30
+    decision, workers = policy.decide("browser", 30, workers, config)
+    assert (decision, workers) == (ScalingDecision.SCALE_UP, 5)
+    now[0] += 30
+    assert policy.decide("browser", 30, workers, config) == (ScalingDecision.NO_CHANGE, 5)
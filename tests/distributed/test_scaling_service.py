@@ -17,10 +17,12 @@ from swarm.distributed.core.config import (
     ScalingConfig,
     WorkerTypeConfig,
 )
+from swarm.distributed.services.scaling_policy import TargetTrackingPolicy
 from swarm.distributed.services.scaling_service import (
     ScalingDecision,
     ScalingService,
 )
+from swarm.distributed.services.throughput import ThroughputEstimator
 from swarm.types import RedisBytes
 from tests.fakes.fake_redis import FakeRedisClient
 from tests.fakes.fake_scaling_backend import FakeScalingBackend
@@ -47,6 +49,8 @@ def test_config() -> DistributedConfig:
                 scale_up_threshold=3,
                 scale_down_threshold=1,
                 cooldown_seconds=1,  # Short for testing
+                # 10 s jobs drained within 20 s: two queued jobs per worker
+                target_drain_seconds=20,
             ),
         ),
     }
@@ -133,12 +137,12 @@ class TestScalingService:
         # High queue depth, few workers
         decision, target = service.make_scaling_decision(
             worker_type="test",
-            queue_depth=5,  # Above threshold of 3
+            queue_depth=5,  # Needs 3 workers
             current_workers=2,
         )
 
         assert decision == ScalingDecision.SCALE_UP
-        assert target == 3  # Current + 1
+        assert target == 3
 
     async def test_make_scaling_decision_scale_down(
         self, fake_redis: FakeRedisClient, test_config: DistributedConfig
@@ -162,10 +166,10 @@ class TestScalingService:
         """Test making a no change decision."""
         service = ScalingService(cast(RedisBytes, fake_redis), test_config)
 
-        # Queue depth between thresholds
+        # Backlog the current pool is sized for
         decision, target = service.make_scaling_decision(
             worker_type="test",
-            queue_depth=2,  # Between 1 and 3
+            queue_depth=4,
             current_workers=2,
         )
 
@@ -207,7 +211,7 @@ class TestScalingService:
         # Record a recent scaling operation
         service.last_scale_time["test"] = time.time() - 0.5  # 0.5 seconds ago
 
-        # Scale-up should ignore cooldown (queue_depth=5 > scale_up_threshold=3)
+        # Scale-up should ignore cooldown (queue_depth=5 needs 3 workers)
         decision, target = service.make_scaling_decision(
             worker_type="test",
             queue_depth=5,
@@ -227,6 +231,76 @@ class TestScalingService:
         assert decision == ScalingDecision.NO_CHANGE  # Blocked by cooldown
         assert target == 3
 
+    async def test_make_scaling_decision_burst_scales_in_one_pass(
+        self, fake_redis: FakeRedisClient, test_config: DistributedConfig
+    ) -> None:
+        """A large backlog is answered with several workers at once."""
+        service = ScalingService(cast(RedisBytes, fake_redis), test_config)
+
+        # 100 jobs at 10 s each should drain in 60 s -> 17 workers, capped at max 5
+        decision, target = service.make_scaling_decision(
+            worker_type="test", queue_depth=100, current_workers=1
+        )
+
+        assert decision == ScalingDecision.SCALE_UP
+        assert target == 5
+
+        # The step size is bounded
+        test_config.worker_types["test"].scaling.max_scale_up_step = 2
+        decision, target = service.make_scaling_decision(
+            worker_type="test", queue_depth=100, current_workers=1
+        )
+        assert target == 3
+
+    async def test_make_scaling_decision_uses_measured_throughput(
+        self, fake_redis: FakeRedisClient, test_config: DistributedConfig
+    ) -> None:
+        """Measured per-worker throughput replaces the configured job estimate."""
+        now = [0.0]
+        service = ScalingService(cast(RedisBytes, fake_redis), test_config)
+        service.throughput = ThroughputEstimator(clock=lambda: now[0])
+        test_config.worker_types["test"].scaling.max_workers = 50
+
+        # 2 workers completed 60 jobs in 30 s -> 1 job/s per worker
+        service.throughput.observe("test", {"entries_read": 100, "pending_count": 2}, 2)
+        now[0] = 30.0
+        service.throughput.observe("test", {"entries_read": 160, "pending_count": 2}, 2)
+        assert service.throughput.per_worker_rate("test") == pytest.approx(1.0)
+
+        # 200 jobs / (1 job/s * 20 s) -> 10 workers
+        decision, target = service.make_scaling_decision(
+            worker_type="test", queue_depth=200, current_workers=2
+        )
+        assert (decision, target) == (ScalingDecision.SCALE_UP, 10)
+
+    async def test_scale_down_stabilization_window(
+        self, fake_redis: FakeRedisClient, test_config: DistributedConfig
+    ) -> None:
+        """Scale-down acts on the highest recommendation of the window."""
+        now = [1000.0]
+        service = ScalingService(cast(RedisBytes, fake_redis), test_config)
+        service.policy = TargetTrackingPolicy(clock=lambda: now[0])
+        scaling = test_config.worker_types["test"].scaling
+        scaling.scale_down_stabilization_seconds = 60
+        scaling.max_scale_down_step = 5
+
+        # Burst wants 5 workers
+        service.make_scaling_decision(worker_type="test", queue_depth=100, current_workers=5)
+
+        # Queue is empty 30 s later, but the burst is still inside the window
+        now[0] += 30
+        decision, _ = service.make_scaling_decision(
+            worker_type="test", queue_depth=0, current_workers=5
+        )
+        assert decision == ScalingDecision.NO_CHANGE
+
+        # Once it left the window, scale down by up to max_scale_down_step
+        now[0] += 31
+        decision, target = service.make_scaling_decision(
+            worker_type="test", queue_depth=0, current_workers=5
+        )
+        assert (decision, target) == (ScalingDecision.SCALE_DOWN, 1)
+
     async def test_execute_scaling_no_change(
         self,
         fake_redis: FakeRedisClient,
@@ -315,6 +389,67 @@ class TestScalingService:
         last_op = fake_backend.get_last_scaling()
         assert last_op == ("test", 2, 3)
 
+    async def test_slow_backend_does_not_block_other_types(
+        self, fake_redis: FakeRedisClient, test_config: DistributedConfig
+    ) -> None:
+        """A hanging backend call for one type misses the deadline alone."""
+        test_config.worker_types["slow"] = WorkerTypeConfig(
+            name="slow",
+            job_queue="slow:jobs",
+            scaling=ScalingConfig(
+                min_workers=1, max_workers=5, scale_up_threshold=3, scale_down_threshold=1
+            ),
+        )
+        test_config.scaling_deadline = 0.2
+        release = asyncio.Event()
+
+        class _Backend(FakeScalingBackend):
+            async def get_current_count(self, worker_type: str) -> int:
+                if worker_type == "slow":
+                    await release.wait()
+                return await super().get_current_count(worker_type)
+
+        backend = _Backend(initial_counts={"test": 0, "slow": 0})
+        service = ScalingService(cast(RedisBytes, fake_redis), test_config, backend)
+
+        results = await service.check_and_scale_all()
+        assert results == {"test": True, "slow": False}
+        assert backend.worker_counts["test"] == 1
+
+        # Still running: the next pass skips it instead of piling up
+        results = await service.check_and_scale_all()
+        assert results["slow"] is False
+
+        release.set()
+        await service._inflight["slow"]
+        assert backend.worker_counts["slow"] == 1
+
+    async def test_worker_counts_are_cached_until_invalidated(
+        self,
+        fake_redis: FakeRedisClient,
+        test_config: DistributedConfig,
+        fake_backend: FakeScalingBackend,
+    ) -> None:
+        """Backend counts are reused between passes until something changes."""
+        calls: list[str] = []
+        count = fake_backend.get_current_count
+
+        async def _counting(worker_type: str) -> int:
+            calls.append(worker_type)
+            return await count(worker_type)
+
+        fake_backend.get_current_count = _counting  # type: ignore[method-assign]
+        service = ScalingService(cast(RedisBytes, fake_redis), test_config, fake_backend)
+
+        await service.check_and_scale_all()
+        await service.check_and_scale_all()
+        assert calls == ["test"]
+
+        # A new heartbeat means a container came up: ask the backend again
+        await fake_redis.hset("worker:heartbeat:test:worker-9", "state", "IDLE")
+        await service.check_and_scale_all()
+        assert calls == ["test", "test"]
+
     async def test_get_metrics(
         self, fake_redis: FakeRedisClient, test_config: DistributedConfig
     ) -> None:
@@ -362,3 +497,11 @@ class TestScalingService:
         assert event_data["decision"] == "scale_up"
         assert event_data["from_count"] == "2"
         assert event_data["to_count"] == "3"
+        # No decision was made, so there is no demand to record
+        assert "desired" not in event_data
+
+        # After a decision the unfloored demand is stored for the forecast
+        service.make_scaling_decision("test", 0, 2)
+        await service.execute_scaling("test", ScalingDecision.SCALE_DOWN, 1)
+        events = await fake_redis.xrange("scaling:events")
+        assert events[-1][1]["desired"] == "0"
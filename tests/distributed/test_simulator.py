@@ -0,0 +1,92 @@
+"""
+Tests for the Autoscaling Simulator
+===================================
+
+Replays a synthetic burst against ScalingService in virtual time.
+"""
+
+from typing import cast
+
+import pytest
+
+from swarm.distributed.core.config import DistributedConfig, ScalingConfig, WorkerTypeConfig
+from swarm.distributed.services.scaling_service import ScalingService
+from swarm.distributed.services.simulator import (
+    AutoscalingSimulator,
+    SimulationReport,
+    VirtualClock,
+    arrivals_from_events,
+    constant,
+    parse_distribution,
+)
+from swarm.types import RedisBytes
+from tests.fakes.fake_redis import FakeRedisClient
+
+# 120 jobs within two minutes after a quiet start
+_BURST = [float(i) for i in range(0, 120)]
+
+
+async def _run(max_scale_up_step: int) -> tuple[AutoscalingSimulator, SimulationReport]:
+    config = DistributedConfig()
+    config.worker_types = {
+        "browser": WorkerTypeConfig(
+            name="browser",
+            job_queue="browser:jobs",
+            scaling=ScalingConfig(
+                min_workers=1,
+                max_workers=20,
+                scale_up_threshold=1,
+                scale_down_threshold=0,
+                cooldown_seconds=60,
+                max_scale_up_step=max_scale_up_step,
+                max_scale_down_step=20,
+                scale_down_stabilization_seconds=60,
+            ),
+        )
+    }
+    clock = VirtualClock()
+    service = ScalingService(cast(RedisBytes, FakeRedisClient()), config, clock=clock)
+    simulator = AutoscalingSimulator(
+        service,
+        "browser",
+        _BURST,
+        service_time=constant(10.0),
+        cold_start=constant(45.0),
+        initial_workers=1,
+        clock=clock,
+    )
+    return simulator, await simulator.run()
+
+
+@pytest.mark.asyncio
+async def test_simulator_reports_waits_cost_and_actions() -> None:
+    simulator, report = await _run(max_scale_up_step=10)
+
+    assert report.jobs == report.completed == 120
+    assert report.scale_actions >= 2
+    # Scaled back down to the minimum during the tail
+    assert len(simulator.workers) == 1
+    assert report.wait_p50 <= report.wait_p95 <= report.wait_max
+
+
+@pytest.mark.asyncio
+async def test_simulator_makes_policy_changes_measurable() -> None:
+    _, one_at_a_time = await _run(max_scale_up_step=1)
+    _, proportional = await _run(max_scale_up_step=10)
+
+    assert proportional.wait_p95 < one_at_a_time.wait_p95
+    assert proportional.peak_workers > one_at_a_time.peak_workers
+
+
+def test_trace_and_distribution_parsing() -> None:
+    lines = [
+        '{"type": "task-received", "timestamp": 12.5, "queue": "browser"}',
+        '{"type": "task-succeeded", "timestamp": 13.0, "queue": "browser"}',
+        '{"type": "task-received", "timestamp": 11.0, "queue": "llm"}',
+        "not json",
+    ]
+    assert arrivals_from_events(lines, queue="browser") == [12.5]
+
+    assert parse_distribution("7")(None) == 7.0  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        parse_distribution("gamma:3")
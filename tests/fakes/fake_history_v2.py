@@ -48,17 +48,25 @@ class FakeHistoryBackendV2:
         await asyncio.sleep(0.001)  # Simulate async operation
         self._store[channel][persona].append(turn)
 
-    async def recent(self, channel: int, persona: str) -> list[Turn]:
+    async def recent(
+        self,
+        channel: int,
+        persona: str,
+        limit: int | None = None,
+        max_tokens: int | None = None,
+    ) -> list[Turn]:
         """Return buffered turns for channel/persona (oldest first)."""
-        self._record_call("recent", channel, persona)
+        self._record_call("recent", channel, persona, limit=limit, max_tokens=max_tokens)
 
         if self.should_fail:
             raise RuntimeError(self.fail_message)
 
         await asyncio.sleep(0.001)
-        buf = self._store[channel][persona]
+        buf = list(self._store[channel][persona])
         # Return oldest first like the real implementation
-        return list(buf)
+        if limit is not None:
+            return buf[-limit:] if limit > 0 else []
+        return buf
 
     async def clear(self, channel: int, persona: str) -> None:
         """Clear history for channel/persona."""
@@ -0,0 +1,110 @@
+"""Tests for the two-tier :class:`CachedHistoryBackend`."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from swarm.history.cached import INVALIDATION_CHANNEL, CachedHistoryBackend
+from swarm.history.in_memory import MemoryBackend
+
+
+class CountingBackend(MemoryBackend):
+    """MemoryBackend that counts how often reads reach it."""
+
+    def __init__(self, max_turns: int) -> None:
+        super().__init__(max_turns)
+        self.reads = 0
+
+    async def recent(self, *args: Any, **kwargs: Any) -> Any:
+        self.reads += 1
+        return await super().recent(*args, **kwargs)
+
+    async def recent_entries(self, channel: int, persona: str) -> Any:
+        self.reads += 1
+        return await super().recent_entries(channel, persona)
+
+
+@pytest.mark.asyncio
+async def test_reads_are_served_locally_after_first_miss() -> None:
+    inner = CountingBackend(max_turns=3)
+    cached = CachedHistoryBackend(inner, max_turns=3)
+
+    await cached.record(1, "p", ("u0", "a0"))
+    assert await cached.recent(1, "p") == [("u0", "a0")]
+    for i in range(1, 4):
+        await cached.record(1, "p", (f"u{i}", f"a{i}"))
+
+    assert await cached.recent(1, "p") == [("u1", "a1"), ("u2", "a2"), ("u3", "a3")]
+    assert await cached.recent(1, "p", limit=1) == [("u3", "a3")]
+    assert inner.reads == 1
+    # Write-through: the inner backend saw every turn.
+    assert await inner.recent(1, "p") == await cached.recent(1, "p")
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_least_recently_used_channel() -> None:
+    inner = CountingBackend(max_turns=3)
+    cached = CachedHistoryBackend(inner, max_turns=3, max_channels=2)
+
+    await cached.recent(1, "p")
+    await cached.recent(2, "p")
+    await cached.recent(1, "p")  # touch 1 so 2 becomes the LRU entry
+    await cached.recent(3, "p")  # evicts channel 2
+    assert inner.reads == 3
+
+    await cached.recent(1, "p")
+    assert inner.reads == 3
+    await cached.recent(2, "p")
+    assert inner.reads == 4
+
+
+@pytest.mark.asyncio
+async def test_clear_drops_local_copy() -> None:
+    inner = CountingBackend(max_turns=3)
+    cached = CachedHistoryBackend(inner, max_turns=3)
+    await cached.record(1, "p", ("u", "a"))
+    await cached.recent(1, "p")
+
+    await cached.clear(1)
+    assert await cached.recent(1, "p") == []
+
+
+@pytest.mark.asyncio
+async def test_remote_invalidation_and_publish() -> None:
+    redis = MagicMock()
+    redis.publish = AsyncMock()
+    inner = CountingBackend(max_turns=3)
+    cached = CachedHistoryBackend(inner, max_turns=3, redis=redis)
+    cached._listener = MagicMock()  # pretend the subscription task is running
+    cached._listening = True
+
+    await cached.record(1, "p", ("u", "a"))
+    redis.publish.assert_awaited_once_with(INVALIDATION_CHANNEL, f"{cached._origin}|1|p")
+
+    await cached.recent(1, "p")
+    await cached.recent(1, "p")
+    assert inner.reads == 1
+
+    # Our own echo is ignored, a peer's message drops the entry.
+    cached._handle_invalidation(f"{cached._origin}|1|p")
+    await cached.recent(1, "p")
+    assert inner.reads == 1
+    cached._handle_invalidation(b"peer|1|*")
+    await cached.recent(1, "p")
+    assert inner.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_reads_bypass_cache_while_not_subscribed() -> None:
+    redis = MagicMock()
+    redis.publish = AsyncMock()
+    inner = CountingBackend(max_turns=3)
+    cached = CachedHistoryBackend(inner, max_turns=3, redis=redis)
+    cached._listener = MagicMock()
+
+    await cached.recent(1, "p")
+    await cached.recent(1, "p")
+    assert inner.reads == 2
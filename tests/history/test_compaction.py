@@ -0,0 +1,131 @@
+"""Tests for rolling history summarization."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+
+from swarm.history.compaction import (
+    SUMMARY_PREFIX,
+    SUMMARY_REQUEST,
+    CompactingHistoryBackend,
+    compact_history,
+    is_summary,
+    local_scheduler,
+)
+from swarm.history.in_memory import MemoryBackend
+
+
+class StubProvider:
+    name = "stub"
+
+    def __init__(self, reply: str = "they talked") -> None:
+        self.reply = reply
+        self.calls: list[dict[str, Any]] = []
+
+    async def generate(
+        self, *, messages: list[dict[str, str]], stream: bool = False, **options: Any
+    ) -> str | AsyncIterator[str]:
+        self.calls.append({"messages": messages, **options})
+        return self.reply
+
+
+async def _fill(backend: MemoryBackend, n: int) -> None:
+    for i in range(n):
+        await backend.record(1, "p", (f"u{i}", f"a{i}"))
+
+
+@pytest.mark.asyncio
+async def test_compact_history_folds_old_turns_into_summary() -> None:
+    backend = MemoryBackend(max_turns=10)
+    await _fill(backend, 5)
+    provider = StubProvider()
+
+    assert await compact_history(backend, provider, 1, "p", keep_recent=2) is True
+
+    turns = await backend.recent(1, "p")
+    assert turns[0] == (SUMMARY_REQUEST, SUMMARY_PREFIX + "they talked")
+    assert turns[1:] == [("u3", "a3"), ("u4", "a4")]
+    transcript = provider.calls[0]["messages"][0]["content"]
+    assert "User: u0" in transcript and "u3" not in transcript
+
+    # A second pass absorbs the previous summary instead of stacking summaries.
+    await _fill(backend, 2)
+    assert await compact_history(backend, StubProvider("more"), 1, "p", keep_recent=2) is True
+    turns = await backend.recent(1, "p")
+    assert sum(is_summary(t) for t in turns) == 1
+    assert turns[0][1].endswith("more")
+
+
+@pytest.mark.asyncio
+async def test_compact_history_noop_when_nothing_to_fold() -> None:
+    backend = MemoryBackend(max_turns=10)
+    await _fill(backend, 2)
+    provider = StubProvider()
+
+    assert await compact_history(backend, provider, 1, "p", keep_recent=2) is False
+    assert provider.calls == []
+
+
+@pytest.mark.asyncio
+async def test_compact_rejects_stale_head() -> None:
+    backend = MemoryBackend(max_turns=3)
+    await _fill(backend, 3)
+    folded = [("u0", "a0"), ("u1", "a1")]
+    await backend.record(1, "p", ("u3", "a3"))  # trims u0 concurrently
+
+    assert await backend.compact(1, "p", folded, ("s", "s")) is False
+    assert await backend.recent(1, "p") == [("u1", "a1"), ("u2", "a2"), ("u3", "a3")]
+
+
+@pytest.mark.asyncio
+async def test_compacting_backend_schedules_once_per_cooldown() -> None:
+    scheduled: list[tuple[int, str]] = []
+    backend = CompactingHistoryBackend(
+        MemoryBackend(max_turns=10),
+        threshold=3,
+        scheduler=lambda c, p: scheduled.append((c, p)),
+    )
+    for i in range(5):
+        await backend.record(1, "p", (f"u{i}", f"a{i}"))
+
+    assert scheduled == [(1, "p")]
+
+
+async def test_compacting_backend_counts_from_record() -> None:
+    scheduled: list[tuple[int, str]] = []
+    memory = MemoryBackend(max_turns=10)
+    backend = CompactingHistoryBackend(
+        memory, threshold=2, scheduler=lambda c, p: scheduled.append((c, p))
+    )
+
+    async def no_reads(channel: int, persona: str) -> Any:
+        raise AssertionError("turns should be counted from record()")
+
+    memory.recent_entries = no_reads  # type: ignore[method-assign]
+    assert await backend.record(1, "p", ("u0", "a0")) == 1
+    assert await backend.record(1, "p", ("u1", "a1")) == 2
+
+    assert scheduled == [(1, "p")]
+
+
+@pytest.mark.asyncio
+async def test_local_scheduler_compacts_in_background() -> None:
+    memory = MemoryBackend(max_turns=10)
+    provider = StubProvider()
+    backend = CompactingHistoryBackend(
+        memory,
+        threshold=4,
+        scheduler=local_scheduler(memory, lambda: (provider, None), keep_recent=1),
+    )
+    await _fill(memory, 3)
+    await backend.record(1, "p", ("u3", "a3"))
+    await asyncio.sleep(0)  # let the background task run
+    await asyncio.sleep(0)
+
+    turns = await backend.recent(1, "p")
+    assert len(turns) == 2
+    assert is_summary(turns[0])
@@ -0,0 +1,195 @@
+"""Unit tests for :mod:`swarm.history.redis_backend` that need no Redis server."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from swarm.history.backends import turn_tokens
+from swarm.history.in_memory import MemoryBackend
+from swarm.history.redis_backend import (
+    RedisBackend,
+    _decode_entry,
+    _decode_turn,
+    _encode_turn,
+    _entry_tokens,
+)
+
+
+@pytest.mark.parametrize(
+    "turn",
+    [("hello", "world"), ("", ""), ("12:34", "a:b:c"), ("ünïcödé 🎉", "x" * 500)],
+)
+def test_turn_codec_round_trip(turn: tuple[str, str]) -> None:
+    assert _decode_turn(_encode_turn(turn)) == turn
+
+
+def test_decode_accepts_legacy_json() -> None:
+    assert _decode_turn(json.dumps(["hi", "there"])) == ("hi", "there")
+
+
+def _backend_with_mock_client(max_turns: int = 5, ttl: int = 60) -> tuple[RedisBackend, Any]:
+    backend = RedisBackend("redis://localhost:6379/0", max_turns=max_turns, ttl_seconds=ttl)
+    client = MagicMock()
+    client.lrange = AsyncMock(return_value=[_encode_turn(("a", "b")), json.dumps(["c", "d"])])
+    backend._r = client
+    backend._record_script = AsyncMock(return_value=1)
+    return backend, client
+
+
+@pytest.mark.asyncio
+async def test_record_is_single_script_call() -> None:
+    backend, client = _backend_with_mock_client()
+    assert await backend.record(1, "Default", ("q", "a")) == 1
+
+    backend._record_script.assert_awaited_once()
+    call = backend._record_script.await_args.kwargs
+    assert call["keys"] == ["history:1:Default", "history:index:1", "history:channels"]
+    assert call["args"][:5] == [_encode_turn(("q", "a")), 5, 60, "Default", 1]
+    client.rpush.assert_not_called()
+    client.ltrim.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_legacy_encoding_writes_json_for_older_replicas() -> None:
+    backend, client = _backend_with_mock_client()
+    backend._legacy_encoding = True
+
+    await backend.record(1, "Default", ("q", "a"))
+
+    stored = backend._record_script.await_args.kwargs["args"][0]
+    assert json.loads(stored) == ["q", "a"]  # what releases before the new format read
+    assert _decode_turn(stored) == ("q", "a")
+
+
+@pytest.mark.asyncio
+async def test_recent_bounded_range() -> None:
+    backend, client = _backend_with_mock_client(max_turns=5)
+
+    assert await backend.recent(1, "Default", limit=2) == [("a", "b"), ("c", "d")]
+    client.lrange.assert_awaited_once_with("history:1:Default", -2, -1)
+
+    client.lrange.reset_mock()
+    await backend.recent(1, "Default", limit=50)
+    client.lrange.assert_awaited_once_with("history:1:Default", -5, -1)
+
+    client.lrange.reset_mock()
+    assert await backend.recent(1, "Default", limit=0) == []
+    client.lrange.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_limit() -> None:
+    backend = MemoryBackend(max_turns=3)
+    for i in range(4):
+        await backend.record(1, "p", (f"u{i}", f"a{i}"))
+
+    assert await backend.recent(1, "p") == [("u1", "a1"), ("u2", "a2"), ("u3", "a3")]
+    assert await backend.recent(1, "p", limit=1) == [("u3", "a3")]
+
+
+def test_stored_token_count_is_read_without_decoding() -> None:
+    raw = _encode_turn(("hello", "world"), tokens=42)
+    assert _entry_tokens(raw) == 42
+    assert _decode_entry(raw) == (("hello", "world"), 42)
+    # Entries written before counts were stored are measured on read.
+    assert _decode_entry("5:helloworld") == (("hello", "world"), turn_tokens(("hello", "world")))
+
+
+@pytest.mark.asyncio
+async def test_recent_applies_token_budget_to_stored_counts() -> None:
+    backend, client = _backend_with_mock_client(max_turns=5)
+    client.lrange = AsyncMock(
+        return_value=[
+            _encode_turn(("old", "old"), tokens=10),
+            _encode_turn(("huge", "paste"), tokens=1000),
+            _encode_turn(("mid", "mid"), tokens=30),
+            _encode_turn(("new", "new"), tokens=20),
+        ]
+    )
+
+    assert await backend.recent(1, "p", max_tokens=60) == [("mid", "mid"), ("new", "new")]
+    assert await backend.recent(1, "p", max_tokens=10) == []
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_token_budget() -> None:
+    backend = MemoryBackend(max_turns=5)
+    await backend.record(1, "p", ("a" * 400, "b" * 400))  # ~200 tokens
+    await backend.record(1, "p", ("hi", "there"))
+
+    assert await backend.recent(1, "p", max_tokens=50) == [("hi", "there")]
+    assert len(await backend.recent(1, "p", max_tokens=1000)) == 2
+
+
+def _mock_pipeline(client: Any) -> MagicMock:
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[])
+    client.pipeline = MagicMock(return_value=pipe)
+    return pipe
+
+
+@pytest.mark.asyncio
+async def test_clear_channel_uses_index_in_one_pipeline() -> None:
+    backend, client = _backend_with_mock_client()
+    client.smembers = AsyncMock(return_value={"Default", "Pirate"})
+    pipe = _mock_pipeline(client)
+
+    await backend.clear(7)
+
+    unlinked = set(pipe.unlink.call_args.args)
+    assert unlinked == {"history:7:Default", "history:7:Pirate", "history:index:7"}
+    pipe.zrem.assert_called_once_with("history:channels", 7)
+    pipe.execute.assert_awaited_once()
+    client.scan.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_backfill_index_runs_once() -> None:
+    backend, client = _backend_with_mock_client()
+    client.set = AsyncMock(side_effect=[True, None])
+    client.scan = AsyncMock(
+        side_effect=[
+            (42, ["history:7:Legacy", "history:index:7", "history:channels"]),
+            (0, ["history:8:Default", "history:index:backfilled"]),
+        ]
+    )
+    pipe = _mock_pipeline(client)
+
+    assert await backend.backfill_index() == 2
+    assert [c.args for c in pipe.sadd.call_args_list] == [
+        ("history:index:7", "Legacy"),
+        ("history:index:8", "Default"),
+    ]
+    assert pipe.execute.await_count == 2
+
+    # The marker is taken: later runs skip the keyspace walk
+    assert await backend.backfill_index() == 0
+    assert client.scan.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_purge_idle_skips_channels_written_meanwhile() -> None:
+    backend, client = _backend_with_mock_client()
+    client.zrangebyscore = AsyncMock(side_effect=[["1", "2"], ["3"]])
+    pipe = _mock_pipeline(client)
+    pipe.execute = AsyncMock(
+        side_effect=[
+            # channel 2 recorded a turn after the range query
+            [{"Default"}, 100.0, {"Pirate"}, 9e12],
+            [],
+            [set(), 100.0],
+            [],
+        ]
+    )
+
+    assert await backend.purge_idle(3600, batch=2) == 2
+    assert client.zrangebyscore.await_count == 2
+    assert [c.args for c in pipe.unlink.call_args_list] == [
+        ("history:1:Default", "history:index:1"),
+        ("history:index:3",),
+    ]
+    assert [c.args[1] for c in pipe.publish.call_args_list] == ["purge|1|*", "purge|3|*"]
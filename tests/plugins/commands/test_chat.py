@@ -79,10 +79,9 @@ async def test_chat_simple_reply(
     mock_interaction.response = MagicMock()
     mock_interaction.response.defer = AsyncMock()
     mock_interaction.followup = MagicMock(send=AsyncMock())
-    # Ensure defer is awaitable
-    mock_interaction.response = MagicMock()
-    mock_interaction.response.defer = AsyncMock()
-    mock_interaction.followup = MagicMock(send=AsyncMock())
+    # The reply is posted as a placeholder follow-up and then edited in place.
+    reply_message = MagicMock(edit=AsyncMock())
+    mock_interaction.followup = MagicMock(send=AsyncMock(return_value=reply_message))
     mock_settings.llm_provider = "mock"
     mock_provider = MagicMock()
     mock_provider.generate = AsyncMock(return_value="Hello!")
@@ -90,5 +89,136 @@ async def test_chat_simple_reply(
     await cast(Any, chat_cog.chat.callback)(
         chat_cog, mock_interaction, prompt="Hello", clear=False, personality=None
     )
-    mock_safe_send.assert_called()
+    mock_interaction.followup.send.assert_awaited_once()
+    assert "Hello!" in reply_message.edit.await_args.kwargs["content"]
+    mock_safe_send.assert_not_called()
     cast(MagicMock, chat_cog._history.record).assert_awaited_once()
+
+
+async def _failing_stream(*fragments: str, error: Exception) -> Any:
+    for fragment in fragments:
+        yield fragment
+    raise error
+
+
+@pytest.mark.asyncio
+@patch("swarm.plugins.commands.chat.safe_send")
+@patch("swarm.plugins.commands.chat._providers.get")
+@patch("swarm.plugins.commands.chat.settings", autospec=True)
+async def test_chat_stream_error_replaces_placeholder(
+    mock_settings: MagicMock,
+    mock_get: MagicMock,
+    mock_safe_send: AsyncMock,
+    container_with_mocked_history: tuple[Container, MagicMock, MagicMock],
+) -> None:
+    """A provider error before any text turns the placeholder into the error."""
+    container, mock_bot, mock_history = container_with_mocked_history
+    chat_cog = container.chat_cog(discord_bot=mock_bot)
+    reply_message = MagicMock(edit=AsyncMock())
+    mock_interaction = _deferred_interaction(reply_message)
+    mock_interaction.channel_id = 1
+    mock_interaction.user.id = 123
+    mock_interaction.response.defer = AsyncMock()
+    mock_settings.llm_provider = "mock"
+    mock_provider = MagicMock()
+    mock_provider.generate = AsyncMock(return_value=_failing_stream(error=RuntimeError("boom")))
+    mock_get.return_value = mock_provider
+
+    await cast(Any, chat_cog.chat.callback)(
+        chat_cog, mock_interaction, prompt="Hello", clear=False, personality=None
+    )
+
+    reply_message.edit.assert_awaited_once()
+    content = reply_message.edit.await_args.kwargs["content"]
+    assert "error" in content and "[No response]" not in content
+    mock_safe_send.assert_not_called()
+    mock_history.record.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_progressive_reply_fail_swallows_discord_errors() -> None:
+    import discord
+
+    from swarm.frontends.discord import discord_interactions as di
+
+    response = MagicMock(status=500, reason="Server Error")
+    broken = MagicMock(edit=AsyncMock(side_effect=discord.HTTPException(response, "down")))
+    interaction = _deferred_interaction(broken)
+    reply = di.ProgressiveReply(interaction, min_interval=0.0)
+    await reply.start()
+    with pytest.raises(discord.HTTPException):
+        await reply.append("partial")
+
+    with patch.object(di, "safe_send", AsyncMock()) as mock_send:
+        await reply.fail("oops")  # does not raise
+    mock_send.assert_not_called()
+
+
+def _deferred_interaction(message: Any) -> MagicMock:
+    interaction = MagicMock()
+    interaction.followup = MagicMock(send=AsyncMock(return_value=message))
+    return interaction
+
+
+@pytest.mark.asyncio
+async def test_progressive_reply_rate_limits_edits_and_rolls_over(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from swarm.frontends.discord import discord_interactions as di
+
+    monkeypatch.setattr(di, "DISCORD_LIMIT", 30)
+    clock = [100.0]
+    monkeypatch.setattr(di.time, "monotonic", lambda: clock[0])
+
+    first, second = MagicMock(edit=AsyncMock()), MagicMock(edit=AsyncMock())
+    interaction = _deferred_interaction(first)
+    reply = di.ProgressiveReply(interaction, min_interval=1.0)
+    await reply.start()
+    interaction.followup.send.return_value = second
+
+    await reply.append("abc")  # first edit goes out immediately
+    await reply.append("def")  # within the interval: buffered
+    assert first.edit.await_count == 1
+    clock[0] += 1.5
+    await reply.append("g")
+    assert first.edit.await_args.kwargs["content"] == "```text\nabcdefg\n```"
+
+    # 30 chars minus fences leaves 18 per message: the rest spills into a new one.
+    await reply.append("x" * 15)
+    assert first.edit.await_args.kwargs["content"] == "```text\nabcdefg" + "x" * 11 + "\n```"
+    assert await reply.finish() == "abcdefg" + "x" * 15
+    assert interaction.followup.send.await_args.args[0] == "```text\nxxxx\n```"
+
+
+@pytest.mark.asyncio
+async def test_progressive_reply_without_message_handle_uses_safe_send() -> None:
+    from swarm.frontends.discord import discord_interactions as di
+
+    interaction = _deferred_interaction(None)
+    reply = di.ProgressiveReply(interaction, min_interval=0.0)
+    with patch.object(di, "safe_send", AsyncMock()) as mock_send:
+        await reply.start()
+        await reply.append("Hi")
+        await reply.append(" there")
+        mock_send.assert_not_called()
+        assert await reply.finish() == "Hi there"
+    mock_send.assert_awaited_once_with(interaction, "```text\nHi there\n```")
+
+
+@pytest.mark.asyncio
+async def test_progressive_reply_falls_back_when_placeholder_is_rejected() -> None:
+    import discord
+
+    from swarm.frontends.discord import discord_interactions as di
+
+    response = MagicMock(status=403, reason="Forbidden")
+    interaction = MagicMock()
+    interaction.followup = MagicMock(
+        send=AsyncMock(side_effect=discord.HTTPException(response, "Missing Access"))
+    )
+    reply = di.ProgressiveReply(interaction, min_interval=0.0)
+    with patch.object(di, "safe_send", AsyncMock()) as mock_send:
+        await reply.start()  # does not raise
+        await reply.append("Hi")
+        assert await reply.finish() == "Hi"
+    mock_send.assert_awaited_once_with(interaction, "```text\nHi\n```")
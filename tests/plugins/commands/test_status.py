@@ -149,3 +149,27 @@ async def test_status_no_shard(
     embed = mock_safe_send.await_args_list[0].kwargs["embed"]
     # Shard info should be em dash
     assert "Shard —" in embed.fields[-1].value
+
+
+@pytest.mark.asyncio
+async def test_status_shows_llm_usage_against_quota(
+    dummy_discord_bot: MagicMock,
+    interaction: MagicMock,
+    container_with_mocked_metrics: tuple[Container, MagicMock],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Today's LLM consumption is listed per provider, with the daily quota."""
+    from swarm.plugins.commands import status as status_mod
+
+    container, mock_metrics = container_with_mocked_metrics
+    mock_metrics.get_llm_usage.return_value = {
+        "gemini": {"requests": 120, "input_tokens": 45100, "output_tokens": 800, "cost_usd": 0.42}
+    }
+    monkeypatch.setattr(status_mod.settings, "llm_daily_request_quota", {"gemini": 500})
+    mock_safe_send = AsyncMock()
+
+    cog = container.status_cog(discord_bot=dummy_discord_bot, safe_send_func=mock_safe_send)
+    await cast(Any, cog.status.callback)(cog, interaction)
+
+    fields = {f.name: f.value for f in mock_safe_send.await_args_list[0].kwargs["embed"].fields}
+    assert fields["LLM (today, UTC)"] == "🤖 gemini: 120/500 req │ 45.1k in / 800 out │ $0.42"
@@ -1,13 +1,12 @@
-"""Tests for the Celery autoscaler using Flower API."""
+"""Tests for the Celery autoscaler reading queue depths from the broker."""
 
-import asyncio
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
-import aiohttp
 import pytest
 
 from scripts.celery_autoscaler import CeleryAutoscaler
+from swarm.distributed.core.config import ScalingConfig
 from swarm.distributed.services.scaling_service import ScalingDecision
 
 
@@ -23,10 +22,14 @@ class TestCeleryAutoscaler:
         browser_config = MagicMock()
         browser_config.enabled = True
         browser_config.job_queue = "browser:jobs"
-        browser_config.scaling.min_workers = 1
-        browser_config.scaling.max_workers = 5
-        browser_config.scaling.scale_up_threshold = 3
-        browser_config.scaling.scale_down_threshold = 0
+        browser_config.scaling = ScalingConfig(
+            min_workers=1,
+            max_workers=5,
+            scale_up_threshold=3,
+            scale_down_threshold=0,
+            # 10 s jobs drained within 20 s: two queued jobs per worker
+            target_drain_seconds=20,
+        )
 
         config.worker_types = {"browser": browser_config}
         config.get_enabled_worker_types.return_value = ["browser"]
@@ -42,62 +45,33 @@ class TestCeleryAutoscaler:
         return backend
 
     @pytest.fixture
-    def mock_session(self) -> MagicMock:
-        """Create mock aiohttp session."""
-        session = MagicMock()
-
-        # Mock queue stats response
-        queue_response = AsyncMock()
-        queue_response.status = 200
-        queue_response.json.return_value = {
-            "active_queues": [
-                {
-                    "name": "browser",
-                    "messages": 5,
-                    "messages_ready": 4,
-                    "messages_unacknowledged": 1,
-                }
-            ]
-        }
-
-        # Mock worker stats response
-        worker_response = AsyncMock()
-        worker_response.status = 200
-        worker_response.json.return_value = {
-            "worker1": {"active_queues": [{"name": "browser"}]},
-            "worker2": {"active_queues": [{"name": "browser"}]},
-        }
-
-        # Configure get to return appropriate response
-        async def mock_get(url: str, **kwargs: Any) -> Any:
-            if "queues/length" in url:
-                return queue_response
-            elif "workers" in url:
-                return worker_response
-            return AsyncMock(status=404)
-
-        session.get = mock_get
-        return session
+    def mock_reader(self) -> MagicMock:
+        """Create mock broker queue reader."""
+        reader = MagicMock()
+        # 4 ready + 1 unacked
+        reader.read = AsyncMock(
+            return_value={
+                "browser": {"depth": 5, "messages_ready": 4, "messages_unacknowledged": 1}
+            }
+        )
+        return reader
 
     @pytest.mark.asyncio
     async def test_happy_path_scale_up(
         self,
         mock_config: MagicMock,
         mock_backend: AsyncMock,
-        mock_session: MagicMock,
+        mock_reader: MagicMock,
     ) -> None:
         """Test autoscaler scales up when queue depth exceeds threshold."""
-        autoscaler = CeleryAutoscaler(
-            flower_url="http://localhost:5555",
-            orchestrator="docker-api",
-        )
+        autoscaler = CeleryAutoscaler(orchestrator="docker-api")
 
         # Inject mocks
         autoscaler.config = mock_config
         autoscaler.backend = mock_backend
-        autoscaler._session = mock_session
+        autoscaler.queue_reader = mock_reader
 
-        # Queue has 5 messages (4 ready + 1 unacked), threshold is 3
+        # Queue has 5 messages (4 ready + 1 unacked) -> 3 workers needed
         # Current workers: 2, should scale up to 3
         await autoscaler.check_and_scale()
 
@@ -109,7 +83,7 @@ class TestCeleryAutoscaler:
         self,
         mock_config: MagicMock,
         mock_backend: AsyncMock,
-        mock_session: MagicMock,
+        mock_reader: MagicMock,
     ) -> None:
         """Test autoscaler scales down when queue is empty."""
         autoscaler = CeleryAutoscaler()
@@ -117,83 +91,46 @@ class TestCeleryAutoscaler:
         # Inject mocks
         autoscaler.config = mock_config
         autoscaler.backend = mock_backend
-        autoscaler._session = mock_session
-
-        # Override the mock session to return empty queue
-        empty_response = AsyncMock()
-        empty_response.status = 200
-        empty_response.json.return_value = {
-            "active_queues": [
-                {
-                    "name": "browser",
-                    "messages": 0,
-                    "messages_ready": 0,
-                    "messages_unacknowledged": 0,
-                }
-            ]
+        autoscaler.queue_reader = mock_reader
+        mock_reader.read.return_value = {
+            "browser": {"depth": 0, "messages_ready": 0, "messages_unacknowledged": 0}
         }
 
-        async def mock_get_empty(url: str, **kwargs: Any) -> Any:
-            if "queues/length" in url:
-                return empty_response
-            return AsyncMock(status=404)
-
-        mock_session.get = mock_get_empty
-
         # Current workers: 2, should scale down to 1 (min)
         await autoscaler.check_and_scale()
 
         mock_backend.scale_to.assert_called_once_with("browser", 1)
 
     @pytest.mark.asyncio
-    async def test_flower_api_timeout(
+    async def test_broker_unreachable(
         self,
         mock_config: MagicMock,
         mock_backend: AsyncMock,
+        mock_reader: MagicMock,
     ) -> None:
-        """Test autoscaler handles Flower API timeouts gracefully."""
+        """Test autoscaler handles an unreadable broker gracefully."""
         autoscaler = CeleryAutoscaler()
 
-        # Create session that times out
-        mock_session = MagicMock()
-
-        async def timeout_get(*args: Any, **kwargs: Any) -> None:
-            raise TimeoutError()
-
-        mock_session.get = timeout_get
+        # The reader reports no data when Redis cannot be reached
+        mock_reader.read.return_value = {}
 
         # Inject mocks
         autoscaler.config = mock_config
         autoscaler.backend = mock_backend
-        autoscaler._session = mock_session
+        autoscaler.queue_reader = mock_reader
 
-        # Should not raise, just log error
+        # Should not raise
         await autoscaler.check_and_scale()
 
         # Should scale to min_workers even without queue data (to support bootstrapping)
         mock_backend.scale_to.assert_called_once_with("browser", 1)
 
-    @pytest.mark.asyncio
-    async def test_auth_configuration(self) -> None:
-        """Test autoscaler configures basic auth when credentials provided."""
-        autoscaler = CeleryAutoscaler(
-            flower_username="admin",
-            flower_password="secret",
-        )
-
-        with patch("aiohttp.ClientSession"):
-            await autoscaler.setup()
-
-        assert autoscaler._auth is not None
-        assert autoscaler._auth.login == "admin"
-        assert autoscaler._auth.password == "secret"
-
     def test_make_scaling_decision_scale_up(self, mock_config: MagicMock) -> None:
         """Test scaling decision logic for scale up."""
         autoscaler = CeleryAutoscaler()
         browser_config = mock_config.worker_types["browser"]
 
-        # Queue depth 5, current workers 2, threshold 3
+        # Queue depth 5 needs 3 workers, 2 running
         decision, target = autoscaler.make_scaling_decision("browser", 5, 2, browser_config)
 
         assert decision == ScalingDecision.SCALE_UP
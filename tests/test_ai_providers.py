@@ -6,10 +6,14 @@ working as other parts of the code-base evolve.
 
 from __future__ import annotations
 
+import asyncio
 import sys
+import threading
+import time
 import types
 from collections.abc import AsyncIterator, Iterator
 from typing import Any, cast
+from unittest.mock import patch
 
 import pytest
 
@@ -73,3 +77,531 @@ async def test_stub_provider_runtime_check_and_helpers() -> None:
     assert hasattr(stream_obj, "__anext__")  # narrow type for mypy
     first_chunk = await cast(AsyncIterator[str], stream_obj).__anext__()
     assert first_chunk == "hi"
+
+
+def _stub_genai(monkeypatch: pytest.MonkeyPatch, stream_fn: Any) -> None:
+    """Install a minimal ``google.genai`` whose client streams via *stream_fn*."""
+    client = types.SimpleNamespace(models=types.SimpleNamespace(generate_content_stream=stream_fn))
+    monkeypatch.setitem(
+        sys.modules,
+        "google",
+        types.SimpleNamespace(genai=types.SimpleNamespace(Client=lambda api_key: client)),
+    )
+    monkeypatch.setitem(
+        sys.modules,
+        "google.genai",
+        types.SimpleNamespace(
+            types=types.SimpleNamespace(
+                Content=lambda **kwargs: None,
+                Part=types.SimpleNamespace(from_text=lambda text: None),
+                GenerateContentConfig=lambda **kwargs: None,
+            )
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_gemini_stream_yields_before_generation_finishes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from swarm.ai.providers.gemini import _GeminiProvider
+
+    first_seen = threading.Event()
+    closed = threading.Event()
+
+    def _upstream(**kwargs: Any) -> Iterator[Any]:
+        try:
+            yield types.SimpleNamespace(text="first")
+            # Blocks until the consumer has the first fragment in hand.
+            assert first_seen.wait(5)
+            yield types.SimpleNamespace(text="second")
+            yield types.SimpleNamespace(text="never consumed")
+        finally:
+            closed.set()
+
+    _stub_genai(monkeypatch, _upstream)
+    stream = await _GeminiProvider().generate(
+        messages=[{"role": "user", "content": "hi"}], stream=True
+    )
+    agen = cast(Any, stream)
+
+    assert await agen.__anext__() == "first"
+    first_seen.set()
+    assert await agen.__anext__() == "second"
+
+    # Closing early stops the worker and closes the upstream SDK stream.
+    await agen.aclose()
+    assert await asyncio.to_thread(closed.wait, 5)
+
+
+@pytest.mark.asyncio
+async def test_timed_stream_records_time_to_first_token() -> None:
+    from swarm.core.telemetry import LLM_LATENCY, LLM_TTFT
+
+    async def _fragments() -> AsyncIterator[str]:
+        yield "a"
+        yield "b"
+
+    ttft_before = LLM_TTFT.labels("ttft-test")._sum.get()
+    latency_before = LLM_LATENCY.labels("ttft-test")._sum.get()
+    out = [f async for f in registry._timed_stream(_fragments(), "ttft-test", 0.0)]
+
+    assert out == ["a", "b"]
+    assert LLM_TTFT.labels("ttft-test")._sum.get() > ttft_before
+    assert LLM_LATENCY.labels("ttft-test")._sum.get() > latency_before
+
+
+def _counting_call(reply: str = "cached answer") -> tuple[Any, list[dict[str, Any]]]:
+    calls: list[dict[str, Any]] = []
+
+    async def _call(*, messages: Any, stream: bool = False, **options: Any) -> Any:
+        calls.append({"messages": messages, "stream": stream, **options})
+        if stream:
+
+            async def _aiter() -> AsyncIterator[str]:
+                yield reply[:6]
+                yield reply[6:]
+
+            return _aiter()
+        return reply
+
+    return _call, calls
+
+
+@pytest.mark.asyncio
+async def test_response_cache_serves_normalized_prompt(monkeypatch: pytest.MonkeyPatch) -> None:
+    from swarm.ai.providers import _cache
+
+    cache = _cache.ResponseCache(max_entries=8, ttl_seconds=60)
+    monkeypatch.setattr(_cache, "default_cache", lambda: cache)
+    call, calls = _counting_call()
+    generate = _cache.cached(call, "stub")
+
+    first = await generate(messages=[{"role": "user", "content": "What is X?"}], system_prompt="s")
+    again = await generate(messages=[{"role": "user", "content": "  what is x "}], system_prompt="s")
+    other = await generate(messages=[{"role": "user", "content": "what is x"}], system_prompt="t")
+
+    assert first == again == other == "cached answer"
+    assert len(calls) == 2  # a different system prompt is a different key
+
+
+@pytest.mark.asyncio
+async def test_response_cache_stores_streams_and_replays_them(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from swarm.ai.providers import _cache
+
+    cache = _cache.ResponseCache(max_entries=8, ttl_seconds=60)
+    monkeypatch.setattr(_cache, "default_cache", lambda: cache)
+    call, calls = _counting_call()
+    generate = _cache.cached(call, "stub")
+    messages = [{"role": "user", "content": "hi"}]
+
+    # An abandoned stream is not cached.
+    partial = await generate(messages=messages, stream=True)
+    assert await partial.__anext__() == "cached"
+    await partial.aclose()
+
+    full = await generate(messages=messages, stream=True)
+    assert "".join([f async for f in full]) == "cached answer"
+
+    replay = await generate(messages=messages, stream=True)
+    assert [f async for f in replay] == ["cached answer"]
+    assert await generate(messages=messages) == "cached answer"
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_response_cache_falls_back_to_redis_tier() -> None:
+    from unittest.mock import AsyncMock, MagicMock
+
+    from swarm.ai.providers import _cache
+
+    stored: dict[str, str] = {}
+    pipe = MagicMock()
+    pipe.set = MagicMock(side_effect=lambda k, v, ex: stored.__setitem__(k, v))
+    pipe.execute = AsyncMock()
+    redis = MagicMock()
+    redis.pipeline = MagicMock(return_value=pipe)
+    redis.mget = AsyncMock(side_effect=lambda keys: [stored.get(k) for k in keys])
+
+    keys = _cache.cache_keys("stub", [{"role": "user", "content": "hi"}], {})
+    await _cache.ResponseCache(8, 60, redis=redis).put(keys, ("hello", 1.5))
+
+    # A second replica with a cold local tier reads the shared entry.
+    assert await _cache.ResponseCache(8, 60, redis=redis).get(keys) == ("hello", 1.5)
+    pipe.set.assert_any_call(keys[0], '["hello", 1.5]', ex=60)
+
+
+@pytest.mark.asyncio
+async def test_singleflight_shares_one_upstream_call() -> None:
+    from swarm.ai.providers import _singleflight
+
+    release = asyncio.Event()
+    calls = 0
+
+    async def _call(*, messages: Any, stream: bool = False, **options: Any) -> Any:
+        nonlocal calls
+        calls += 1
+
+        async def _aiter() -> AsyncIterator[str]:
+            yield "Hel"
+            await release.wait()
+            yield "lo"
+
+        return _aiter() if stream else "Hello"
+
+    generate = _singleflight.coalesced(_call, "stub")
+    messages = [{"role": "user", "content": "hi"}]
+
+    leader = await generate(messages=messages, stream=True)
+    assert await leader.__anext__() == "Hel"
+    # Late joiners replay what already arrived, then follow along.
+    text_waiter = asyncio.create_task(generate(messages=messages))
+    follower = await generate(messages=messages, stream=True)
+    assert await follower.__anext__() == "Hel"
+    release.set()
+
+    assert [f async for f in leader] == ["lo"]
+    assert [f async for f in follower] == ["lo"]
+    assert await text_waiter == "Hello"
+    assert calls == 1
+
+    # Once the flight has landed a new call goes upstream again.
+    assert await generate(messages=messages) == "Hello"
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_singleflight_propagates_errors_and_cancels_when_abandoned() -> None:
+    from swarm.ai.providers import _singleflight
+    from swarm.core.exceptions import ModelOverloaded
+
+    gate = asyncio.Event()
+    upstream_cancelled = asyncio.Event()
+
+    async def _failing(*, messages: Any, stream: bool = False, **options: Any) -> Any:
+        await gate.wait()
+        raise ModelOverloaded("busy")
+
+    generate = _singleflight.coalesced(_failing, "stub")
+    messages = [{"role": "user", "content": "hi"}]
+    waiters = [asyncio.create_task(generate(messages=messages)) for _ in range(3)]
+    await asyncio.sleep(0)
+    gate.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(r, ModelOverloaded) for r in results)
+
+    async def _slow(*, messages: Any, stream: bool = False, **options: Any) -> Any:
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            upstream_cancelled.set()
+            raise
+
+    generate = _singleflight.coalesced(_slow, "stub")
+    waiters = [asyncio.create_task(generate(messages=messages)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    waiters[0].cancel()
+    await asyncio.sleep(0.01)
+    assert not upstream_cancelled.is_set()
+    waiters[1].cancel()
+    await asyncio.wait_for(upstream_cancelled.wait(), 1)
+
+
+@pytest.mark.asyncio
+async def test_limiter_backs_off_on_overload_and_grows_when_saturated() -> None:
+    from swarm.ai.providers._limiter import AdaptiveLimiter
+
+    limiter = AdaptiveLimiter("stub", initial=4, maximum=8)
+    admitted = [await limiter.acquire() for _ in range(4)]
+
+    # A burst of overloads admitted before the first decrease halves the limit once.
+    for t in admitted[:3]:
+        limiter.release(admitted=t, outcome="overloaded")
+    assert limiter.limit == 2
+
+    limiter.release(admitted=admitted[3], outcome="ok")
+    slots = [await limiter.acquire(), await limiter.acquire()]
+    for t in slots:
+        limiter.release(admitted=t, outcome="ok")  # saturated successes grow the limit
+    assert limiter._limit > 2
+
+
+@pytest.mark.asyncio
+async def test_limiter_prioritises_interactive_and_rejects_when_full() -> None:
+    from swarm.ai.providers._limiter import AdaptiveLimiter
+    from swarm.core.exceptions import ModelOverloaded
+
+    limiter = AdaptiveLimiter("stub", initial=1, max_queue=2, queue_timeout=5.0)
+    held = await limiter.acquire()
+    order: list[str] = []
+
+    async def _wait(priority: str) -> None:
+        t = await limiter.acquire(priority)
+        order.append(priority)
+        limiter.release(admitted=t, outcome="ok")
+
+    background = asyncio.create_task(_wait("background"))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(_wait("interactive"))
+    await asyncio.sleep(0)
+    assert limiter.queued == 2
+    with pytest.raises(ModelOverloaded):
+        await limiter.acquire()
+
+    limiter.release(admitted=held, outcome="ok")
+    await asyncio.gather(background, interactive)
+    assert order == ["interactive", "background"]
+
+
+@pytest.mark.asyncio
+async def test_limiter_queue_deadline() -> None:
+    from swarm.ai.providers._limiter import AdaptiveLimiter
+    from swarm.core.exceptions import ModelOverloaded
+
+    limiter = AdaptiveLimiter("stub", initial=1, queue_timeout=0.01)
+    await limiter.acquire()
+    with pytest.raises(ModelOverloaded):
+        await limiter.acquire()
+    assert limiter.queued == 0
+
+
+class _ScriptedProvider:
+    """Provider whose behaviour per call is scripted by the test."""
+
+    def __init__(self, name: str, behaviour: Any) -> None:
+        self.name = name
+        self.behaviour = behaviour
+        self.calls = 0
+
+    async def generate(self, *, messages: Any, stream: bool = False, **opts: Any) -> Any:
+        self.calls += 1
+        return await self.behaviour(stream)
+
+
+@pytest.fixture
+def _fresh_health() -> Iterator[None]:
+    from swarm.ai import routing
+
+    routing._health.clear()
+    yield
+    routing._health.clear()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("_fresh_health")
+async def test_router_falls_back_and_opens_circuit() -> None:
+    from swarm.ai import routing
+    from swarm.core.exceptions import ModelOverloaded
+
+    async def _overloaded(stream: bool) -> Any:
+        raise ModelOverloaded("busy")
+
+    async def _ok(stream: bool) -> Any:
+        async def _aiter() -> AsyncIterator[str]:
+            yield "from b"
+
+        return _aiter() if stream else "from b"
+
+    a, b = _ScriptedProvider("a", _overloaded), _ScriptedProvider("b", _ok)
+    registry._REGISTRY.update({"a": cast(LLMProvider, a), "b": cast(LLMProvider, b)})
+    routing._health["a"] = routing.ProviderHealth("a", failure_threshold=2, reset_after=60)
+    router = routing.RoutingProvider(["a", "b"])
+
+    assert await router.generate(messages=[]) == "from b"
+    stream = await router.generate(messages=[], stream=True)
+    assert [f async for f in cast(AsyncIterator[str], stream)] == ["from b"]
+    assert routing.health("a").is_open
+
+    # With the breaker open the failing provider is no longer called.
+    assert await router.generate(messages=[]) == "from b"
+    assert a.calls == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("_fresh_health")
+async def test_router_hedges_slow_first_token() -> None:
+    from swarm.ai import routing
+
+    slow_cancelled = asyncio.Event()
+
+    async def _slow(stream: bool) -> Any:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            slow_cancelled.set()
+            raise
+        return "slow"
+
+    async def _fast(stream: bool) -> Any:
+        return "fast"
+
+    registry._REGISTRY.update(
+        {
+            "slow": cast(LLMProvider, _ScriptedProvider("slow", _slow)),
+            "fast": cast(LLMProvider, _ScriptedProvider("fast", _fast)),
+        }
+    )
+    router = routing.RoutingProvider(["slow", "fast"], hedge=True, hedge_default_delay=0.01)
+
+    assert await router.generate(messages=[]) == "fast"
+    assert slow_cancelled.is_set()
+
+
+class _RecordingProvider:
+    """Records concurrency and options of the calls a batch makes."""
+
+    name = "rec"
+
+    def __init__(self) -> None:
+        self.options: list[dict[str, Any]] = []
+        self.active = 0
+        self.peak = 0
+
+    async def generate(self, *, messages: list[Any], stream: bool = False, **options: Any) -> str:
+        self.options.append(options)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return f"re: {messages[0]['content']}"
+
+
+@pytest.mark.asyncio
+async def test_llm_task_calls_provider_at_background_priority() -> None:
+    from swarm.tasks import llm
+
+    provider = _RecordingProvider()
+    with patch.object(llm._providers, "get", return_value=provider):
+        replies = await asyncio.gather(
+            *(
+                llm._generate("rec", [{"role": "user", "content": str(i)}], model=None)
+                for i in range(3)
+            )
+        )
+
+    assert replies == ["re: 0", "re: 1", "re: 2"]
+    assert provider.peak == 3  # sent straight away, concurrently
+    assert all(opts == {"priority": "background"} for opts in provider.options)
+
+
+@pytest.mark.asyncio
+async def test_history_compaction_is_enqueued_on_the_celery_wait_pool() -> None:
+    from swarm.tasks import llm
+
+    sent = asyncio.Event()
+    threads: list[str] = []
+    loop = asyncio.get_running_loop()
+
+    def send_task(name: str, **kwargs: Any) -> None:
+        threads.append(threading.current_thread().name)
+        loop.call_soon_threadsafe(sent.set)
+
+    with patch.object(llm.app, "send_task", side_effect=send_task) as mock_send:
+        llm.enqueue_history_compaction(7, "Pirate")
+        await asyncio.wait_for(sent.wait(), timeout=1)
+
+    mock_send.assert_called_once_with(
+        "llm.summarize_history",
+        kwargs={"channel": 7, "persona": "Pirate"},
+        queue="llm",
+        priority=llm.BACKGROUND_PRIORITY,
+    )
+    assert threads[0].startswith("pool-celery-wait")
+
+
+def test_prompt_context_cache_reuses_refreshes_and_replaces() -> None:
+    from swarm.ai.providers import _prompt_cache
+
+    created: list[str] = []
+    extended: list[str] = []
+    deleted: list[str] = []
+
+    def _create(persona: str, model: str, prompt: str) -> str:
+        created.append(prompt)
+        return f"caches/{len(created)}"
+
+    cache = _prompt_cache.PromptContextCache(
+        "test",
+        create=_create,
+        extend=extended.append,
+        delete=deleted.append,
+        ttl_seconds=100,
+        min_tokens=10,
+    )
+    long_prompt = "x" * 100
+
+    assert cache.resolve("Pirate", "m", "short") is None  # below the provider minimum
+    assert cache.resolve(None, "m", long_prompt) is None
+    assert cache.resolve("Pirate", "m", long_prompt) == "caches/1"
+    assert cache.resolve("Pirate", "m", long_prompt) == "caches/1"
+    assert len(created) == 1
+
+    # Close to expiry the entry is extended rather than recreated.
+    key = next(iter(cache._entries))
+    cache._entries[key] = ("caches/1", _prompt_cache.time.monotonic() + 5)
+    assert cache.resolve("Pirate", "m", long_prompt) == "caches/1"
+    assert extended == ["caches/1"]
+
+    # An edited persona prompt gets a new cache; the stale one is deleted.
+    assert cache.resolve("Pirate", "m", long_prompt + "!") == "caches/2"
+    assert deleted == ["caches/1"]
+
+    # Deletes run in the llm pool, off the caller's thread
+    pending = cache.invalidate()
+    assert pending is not None
+    pending.result(timeout=5)
+    assert deleted == ["caches/1", "caches/2"]
+
+
+def test_prompt_context_cache_creates_outside_the_lock() -> None:
+    from swarm.ai.providers._prompt_cache import PromptContextCache
+
+    release = threading.Event()
+
+    def _create(persona: str, model: str, prompt: str) -> str:
+        if persona == "Slow":
+            release.wait(timeout=5)
+        return f"caches/{persona}"
+
+    cache = PromptContextCache(
+        "test", create=_create, extend=lambda n: None, delete=lambda n: None, ttl_seconds=100, min_tokens=1
+    )
+    slow = threading.Thread(target=cache.resolve, args=("Slow", "m", "prompt"))
+    slow.start()
+    try:
+        while not cache._pending:
+            time.sleep(0.001)
+        # Other personas are not held up, the same one is sent inline meanwhile
+        assert cache.resolve("Fast", "m", "prompt") == "caches/Fast"
+        assert cache.resolve("Slow", "m", "prompt") is None
+    finally:
+        release.set()
+        slow.join()
+    assert cache.resolve("Slow", "m", "prompt") == "caches/Slow"
+
+
+def test_prompt_context_cache_falls_back_inline_after_failure() -> None:
+    from swarm.ai.providers._prompt_cache import PromptContextCache
+
+    calls = 0
+
+    def _create(persona: str, model: str, prompt: str) -> str:
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("too few tokens")
+
+    cache = PromptContextCache(
+        "test", create=_create, extend=lambda n: None, delete=lambda n: None, ttl_seconds=3600, min_tokens=1
+    )
+    assert cache.resolve("Pirate", "m", "prompt") is None
+    assert cache.resolve("Pirate", "m", "prompt") is None
+    assert calls == 1  # the failure is remembered instead of retried every turn
+
+    # ... but only for a short backoff, not the whole TTL
+    key = next(iter(cache._failed))
+    assert cache._failed[key] - time.monotonic() <= 60
+    cache._failed[key] = time.monotonic() - 1
+    assert cache.resolve("Pirate", "m", "prompt") is None
+    assert calls == 2
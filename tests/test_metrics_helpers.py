@@ -8,6 +8,8 @@ from __future__ import annotations
 
 from typing import Any
 
+import pytest
+
 from swarm.core import metrics
 from swarm.core.telemetry import DISCORD_MSG_TOTAL, SWARM_MSG_TOTAL
 
@@ -38,3 +40,25 @@ class TestMetricHelpers:
 
         assert metrics.discord_messages_processed == start_int + 1
         assert _read_prom_counter(DISCORD_MSG_TOTAL) == start_prom + 1.0
+
+    def test_report_llm_usage_updates_ledger_and_cost(self, monkeypatch: Any) -> None:
+        from swarm.ai import usage
+        from swarm.core.telemetry import LLM_COST_TOTAL
+
+        monkeypatch.setattr(usage.settings, "llm_prices", {"m": (1.0, 4.0)})
+        monkeypatch.setattr(metrics, "llm_usage", {})
+        cost_before = _read_prom_counter(LLM_COST_TOTAL.labels("acct", "m", "Pirate"))
+
+        report = usage.Usage(input_tokens=1_000_000, output_tokens=500_000, cached_tokens=400_000)
+        usage.report_usage("acct", "m", report, persona="Pirate", generation_s=10)
+
+        # 600k fresh input + 400k cached at a quarter of the price, plus 500k output.
+        assert usage.estimate_cost("m", report) == pytest.approx(0.6 + 0.1 + 2.0)
+        cost = _read_prom_counter(LLM_COST_TOTAL.labels("acct", "m", "Pirate")) - cost_before
+        assert cost == pytest.approx(2.7)
+        assert metrics.get_llm_usage()["acct"] == {
+            "requests": 1,
+            "input_tokens": 1_000_000,
+            "output_tokens": 500_000,
+            "cost_usd": pytest.approx(2.7),
+        }
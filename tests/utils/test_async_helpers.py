@@ -0,0 +1,48 @@
+"""Tests for the named thread pools in :mod:`swarm.utils.async_helpers`."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Iterator
+
+import pytest
+
+from swarm.core.telemetry import EXECUTOR_ACTIVE
+from swarm.utils import async_helpers
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pools() -> Iterator[None]:
+    async_helpers.shutdown_executors()
+    yield
+    async_helpers.shutdown_executors()
+
+
+@pytest.mark.asyncio
+async def test_named_pool_is_bounded_and_isolated(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(async_helpers.settings.executors, "image", 1)
+    release = threading.Event()
+
+    blocked = async_helpers.run_in_threadpool(release.wait, 5, pool="image")
+    queued = async_helpers.run_in_threadpool(threading.current_thread, pool="image")
+    await asyncio.sleep(0.05)
+    assert not queued.done()  # the single image thread is busy
+    assert EXECUTOR_ACTIVE.labels("image")._value.get() == 1
+
+    # Other pools are unaffected by the saturated one.
+    other = await async_helpers.run_in_threadpool(threading.current_thread, pool="docker")
+    assert other.name.startswith("pool-docker")
+
+    release.set()
+    assert await blocked is True
+    assert (await queued).name.startswith("pool-image")
+
+
+@pytest.mark.asyncio
+async def test_pool_keyword_is_not_forwarded() -> None:
+    def _echo(*args: object, **kwargs: object) -> tuple[object, ...]:
+        return args, kwargs
+
+    assert await async_helpers.run_in_threadpool(_echo, 1, x=2, pool="llm") == ((1,), {"x": 2})
+    assert await async_helpers.run_in_threadpool(_echo, 1) == ((1,), {})